@@ -0,0 +1,223 @@
+"""Headless text-mode command runner.
+
+Streams commands (one per line) from a file or stdin through
+CommandProcessor.process_command with audio, UI automation, app launching and
+browser side effects disabled, and prints every response with its timing
+followed by a throughput summary. Gemini, Wikipedia and the weather API are
+replaced by canned offline answers unless --live is given.
+
+    python batch_runner.py commands.txt --workers 8
+    cat commands.txt | python batch_runner.py - --mode process --workers 4
+    python batch_runner.py commands.txt --live --workers 2
+"""
+import argparse
+import os
+import types
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from components.nlp_processor import NLPProcessor
+from components.data_manager import DataManager
+from components.command_processor import CommandProcessor
+from features.reminder_sys import ReminderSystem
+from components.alert_player import AlertPlayer
+from components.audio_playback import NullPlayer
+
+
+class NullAudioHandler:
+    def speak(self, text):
+        pass
+
+    def listen(self):
+        return ""
+
+
+class NullUIController:
+    """Accepts every UIController call without touching the keyboard or screen"""
+
+    def screenshot(self):
+        return "Screenshot skipped in batch mode."
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: True
+
+
+class NullAppLauncher:
+    def open_app(self, app_name):
+        return False
+
+
+class NullBrowser:
+    def open(self, url, *args, **kwargs):
+        return True
+
+
+class NullSummarizer:
+    """Stands in for GeminiSummarizer without calling the API"""
+
+    def summarize(self, prompt):
+        return f"Summary of {prompt} (offline)."
+
+    def calculate(self, expr):
+        return "Sorry, I am unable to solve this problem offline."
+
+
+class NullEncyclopedia:
+    """Stands in for the wikipedia module"""
+
+    class DisambiguationError(Exception):
+        options = []
+
+    exceptions = types.SimpleNamespace(DisambiguationError=DisambiguationError)
+
+    def summary(self, query, sentences=1):
+        return f"{query} (offline encyclopedia entry)."
+
+
+class OfflineResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class NullHTTP:
+    """Answers the OpenWeatherMap geocoding and weather requests with fixed data"""
+
+    def get(self, url, *args, **kwargs):
+        if '/geo/' in url:
+            return OfflineResponse([{'lat': 0.0, 'lon': 0.0}])
+        return OfflineResponse({'main': {'temp': 293.15, 'humidity': 50},
+                                'weather': [{'description': 'clear sky'}],
+                                'wind': {'speed': 1.0}})
+
+
+def build_processor(data_dir, live=False):
+    """Create a CommandProcessor whose side effects are all disabled.
+
+    Unless `live`, network services are stubbed too, so runs measure local
+    processing only.
+    """
+    nlp_processor = NLPProcessor()
+    nlp_processor.load_intent_model(persist=False)
+    offline = {} if live else {'summarizer': NullSummarizer(), 'http': NullHTTP(),
+                               'encyclopedia': NullEncyclopedia()}
+    return CommandProcessor(
+        nlp_processor,
+        DataManager(persist=False, stop_words=getattr(nlp_processor, 'stop_words', frozenset())),
+        audio_handler=NullAudioHandler(),
+        ui_controller=NullUIController(),
+        app_launcher=NullAppLauncher(),
+        reminder_system=ReminderSystem(
+            db_path=os.path.join(data_dir, "reminders.db")),
+        browser=NullBrowser(),
+        alert_player=AlertPlayer(player=NullPlayer()),
+        **offline
+    )
+
+
+# Per-process state for --mode process
+_processor = None
+
+
+def _init_worker(data_dir, live=False):
+    global _processor
+    _processor = build_processor(data_dir, live)
+
+
+def _run_command(command):
+    started = time.perf_counter()
+    try:
+        response, _ = _processor.process_command(command)
+    except Exception as e:
+        response = f"ERROR: {e}"
+    return response, (time.perf_counter() - started) * 1000
+
+
+def read_commands(source):
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for line in stream:
+            command = line.strip()
+            if command and not command.startswith('#'):
+                yield command
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def bounded_map(executor, fn, items, window):
+    """Like executor.map, but keeps at most `window` tasks queued so input is streamed"""
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            command, future = pending.popleft()
+            yield command, future.result()
+    while pending:
+        command, future = pending.popleft()
+        yield command, future.result()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run NexusAI commands headlessly in parallel.")
+    parser.add_argument('source', nargs='?', default='-',
+                        help="file with one command per line, or '-' for stdin (default)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                        help="number of parallel workers")
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread',
+                        help="share one processor across threads, or build one per process")
+    parser.add_argument('--window', type=int, default=1000,
+                        help="maximum number of commands queued at once")
+    parser.add_argument('--quiet', action='store_true',
+                        help="only print the summary")
+    parser.add_argument('--live', action='store_true',
+                        help="call Gemini, Wikipedia and the weather API instead of offline stubs")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="nexus_batch_")
+    print("Loading NexusAI components...", file=sys.stderr)
+
+    if args.mode == 'thread':
+        _init_worker(data_dir, args.live)
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.workers,
+                                       initializer=_init_worker, initargs=(data_dir, args.live))
+
+    timings = []
+    started = time.perf_counter()
+    with executor:
+        results = bounded_map(executor, _run_command,
+                              read_commands(args.source), args.window)
+        for index, (command, (response, elapsed_ms)) in enumerate(results, 1):
+            timings.append(elapsed_ms)
+            if not args.quiet:
+                print(f"{index}\t{elapsed_ms:8.2f} ms\t{command}\t=> {response}")
+    wall_time = time.perf_counter() - started
+
+    timings.sort()
+    count = len(timings)
+    print("-" * 50, file=sys.stderr)
+    print(f"Commands:   {count} ({args.workers} {args.mode} workers)", file=sys.stderr)
+    if count:
+        print(f"Wall time:  {wall_time:.2f} s", file=sys.stderr)
+        print(f"Throughput: {count / wall_time:.1f} commands/s", file=sys.stderr)
+        print(f"Latency:    mean {sum(timings) / count:.2f} ms, p50 {percentile(timings, 0.5):.2f} ms, "
+              f"p95 {percentile(timings, 0.95):.2f} ms, max {timings[-1]:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Upload size (and optionally recognition latency) before vs after audio preprocessing.
+
+Run from the project root:
+    python -m benchmarks.bench_audio_preprocess
+    python -m benchmarks.bench_audio_preprocess --wav recording.wav --recognize
+
+Without --wav a synthetic 44.1 kHz clip is used: silence, a few seconds of
+voiced sound, then the trailing second of silence listen() always records.
+FLAC sizes and --recognize need speech_recognition (and network access).
+"""
+import argparse
+import time
+import wave
+import numpy as np
+from components.audio_preprocess import prepare_speech
+
+
+def synthetic_clip(sample_rate, lead=0.5, speech=2.5, tail=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sample_rate * speech)) / sample_rate
+    # A 140 Hz voice with harmonics, syllable-rate amplitude modulation
+    voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 12))
+    voice *= 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    clip = np.concatenate([np.zeros(int(sample_rate * lead)), voice * 3000, np.zeros(int(sample_rate * tail))])
+    clip += rng.normal(0, 20, len(clip))  # Room noise
+    return clip.astype('<i2').tobytes(), sample_rate, 2, 1
+
+
+def read_wav(path):
+    with wave.open(path, 'rb') as f:
+        return f.readframes(f.getnframes()), f.getframerate(), f.getsampwidth(), f.getnchannels()
+
+
+def flac_size(frames, rate, width):
+    try:
+        import speech_recognition as sr
+    except ImportError:
+        return None
+    return len(sr.AudioData(frames, rate, width).get_flac_data(convert_width=2))
+
+
+def recognize_ms(frames, rate, width):
+    import speech_recognition as sr
+    started = time.perf_counter()
+    try:
+        text = sr.Recognizer().recognize_google(sr.AudioData(frames, rate, width), language='en-in')
+    except sr.UnknownValueError:
+        text = ''
+    return (time.perf_counter() - started) * 1000, text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--wav', help="16-bit WAV recording to use instead of the synthetic clip")
+    parser.add_argument('--rate', type=int, default=44100, help="sample rate of the synthetic clip")
+    parser.add_argument('--threshold', type=float, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--recognize', action='store_true', help="also time recognize_google on both versions")
+    args = parser.parse_args()
+
+    frames, rate, width, channels = read_wav(args.wav) if args.wav else synthetic_clip(args.rate)
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        prepared = prepare_speech(frames, rate, width, channels, threshold=args.threshold)
+    prepare_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+    # What recognize_google would have been given without preprocessing (mono only)
+    original = (frames, rate, width) if channels == 1 else None
+    versions = [('original', original), ('preprocessed', prepared)]
+
+    print(f"input: {len(frames) / (rate * width * channels):.2f} s, {rate} Hz, "
+          f"{8 * width}-bit, {channels} channel(s)")
+    print(f"preprocessing: {prepare_ms:.2f} ms per clip\n")
+    print(f"{'version':<14} {'seconds':>8} {'rate':>7} {'PCM bytes':>11} {'FLAC bytes':>11}")
+    for name, version in versions:
+        if version is None:
+            continue
+        data, version_rate, version_width = version
+        flac = flac_size(*version)
+        print(f"{name:<14} {len(data) / (version_rate * version_width):>8.2f} {version_rate:>7} "
+              f"{len(data):>11} {flac if flac is not None else 'n/a':>11}")
+
+    if args.recognize:
+        print(f"\n{'version':<14} {'recognize ms':>13}  text")
+        for name, version in versions:
+            if version is not None:
+                elapsed, text = recognize_ms(*version)
+                print(f"{name:<14} {elapsed:>13.0f}  {text!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compare entity extraction cost: full vs trimmed spaCy pipeline, per command vs nlp.pipe.
+
+Run from the project root:
+    python -m benchmarks.bench_entities --repeat 20
+"""
+import argparse
+import time
+import spacy
+from components.config import SPACY_MODEL
+from components.nlp_processor import NLPProcessor
+from benchmarks.corpus import COMMANDS
+
+
+def timed(label, fn, count):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed * 1000 / count:8.3f} ms/command   {count / elapsed:10.1f} commands/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    texts = COMMANDS * args.repeat
+    count = len(texts)
+
+    processor = NLPProcessor()
+    print(f"Trimmed pipeline: {processor.nlp.pipe_names}")
+
+    full = NLPProcessor()
+    full.nlp = spacy.load(SPACY_MODEL)
+    print(f"Full pipeline:    {full.nlp.pipe_names}")
+    print(f"{count} commands\n")
+
+    timed("full pipeline, per command", lambda: [full.extract_entities(t) for t in texts], count)
+    timed("trimmed pipeline, per command", lambda: [processor.extract_entities(t) for t in texts], count)
+    timed("full pipeline, batched",
+          lambda: full.extract_entities_batch(texts, n_process=args.n_process), count)
+    timed("trimmed pipeline, batched",
+          lambda: processor.extract_entities_batch(texts, n_process=args.n_process), count)
+
+    # The trimmed pipeline must find the same entities
+    mismatches = sum(1 for t in COMMANDS if full.extract_entities(t) != processor.extract_entities(t))
+    print(f"\nCommands with different entities: {mismatches}/{len(COMMANDS)}")
+
+
+if __name__ == "__main__":
+    main()
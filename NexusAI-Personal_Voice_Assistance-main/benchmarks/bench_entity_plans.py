@@ -0,0 +1,49 @@
+"""Per-intent cost of entity extraction: every extractor vs only the ones the intent needs.
+
+Run from the project root:
+    python -m benchmarks.bench_entity_plans --repeat 20
+"""
+import argparse
+import time
+from collections import defaultdict
+from components.nlp_processor import NLPProcessor
+from benchmarks.corpus import COMMANDS
+
+
+def per_command_ms(fn, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    processor = NLPProcessor()
+    by_intent = defaultdict(list)
+    for text in COMMANDS:
+        by_intent[processor.classify_intent(text)].append(text)
+
+    all_extractors = processor.entity_plan()
+    print(f"{'intent':<12} {'cmds':>4} {'extractors':>10} {'all ms':>9} {'scoped ms':>10} {'saved':>7}")
+    total_all = total_scoped = 0.0
+    for intent, texts in sorted(by_intent.items()):
+        plan = processor.entity_plan(intent)
+        all_ms = per_command_ms(processor.extract_entities, texts, args.repeat)
+        scoped_ms = per_command_ms(lambda t: processor.extract_entities(t, intent), texts, args.repeat)
+        total_all += all_ms * len(texts)
+        total_scoped += scoped_ms * len(texts)
+        saved = 100 * (1 - scoped_ms / all_ms) if all_ms else 0.0
+        print(f"{intent:<12} {len(texts):>4} {len(plan):>4}/{len(all_extractors):<5} "
+              f"{all_ms:>9.3f} {scoped_ms:>10.3f} {saved:>6.1f}%")
+
+    print(f"\nWhole corpus: {total_all / len(COMMANDS):.3f} ms -> "
+          f"{total_scoped / len(COMMANDS):.3f} ms per command")
+
+
+if __name__ == "__main__":
+    main()
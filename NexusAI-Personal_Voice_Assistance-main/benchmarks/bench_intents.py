@@ -0,0 +1,57 @@
+"""Accuracy and latency of the NumPy intent classifier against keyword scoring.
+
+Run from the project root:
+    python -m benchmarks.bench_intents --repeat 50
+"""
+import argparse
+import time
+from components.intent_classifier import training_examples, IntentClassifier
+from components.nlp_processor import NLPProcessor
+from benchmarks.corpus import LABELLED_COMMANDS
+
+
+def report(label, predict, texts, expected, repeat):
+    predictions = [predict(text) for text in texts]
+    correct = sum(p == e for p, e in zip(predictions, expected))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            predict(text)
+    per_command = (time.perf_counter() - started) * 1e6 / (repeat * len(texts))
+    print(f"{label:<28} {correct:>3}/{len(texts)} correct   {per_command:9.1f} us/command")
+    return predictions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    texts = [text for text, _ in LABELLED_COMMANDS]
+    expected = [intent for _, intent in LABELLED_COMMANDS]
+
+    started = time.perf_counter()
+    model = IntentClassifier().train(*training_examples())
+    print(f"Trained on INTENT_PATTERNS in {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    processor = NLPProcessor()
+    keyword = report("keyword scoring", processor.classify_intent_keywords, texts, expected, args.repeat)
+    report("model", lambda text: model.predict(text)[0], texts, expected, args.repeat)
+    processor.intent_model = model
+    report("model + keyword fallback", processor.classify_intent, texts, expected, args.repeat)
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        model.predict_batch(texts)
+    per_command = (time.perf_counter() - started) * 1e6 / (args.repeat * len(texts))
+    print(f"{'model, batched':<28} {'':>16}   {per_command:9.1f} us/command")
+
+    print("\nDisagreements (expected / keyword / model):")
+    for text, want, kw in zip(texts, expected, keyword):
+        guess, confidence = model.predict(text)
+        if guess != want or kw != want:
+            print(f"  {text:<45} {want:<11} {kw:<11} {guess} ({confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Reminder time parsing: rule-based fast path vs dateparser.
+
+Run from the project root:
+    python -m benchmarks.bench_time_parser --repeat 20
+"""
+import argparse
+import time
+from features.time_parser import split_reminder, parse_time_rules, parse_time_fallback, parse_time
+from benchmarks.corpus import REMINDER_COMMANDS
+
+
+def per_call_us(fn, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - started) * 1e6 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    # Measured first, while dateparser is still cold
+    started = time.perf_counter()
+    import dateparser
+    dateparser.parse("tomorrow at 9am")
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    time_strings = [split_reminder(command)[1] for command in REMINDER_COMMANDS]
+    hits = [text for text in time_strings if parse_time_rules(text)]
+    print(f"Rules cover {len(hits)}/{len(time_strings)} time expressions; dateparser gets:")
+    for text in time_strings:
+        if text not in hits:
+            print(f"  {text!r:<28} -> {parse_time_fallback(text)}")
+
+    print(f"\ndateparser import + first parse: {cold_ms:.0f} ms")
+
+    print(f"\n{'parser':<32} {'us/expression':>14}")
+    rows = [
+        ("dateparser.parse (all locales)", dateparser.parse),
+        ("dateparser, restricted profile", parse_time_fallback),
+        ("rules + fallback", parse_time),
+        ("rules only (covered phrases)", parse_time_rules),
+    ]
+    for label, fn in rows:
+        texts = hits if fn is parse_time_rules else time_strings
+        print(f"{label:<32} {per_call_us(fn, texts, args.repeat):>14.1f}")
+    print(f"{'split_reminder (full command)':<32} "
+          f"{per_call_us(split_reminder, REMINDER_COMMANDS, args.repeat):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
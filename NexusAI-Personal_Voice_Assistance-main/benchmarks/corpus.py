@@ -0,0 +1,101 @@
+# Representative spoken commands shared by the benchmark scripts
+COMMANDS = [
+    "what time is it",
+    "what is the date today",
+    "tell me about albert einstein",
+    "search for the history of the roman empire",
+    "open youtube",
+    "open visual studio code",
+    "what is the weather in new york",
+    "tell me the weather of mumbai today",
+    "london weather",
+    "tell me a joke",
+    "calculate 25 times 4",
+    "what is twelve plus seven",
+    "remind me to call mom at 5pm",
+    "remind me to drink water in 20 minutes",
+    "list reminders",
+    "next tab",
+    "switch to the previous tab",
+    "close this tab",
+    "volume up",
+    "mute",
+    "pause music",
+    "skip song",
+    "take a screenshot",
+    "type hello world",
+    "select all",
+    "go back",
+    "who are you",
+    "good morning nexus",
+    "i am feeling great today",
+    "this is terrible, the app crashed again",
+    "compose an email",
+    "who is the prime minister of india",
+    "how far is the moon from the earth",
+    "goodbye",
+]
+
+# Hand-labelled commands for intent accuracy; phrased differently from INTENT_PATTERNS
+LABELLED_COMMANDS = [
+    ("what time is it", 'time'),
+    ("tell me the current time", 'time'),
+    ("what's the date today", 'date'),
+    ("which day is it today", 'date'),
+    ("tell me about albert einstein", 'search'),
+    ("search for the history of the roman empire", 'search'),
+    ("look up pizza recipes", 'search'),
+    ("open youtube", 'open'),
+    ("launch spotify", 'open'),
+    ("start visual studio code", 'open'),
+    ("what is the weather in new york", 'weather'),
+    ("london weather", 'weather'),
+    ("what's the forecast for tomorrow", 'weather'),
+    ("tell me a joke", 'joke'),
+    ("make me laugh", 'joke'),
+    ("calculate 25 times 4", 'math'),
+    ("what is twelve plus seven", 'math'),
+    ("remind me to call mom at 5pm", 'reminder'),
+    ("set a reminder to drink water in 20 minutes", 'reminder'),
+    ("next tab", 'ui_control'),
+    ("turn the volume up", 'ui_control'),
+    ("take a screenshot", 'ui_control'),
+    ("minimise this window", 'ui_control'),
+    ("who are you", 'intro'),
+    ("good morning", 'greeting'),
+    ("hey there", 'greeting'),
+    ("goodbye", 'goodbye'),
+    ("see you later", 'goodbye'),
+    ("compose an email", 'compose'),
+    ("what did i ask yesterday", 'history'),
+    ("show my usage statistics", 'history'),
+    ("what did you tell me about python", 'recall'),
+]
+
+# Spoken reminder commands, split into (task, time expression) by the reminder system
+REMINDER_COMMANDS = [
+    "remind me to call mom at 5pm",
+    "remind me to drink water in 20 minutes",
+    "remind me to take a break in half an hour",
+    "remind me to stretch in an hour and a half",
+    "remind me to check the oven after 15 minutes",
+    "remind me to join the standup tomorrow at 9",
+    "remind me to water the plants tomorrow morning",
+    "remind me to pay rent on friday",
+    "remind me to call the dentist next monday at 10am",
+    "remind me to take out the trash tonight at 8",
+    "remind me at 6:30 pm to start cooking",
+    "remind me tomorrow to renew my passport",
+    "set a reminder to submit the report at 4:45 pm",
+    "set reminder to tomorrow at 2pm that team meeting",
+    "remind me to feed the cat this evening",
+    "remind me to lock the door at 11",
+    "remind me to go to the gym at 7 o'clock",
+    "remind me to back up my laptop on sunday",
+    "remind me to pick up groceries in 2 hours",
+    "remember to buy milk at noon",
+    "remind me to file taxes on the 15th of april",
+    "remind me to send the invoice on 3 november at 10am",
+    "remind me to call grandma next week",
+    "remind me to book tickets in a fortnight",
+]
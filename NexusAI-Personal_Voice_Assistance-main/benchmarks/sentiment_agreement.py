@@ -0,0 +1,86 @@
+"""Agreement and speed of the lexicon sentiment scorer against TextBlob.
+
+Run from the project root:
+    python -m benchmarks.sentiment_agreement
+"""
+import time
+from collections import Counter
+from textblob import TextBlob
+from components.config import SENTIMENT_THRESHOLD
+from components.sentiment import LexiconSentiment
+from benchmarks.corpus import COMMANDS
+
+SENTIMENT_SENTENCES = [
+    "i am so happy with you",
+    "you are really helpful today",
+    "that was a great answer",
+    "this is not good at all",
+    "i don't like this song",
+    "i am very tired and sad",
+    "what a wonderful morning",
+    "the weather is awful",
+    "that joke was funny",
+    "i hate mondays",
+    "you are the best assistant",
+    "this is extremely annoying",
+    "it's okay i guess",
+    "not bad, thanks",
+    "i feel terrible today",
+    "that was a pretty cool trick",
+    "the internet is so slow",
+    "i am not upset",
+    "open a new tab please",
+    "go to the previous page",
+]
+
+LABELS = ['positive', 'neutral', 'negative']
+
+
+def textblob_label(text):
+    polarity = TextBlob(text).sentiment.polarity
+    if polarity > SENTIMENT_THRESHOLD:
+        return 'positive'
+    elif polarity < -SENTIMENT_THRESHOLD:
+        return 'negative'
+    return 'neutral'
+
+
+def time_per_call(fn, texts, repeat=50):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - started) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    corpus = COMMANDS + SENTIMENT_SENTENCES
+    lexicon = LexiconSentiment()
+
+    confusion = Counter()
+    disagreements = []
+    for text in corpus:
+        expected = textblob_label(text)
+        actual = lexicon.classify(text)
+        confusion[(expected, actual)] += 1
+        if expected != actual:
+            disagreements.append((text, expected, actual))
+
+    agreed = sum(confusion[(label, label)] for label in LABELS)
+    print(f"Agreement: {agreed}/{len(corpus)} ({agreed / len(corpus):.1%})\n")
+
+    print("TextBlob \\ Lexicon " + "".join(f"{label:>10}" for label in LABELS))
+    for expected in LABELS:
+        print(f"{expected:<19}" + "".join(f"{confusion[(expected, actual)]:>10}" for actual in LABELS))
+
+    if disagreements:
+        print("\nDisagreements:")
+        for text, expected, actual in disagreements:
+            print(f"  {text!r}: textblob={expected}, lexicon={actual}")
+
+    print(f"\nTextBlob: {time_per_call(textblob_label, corpus, repeat=5):8.1f} us/call")
+    print(f"Lexicon:  {time_per_call(lexicon.classify, corpus):8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
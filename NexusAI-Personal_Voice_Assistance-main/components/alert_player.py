@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+import wave
+from pathlib import Path
+import numpy as np
+from components.config import (ALERT_DIR, ALERT_SAMPLE_RATE, ALERT_VOLUME, ALERT_FADE,
+                               ALERT_PATTERNS)
+from components.audio_playback import default_player
+
+
+def tone_buffer(pattern, sample_rate=ALERT_SAMPLE_RATE, volume=ALERT_VOLUME, fade=ALERT_FADE):
+    """16-bit mono samples for [(frequency, seconds)], with short fades so tones don't click"""
+    chunks = []
+    for frequency, seconds in pattern:
+        count = int(sample_rate * seconds)
+        if frequency <= 0:
+            chunks.append(np.zeros(count, dtype=np.float32))
+            continue
+        t = np.arange(count, dtype=np.float32) / sample_rate
+        tone = np.sin(2 * np.pi * frequency * t)
+        edge = min(int(sample_rate * fade), count // 2)
+        if edge:
+            ramp = np.linspace(0.0, 1.0, edge, dtype=np.float32)
+            tone[:edge] *= ramp
+            tone[-edge:] *= ramp[::-1]
+        chunks.append(tone)
+    samples = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    return (samples * volume * 32767).astype('<i2')
+
+
+class AlertPlayer:
+    """Plays short alert tones on a background thread.
+
+    Each pattern is synthesized once and kept as a WAV file, so an alert costs
+    one file playback. play() returns immediately; while an alert (and the
+    speech that follows it) is playing, further alerts are dropped rather than
+    queued, so overlapping reminders never wait behind each other's beeps.
+    """
+
+    def __init__(self, player=None, directory=ALERT_DIR, patterns=ALERT_PATTERNS):
+        self.player = player or default_player()
+        self.directory = Path(directory)
+        self.patterns = patterns
+        self.files = {}  # pattern name -> WAV path
+        self.files_lock = threading.Lock()
+        self.playing = threading.Lock()
+
+    def alert_file(self, name):
+        """WAV file for a named pattern, generating it on first use"""
+        with self.files_lock:
+            if name in self.files:
+                return self.files[name]
+            pattern = self.patterns[name]
+            # Changing the pattern or sample settings gives a new file
+            key = repr((pattern, ALERT_SAMPLE_RATE, ALERT_VOLUME, ALERT_FADE)).encode('utf-8')
+            path = self.directory / f"{name}-{hashlib.sha1(key).hexdigest()[:12]}.wav"
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_name(path.name + '.tmp')
+                with wave.open(str(temp_path), 'wb') as f:
+                    f.setnchannels(1)
+                    f.setsampwidth(2)
+                    f.setframerate(ALERT_SAMPLE_RATE)
+                    f.writeframes(memoryview(tone_buffer(pattern)).cast('B'))
+                os.replace(temp_path, path)
+            self.files[name] = path
+            return path
+
+    def play(self, name='reminder', then=None):
+        """Start the alert in the background, then call then() on the same thread.
+
+        Returns False if the chime was skipped (another alert is playing); then()
+        still runs, straight away.
+        """
+        chime = self.player.available and name in self.patterns and self.playing.acquire(blocking=False)
+        if chime or then:
+            threading.Thread(target=self._play, args=(name, then, chime), daemon=True).start()
+        return bool(chime)
+
+    def _play(self, name, then, chime):
+        try:
+            if chime:
+                try:
+                    self.player.play(self.alert_file(name))
+                except Exception as e:
+                    print(f"Alert playback failed: {e}")
+            # Runs after the chime so the two never play over each other
+            if then:
+                then()
+        except Exception as e:
+            print(f"Error after alert: {e}")
+        finally:
+            if chime:
+                self.playing.release()
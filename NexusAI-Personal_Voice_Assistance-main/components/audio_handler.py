@@ -1,9 +1,14 @@
+import threading
+import time
 import speech_recognition as sr
 import pyttsx3
-from components.config import SPEECH_RATE, SPEECH_VOLUME
+from components.config import SPEECH_RATE, SPEECH_VOLUME, AUDIO_PREPROCESS
+from components.phrase_cache import PhraseCache
+from components.audio_playback import default_player
+from components.audio_preprocess import prepare_speech
 
 class AudioHandler:
-    def __init__(self):
+    def __init__(self, phrase_cache=None, player=None):
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
@@ -11,6 +16,16 @@ class AudioHandler:
         # Initialize text-to-speech
         self.tts_engine = pyttsx3.init()
         self.setup_voice()
+
+        # Reminders speak from their own threads; pyttsx3 must only be driven by one at a time
+        self.speak_lock = threading.Lock()
+        # Frequent fixed phrases are synthesized to WAV once and played back from disk
+        self.phrase_cache = phrase_cache or PhraseCache()
+        self.player = player or default_player()
+
+        # Raw PCM sizes before and after preprocessing, and time spent in recognize_google
+        self.recognition_stats = {'utterances': 0, 'bytes_captured': 0,
+                                  'bytes_uploaded': 0, 'recognize_ms': 0.0}
     
     def setup_voice(self):
         voices = self.tts_engine.getProperty('voices')
@@ -23,10 +38,35 @@ class AudioHandler:
         # Set speech rate and volume
         self.tts_engine.setProperty('rate', SPEECH_RATE)
         self.tts_engine.setProperty('volume', SPEECH_VOLUME)
+        # Part of the phrase cache key
+        self.voice_id = self.tts_engine.getProperty('voice')
     
+    def cache_phrases(self, texts):
+        """Also pre-synthesize these fixed responses on first use"""
+        self.phrase_cache.register(texts)
+
     def speak(self, text):
         print(f"NexusAI: {text}")
-        self.tts_engine.say(text)
+        with self.speak_lock:
+            if self.play_cached(text):
+                return
+            self.tts_engine.say(text)
+            self.tts_engine.runAndWait()
+
+    def play_cached(self, text):
+        """Play `text` from the phrase cache (rendering it first if needed); False to speak live"""
+        if not self.player.available or not self.phrase_cache.wants(text):
+            return False
+        key = (text, self.voice_id, SPEECH_RATE, SPEECH_VOLUME)
+        path = self.phrase_cache.get(*key) or self.phrase_cache.put(*key, self.render_to_file)
+        try:
+            return path is not None and self.player.play(path)
+        except Exception as e:
+            print(f"Cached phrase playback failed: {e}")
+            return False
+
+    def render_to_file(self, text, path):
+        self.tts_engine.save_to_file(text, str(path))
         self.tts_engine.runAndWait()
     
     def listen(self):
@@ -42,7 +82,7 @@ class AudioHandler:
             
             # Convert audio to text
             print("Recognizing...")
-            text = self.recognizer.recognize_google(audio, language='en-in').lower()
+            text = self.recognize(self.prepare_audio(audio)).lower()
             print(f"You said: {text}")
             return text
             
@@ -54,4 +94,26 @@ class AudioHandler:
             return ""
         except sr.WaitTimeoutError as wte:
             print(wte)
-            return ""
\ No newline at end of file
+            return ""
+
+    def prepare_audio(self, audio):
+        """Trim silence and downsample a capture to 16 kHz mono before upload"""
+        stats = self.recognition_stats
+        stats['utterances'] += 1
+        stats['bytes_captured'] += len(audio.frame_data)
+        if AUDIO_PREPROCESS:
+            try:
+                frames, rate, width = prepare_speech(audio.frame_data, audio.sample_rate, audio.sample_width,
+                                                     threshold=self.recognizer.energy_threshold)
+                audio = sr.AudioData(frames, rate, width)
+            except Exception as e:
+                print(f"Audio preprocessing failed: {e}")
+        stats['bytes_uploaded'] += len(audio.frame_data)
+        return audio
+
+    def recognize(self, audio):
+        started = time.perf_counter()
+        try:
+            return self.recognizer.recognize_google(audio, language='en-in')
+        finally:
+            self.recognition_stats['recognize_ms'] += (time.perf_counter() - started) * 1000
@@ -0,0 +1,69 @@
+import shutil
+import subprocess
+import sys
+
+
+class NullPlayer:
+    """Plays nothing; used when no playback method is available"""
+    available = False
+
+    def play(self, path):
+        return False
+
+
+class WinsoundPlayer:
+    available = True
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, path):
+        self.winsound.PlaySound(str(path), self.winsound.SND_FILENAME)
+        return True
+
+
+class SimpleAudioPlayer:
+    available = True
+
+    def __init__(self):
+        import simpleaudio
+        self.simpleaudio = simpleaudio
+
+    def play(self, path):
+        self.simpleaudio.WaveObject.from_wave_file(str(path)).play().wait_done()
+        return True
+
+
+class CommandPlayer:
+    """Plays files with a command-line player such as aplay or afplay"""
+    available = True
+
+    def __init__(self, *command):
+        if not shutil.which(command[0]):
+            raise OSError(f"{command[0]} not found")
+        self.command = list(command)
+
+    def play(self, path):
+        result = subprocess.run(self.command + [str(path)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+
+
+def default_player():
+    """First playback method that works on this machine, else a NullPlayer"""
+    candidates = []
+    if sys.platform == 'win32':
+        candidates.append(WinsoundPlayer)
+    candidates.append(SimpleAudioPlayer)
+    if sys.platform == 'darwin':
+        candidates.append(lambda: CommandPlayer('afplay'))
+    candidates.append(lambda: CommandPlayer('aplay', '-q'))
+    candidates.append(lambda: CommandPlayer('paplay'))
+
+    for make_player in candidates:
+        try:
+            return make_player()
+        except Exception:
+            continue
+    return NullPlayer()
@@ -0,0 +1,88 @@
+import math
+import numpy as np
+from components.config import AUDIO_TARGET_RATE, AUDIO_TRIM_FRAME, AUDIO_TRIM_PADDING
+
+
+def pcm_samples(frames, sample_width, channels=1):
+    """Little-endian signed PCM (unsigned for 8-bit) as a NumPy array on the 16-bit scale.
+
+    16-bit mono input, what the microphone records, comes back as a view of
+    `frames` without copying.
+    """
+    view = memoryview(frames).cast('B')
+    if sample_width == 2:
+        samples = np.frombuffer(view, dtype='<i2')
+    elif sample_width == 1:
+        samples = (np.frombuffer(view, dtype=np.uint8).astype(np.int16) - 128) * 256
+    elif sample_width == 3:
+        raw = np.frombuffer(view, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        # Sign-extend by building the value in the top 24 bits, then shift down to 16
+        samples = ((raw[:, 2] << 24) | (raw[:, 1] << 16) | (raw[:, 0] << 8)) >> 16
+    elif sample_width == 4:
+        samples = np.frombuffer(view, dtype='<i4') >> 16
+    else:
+        raise ValueError(f"unsupported sample width: {sample_width}")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def speech_bounds(samples, sample_rate, threshold, frame=AUDIO_TRIM_FRAME, padding=AUDIO_TRIM_PADDING):
+    """(start, end) sample indices of the speech, padded; the whole clip if no frame is loud enough.
+
+    `threshold` is an RMS level on the 16-bit scale, the same unit as
+    speech_recognition's energy_threshold.
+    """
+    size = max(1, int(sample_rate * frame))
+    count = len(samples) // size
+    if count == 0:
+        return 0, len(samples)
+    # One RMS value per frame, computed over a reshaped view of the samples
+    frames = samples[:count * size].reshape(count, size)
+    energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    loud = np.flatnonzero(energy > threshold)
+    if len(loud) == 0:
+        return 0, len(samples)
+    pad = int(sample_rate * padding)
+    start = max(0, loud[0] * size - pad)
+    end = min(len(samples), (loud[-1] + 1) * size + pad)
+    return int(start), int(end)
+
+
+def resample(samples, sample_rate, target_rate=AUDIO_TARGET_RATE):
+    """Downsample to `target_rate` with a box low-pass; lower rates are returned as is"""
+    if sample_rate <= target_rate:
+        return samples
+    ratio = sample_rate / target_rate
+    if sample_rate % target_rate == 0:
+        # Integer factor (48k, 32k -> 16k): average each group of samples
+        factor = sample_rate // target_rate
+        usable = len(samples) - len(samples) % factor
+        return samples[:usable].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+    width = math.ceil(ratio)
+    smoothed = np.convolve(samples.astype(np.float32), np.full(width, 1.0 / width, dtype=np.float32), mode='same')
+    positions = np.arange(0, len(samples) - 1, ratio)
+    return np.interp(positions, np.arange(len(samples)), smoothed).astype(np.float32)
+
+
+def prepare_speech(frames, sample_rate, sample_width, channels=1, threshold=100,
+                   target_rate=AUDIO_TARGET_RATE):
+    """Trim silence, downmix and downsample a recording for upload.
+
+    Returns (frames, sample_rate, sample_width) as 16-bit mono PCM. When the
+    input is already 16-bit mono at or below `target_rate`, only the trimmed
+    slice is copied.
+    """
+    samples = pcm_samples(frames, sample_width, channels)
+    start, end = speech_bounds(samples, sample_rate, threshold)
+    samples = samples[start:end]
+    if end == start:
+        return b'', min(sample_rate, target_rate), 2
+
+    if samples.dtype == np.int16 and sample_rate <= target_rate:
+        return samples.tobytes(), sample_rate, 2
+
+    rate = min(sample_rate, target_rate)
+    samples = resample(samples, sample_rate, target_rate)
+    pcm = np.clip(np.rint(samples), -32768, 32767).astype('<i2')
+    return pcm.tobytes(), rate, 2
@@ -0,0 +1,67 @@
+import re
+from components.config import INTENT_PATTERNS, COMMAND_GRAMMAR_TEMPLATES, COMMAND_GRAMMAR_IGNORE
+from features.ui_actions import UI_ACTION_STEPS, match_ui_action
+
+_END = ''        # trie key marking the end of a phrase
+_SLOT = '{text}'  # trie key for a slot that captures the rest of the command
+
+
+class CommandGrammar:
+    """Token trie over fixed UI command phrases, with trailing slot capture.
+
+    Phrases come from INTENT_PATTERNS['ui_control'] and are mapped to actions
+    by the same regexes the entity extractor uses, so the fast path and the
+    NLP path always agree. match() only succeeds when the whole command is a
+    known phrase (ignoring filler words), so anything else falls through to
+    the full NLP pipeline.
+    """
+
+    _token_re = re.compile(r"[a-z0-9']+", re.IGNORECASE)
+
+    def __init__(self, templates=COMMAND_GRAMMAR_TEMPLATES, ignore=COMMAND_GRAMMAR_IGNORE):
+        self.root = {}
+        self.ignore = set(ignore)
+        for phrase in INTENT_PATTERNS.get('ui_control', []):
+            action, _ = match_ui_action(phrase)
+            if action in UI_ACTION_STEPS or action == 'screenshot':
+                self.add(phrase, action)
+        for template, action in templates.items():
+            self.add(template, action)
+
+    def add(self, phrase, action):
+        node = self.root
+        for token in phrase.lower().split():
+            node = node.setdefault(token, {})
+        node.setdefault(_END, action)
+
+    def ignore_words(self, words):
+        """Also skip these words (e.g. the wake word) outside slots"""
+        self.ignore.update(word.lower() for word in words)
+
+    def match(self, text):
+        """(action, slots) if `text` is exactly a known command, else None"""
+        node = self.root
+        slot = None
+        for match in self._token_re.finditer(text):
+            token = match.group().lower()
+            if _SLOT in node:
+                # Remember where a slot could start in case the literal path fails
+                slot = (node[_SLOT], match.start())
+            if token in node:
+                node = node[token]
+            elif token in self.ignore:
+                continue
+            elif slot is not None:
+                break
+            else:
+                return None
+        else:
+            if _END in node:
+                return node[_END], {}
+
+        if slot is not None:
+            slot_node, start = slot
+            captured = text[start:].strip().rstrip('.!?')
+            if _END in slot_node and captured:
+                return slot_node[_END], {'text': captured}
+        return None
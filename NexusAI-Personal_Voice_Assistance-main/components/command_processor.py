@@ -1,32 +1,84 @@
 import datetime
+import time
 import wikipedia
 import webbrowser
 import requests
 import random
 import re
 import math
-import winsound
 from components.config import WEBSITES, JOKES, APPS
 from features.appLauncher import WindowsAppLauncher
 from features.reminder_sys import ReminderSystem
 from features.summarizer import GeminiSummarizer
 from components.audio_handler import AudioHandler
+from components.alert_player import AlertPlayer
 from features.ui_controller import UIController
+from features.ui_actions import parse_macro, match_ui_action
+from components.command_grammar import CommandGrammar
 import os
 from dotenv import load_dotenv
 load_dotenv()
 WAKE_WORD = os.getenv("WAKE_WORD")
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 
+# UI action -> (UIController method, arguments, spoken response)
+UI_ACTION_RESPONSES = {
+    'next_tab': ('switch_tab', ('next',), "Switching to the next tab."),
+    'previous_tab': ('switch_tab', ('previous',), "Switching to the previous tab."),
+    'close_tab': ('close_tab', (), "Closed the current tab."),
+    'new_tab': ('new_tab', (), "Opened a new tab."),
+    'close_window': ('close_window', (), "Closed the window."),
+    'minimize_window': ('minimize_window', (), "Minimized the window."),
+    'maximize_window': ('maximize_window', (), "Maximized the window."),
+    'volume_up': ('volume_up', (), "Increasing volume."),
+    'volume_down': ('volume_down', (), "Decreasing volume."),
+    'mute': ('mute_volume', (), "Muted volume."),
+    'pause_play': ('pause_play', (), "Toggled pause/play."),
+    'play': ('play_media', (), "Playing media."),
+    'pause': ('pause_media', (), "Pausing media."),
+    'next_track': ('next_track', (), "Skipping to next track."),
+    'previous_track': ('previous_track', (), "Going to previous track."),
+    'copy': ('copy_to_clipboard', (), "Copied to clipboard."),
+    'paste': ('paste_from_clipboard', (), "Pasted from clipboard."),
+    'select_all': ('select_all', (), "Selected all text."),
+    'undo': ('undo', (), "Undone last action."),
+    'redo': ('redo', (), "Redone last action."),
+    'alt_tab': ('alt_tab', (), "Switching applications."),
+    'refresh': ('refresh_page', (), "Refreshed page."),
+    'go_back': ('go_back', (), "Going back."),
+    'go_forward': ('go_forward', (), "Going forward."),
+    'enter': ('press_enter', (), "Pressed Enter."),
+}
+
 class CommandProcessor:
-    def __init__(self, nlp_processor, data_manager):
+    def __init__(self, nlp_processor, data_manager, audio_handler=None, ui_controller=None,
+                 app_launcher=None, reminder_system=None, summarizer=None, browser=None,
+                 alert_player=None, http=None, encyclopedia=None):
+        # Services can be injected (e.g. headless stand-ins for batch runs);
+        # anything not provided is created with its default implementation
         self.nlp_processor = nlp_processor
         self.data_manager = data_manager
-        self.app_launcher = WindowsAppLauncher()
-        self.reminder_system = ReminderSystem()
-        self.summarizer = GeminiSummarizer()
-        self.audio_handler = AudioHandler()
-        self.ui_controller = UIController()
+        self.app_launcher = app_launcher or WindowsAppLauncher()
+        self.reminder_system = reminder_system or ReminderSystem()
+        self.summarizer = summarizer or GeminiSummarizer(
+            stop_words=getattr(nlp_processor, 'stop_words', frozenset()))
+        self.audio_handler = audio_handler or AudioHandler()
+        self.ui_controller = ui_controller or UIController()
+        self.browser = browser or webbrowser
+        self.alert_player = alert_player or AlertPlayer()
+        # Network clients: the requests and wikipedia modules unless replaced
+        self.http = http or requests
+        self.encyclopedia = encyclopedia or wikipedia
+
+        # Fixed-phrase commands are resolved by the grammar before any NLP runs
+        self.command_grammar = CommandGrammar()
+        if WAKE_WORD:
+            self.command_grammar.ignore_words(WAKE_WORD.split())
+
+        # UI confirmations are said often enough to keep pre-synthesized
+        if hasattr(self.audio_handler, 'cache_phrases'):
+            self.audio_handler.cache_phrases(
+                response for _, _, response in UI_ACTION_RESPONSES.values())
 
         if self.audio_handler:
             self.reminder_system.set_reminder_callback(
@@ -36,10 +88,9 @@ class CommandProcessor:
         """Handle when a reminder is triggered"""
         print(reminder_message)
         if self.audio_handler:
-            for i in range(3):
-                winsound.Beep(1000, 1000)  # frequency=1000Hz, duration=1000ms
-            # Use your existing audio handler to speak the reminder
-            self.audio_handler.speak(reminder_message)
+            # Chime, then speak the reminder, on a background thread; on Windows
+            # both use PlaySound, so starting the speech would cut the chime off
+            self.alert_player.play('reminder', then=lambda: self.audio_handler.speak(reminder_message))
 
     def get_current_time(self):
         now = datetime.datetime.now()
@@ -54,12 +105,12 @@ class CommandProcessor:
     def search_for(self, query):
         try:
             # Get summary from Wikipedia
-            result = wikipedia.summary(query, sentences=1)
+            result = self.encyclopedia.summary(query, sentences=1)
             return result
-        except wikipedia.exceptions.DisambiguationError as e:
+        except self.encyclopedia.exceptions.DisambiguationError as e:
             # If there are multiple results, pick the first one
             try:
-                result = wikipedia.summary(e.options[0], sentences=1)
+                result = self.encyclopedia.summary(e.options[0], sentences=1)
                 return result
             except:
                 return "I am not able to find anything on wikepedia on that topic."
@@ -72,7 +123,7 @@ class CommandProcessor:
 
     def open_app_or_site(self, name):
         if name in WEBSITES:
-            webbrowser.open(WEBSITES[name])
+            self.browser.open(WEBSITES[name])
             return f"Opening {name.title()}"
         elif name in APPS:
             self.app_launcher.open_app(APPS[name])
@@ -81,14 +132,14 @@ class CommandProcessor:
             return f"Opening {name.title()}"
         else:
             # Try to open as a general search
-            webbrowser.open(f"https://www.google.com/search?q={name}")
+            self.browser.open(f"https://www.google.com/search?q={name}")
             return f"Searching for {name} on Google"
 
     def get_lat_lon(self, city):
         """Get latitude and longitude for a city"""
         url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&appid={WEATHER_API_KEY}"
         try:
-            response = requests.get(url)
+            response = self.http.get(url)
             data = response.json()
             if data and len(data) > 0:
                 # Return the first match (most relevant)
@@ -99,14 +150,15 @@ class CommandProcessor:
             print("Error in get_lat_lon: ", e)
             return None, None
 
-    def get_weather(self, city=None):
-        """Get weather information for a city"""
+    def get_weather(self, city=None, coords=None):
+        """Get weather information for a city (coords skip the geocoding request)"""
         if not city:
             return "Please tell me which city you want the weather for."
 
         try:
-            # Get coordinates
-            coords = self.get_lat_lon(city)
+            # Get coordinates unless the gazetteer already supplied them
+            if coords is None:
+                coords = self.get_lat_lon(city)
 
             # Check if coordinates were successfully retrieved
             if coords is None or coords == (None, None):
@@ -120,7 +172,7 @@ class CommandProcessor:
 
             # Get weather data
             url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}"
-            res = requests.get(url)
+            res = self.http.get(url)
 
             if res.status_code != 200:
                 return "I had trouble retrieving the weather data. Please try again later."
@@ -397,17 +449,16 @@ class CommandProcessor:
         return self.search_for(final_query)
 
     def handle_follow_up(self, text):
-        if 'last_intent' in self.data_manager.context_memory:
-            last_intent = self.data_manager.context_memory['last_intent']
-            last_params = self.data_manager.context_memory.get(
-                'last_params', {})
+        last_turn = self.data_manager.context_memory.last_turn
+        last_intent = last_turn.intent if last_turn else None
+        last_params = last_turn.params if last_turn else {}
 
         # Define follow-up trigger words
         follow_up_words = ['more', 'tell me more',
                            'continue', 'explain', 'details']
 
         # Check if input matches any follow-up pattern
-        if any(word in text.lower() for word in follow_up_words):
+        if last_turn and any(word in text.lower() for word in follow_up_words):
             # Handle follow-up for a search
             if last_intent == 'search':
                 last_query = last_params.get('query', '')
@@ -432,13 +483,99 @@ class CommandProcessor:
             tone_prefix = ""
 
         # Store context for follow-up questions
-        self.data_manager.context_memory['last_intent'] = intent
-        self.data_manager.context_memory['last_params'] = params
-        self.data_manager.context_memory['last_sentiment'] = sentiment
+        self.data_manager.context_memory.record_turn(intent, params, sentiment)
 
         return tone_prefix
 
+    def describe_history(self, command):
+        """Answer questions about past interactions from the history store"""
+        command_lower = command.lower()
+        history = self.data_manager.history
+        today = datetime.date.today()
+
+        if 'yesterday' in command_lower or 'today' in command_lower:
+            day_name = 'yesterday' if 'yesterday' in command_lower else 'today'
+            day = today - datetime.timedelta(days=1) if day_name == 'yesterday' else today
+            items = history.on_date(day, limit=5)
+            if not items:
+                return f"You didn't ask me anything {day_name}."
+            asked = "; ".join(item['user_input'] for item in items)
+            return f"{day_name.capitalize()} you asked: {asked}."
+
+        return self.data_manager.get_user_stats()
+
+    def recall_conversation(self, command):
+        """Find what the assistant said earlier about a topic using full-text search"""
+        topic = command.lower()
+        for phrase in ['what did you tell me about', 'what did you say about',
+                       'you told me about', 'what you said about',
+                       'what did you tell me', 'what did you say', 'you told me', 'what you said']:
+            if phrase in topic:
+                topic = topic.split(phrase, 1)[1]
+                break
+        topic = topic.strip(' ?.')
+        if not topic:
+            return "What topic should I look for in our past conversations?"
+
+        matches = self.data_manager.history.search(topic, limit=3, exclude_intent='recall')
+        if not matches:
+            return f"I don't remember telling you anything about {topic}."
+
+        best = matches[0]
+        when = best['timestamp'].strftime("%B %d")
+        response = f"On {when} you asked '{best['user_input']}' and I said: {best['response']}"
+        if len(matches) > 1:
+            response += f" I found {len(matches) - 1} more related conversation{'s' if len(matches) > 2 else ''}."
+        return response
+
+    def handle_ui_control(self, action, params):
+        """Perform one UI action and return what to say about it"""
+        if action == 'switch_tab':
+            direction = params.get('direction', '')
+            action = 'previous_tab' if direction in ['previous', 'prev', 'left', 'back'] else 'next_tab'
+
+        if action == 'screenshot':
+            return self.ui_controller.screenshot()
+
+        if action == 'type_text':
+            text = params.get('text', '')
+            if not text:
+                return "Please specify what text you want me to type."
+            self.ui_controller.type_text(text)
+            return f"Typing: '{text}'"
+
+        if action not in UI_ACTION_RESPONSES:
+            return "I couldn't understand what UI action you want me to perform. Try commands like 'next tab', 'close window', 'volume up', 'pause', 'play', 'take screenshot', or 'type hello world'."
+
+        method, args, response = UI_ACTION_RESPONSES[action]
+        getattr(self.ui_controller, method)(*args)
+        return response
+
+    def process_fast_path(self, command, started):
+        """Answer fixed-phrase commands straight from the grammar, skipping the NLP stack"""
+        matched = self.command_grammar.match(command)
+        if matched is None:
+            return None
+        action, slots = matched
+        # A slot swallows the rest of the command, so "type hi then press enter"
+        # must go through the macro handling instead
+        if slots and len(parse_macro(command) or []) > 1:
+            return None
+        response = self.handle_ui_control(action, slots)
+
+        # Keep history and follow-up context, but skip sentiment, NER and preference learning
+        self.data_manager.context_memory.record_turn('ui_control', {'action': action, **slots}, 'neutral')
+        self.data_manager.history.add(command, response, 'neutral', intent='ui_control',
+                                      latency_ms=(time.perf_counter() - started) * 1000)
+        return response
+
     def process_command(self, command):
+        started = time.perf_counter()
+
+        fast_response = self.process_fast_path(command, started)
+        if fast_response is not None:
+            return fast_response, False
+
         original_command = command
         command = command.lower()
 
@@ -474,7 +611,7 @@ class CommandProcessor:
             response = self.smart_search(query, entities)
 
         elif intent == 'compose':
-            webbrowser.open("https://mail.google.com/mail/?view=cm&fs=1&tf=1")
+            self.browser.open("https://mail.google.com/mail/?view=cm&fs=1&tf=1")
             response = "Opening browser to compose an email."
 
         elif intent == 'open':
@@ -484,7 +621,7 @@ class CommandProcessor:
         elif intent == 'weather':
             city = params.get('city', params.get('location', None))
 
-            response = self.get_weather(city)
+            response = self.get_weather(city, params.get('coords'))
 
         elif intent == 'joke':
             response = self.tell_joke()
@@ -496,235 +633,19 @@ class CommandProcessor:
                 response = "Please provide a mathematical expression to calculate."
 
         elif intent == 'ui_control':
-            action = params.get('action', '')
-            direction = params.get('direction', '')
-            
-            if action == 'switch_tab':
-                if direction in ['next', 'right']:
-                    self.ui_controller.switch_tab('next')
-                    response = "Switching to the next tab."
-                elif direction in ['previous', 'prev', 'left', 'back']:
-                    self.ui_controller.switch_tab('previous')
-                    response = "Switching to the previous tab."
+            # Compound commands ("new tab, type hello then enter") run as one key sequence
+            macro = parse_macro(original_command)
+            if macro and len(macro) > 1:
+                if self.ui_controller.run_macro(macro):
+                    steps = [f"type '{text}'" if name == 'type_text' else name.replace('_', ' ')
+                             for name, text in macro]
+                    response = f"Done: {', '.join(steps)}."
                 else:
-                    # Default to next if direction is unclear
-                    self.ui_controller.switch_tab('next')
-                    response = "Switching to the next tab."
-                    
-            elif action == 'close_tab':
-                self.ui_controller.close_tab()
-                response = "Closed the current tab."
-                
-            elif action == 'new_tab':
-                self.ui_controller.new_tab()
-                response = "Opened a new tab."
-                
-            elif action == 'close_window':
-                self.ui_controller.close_window()
-                response = "Closed the window."
-                
-            elif action == 'minimise_window':
-                self.ui_controller.minimize_window()
-                response = "Minimized the window."
-                
-            elif action == 'maximise_window':
-                self.ui_controller.maximize_window()
-                response = "Maximized the window."
-                
-            elif action == 'volume_up':
-                self.ui_controller.volume_up()
-                response = "Increasing volume."
-                
-            elif action == 'volume_down':
-                self.ui_controller.volume_down()
-                response = "Decreasing volume."
-                
-            elif action == 'mute':
-                self.ui_controller.mute_volume()
-                response = "Muted volume."
-                
-            elif action == 'pause_play':
-                self.ui_controller.pause_play()
-                response = "Toggled pause/play."
-                
-            elif action == 'play':
-                self.ui_controller.play_media()
-                response = "Playing media."
-                
-            elif action == 'pause':
-                self.ui_controller.pause_media()
-                response = "Pausing media."
-                
-            elif action == 'next_track':
-                self.ui_controller.next_track()
-                response = "Skipping to next track."
-                
-            elif action == 'previous_track':
-                self.ui_controller.previous_track()
-                response = "Going to previous track."
-                
-            elif action == 'screenshot':
-                response = self.ui_controller.screenshot()
-                
-            elif action == 'type_text':
-                text = params.get('text', '')
-                if text:
-                    self.ui_controller.type_text(text)
-                    response = f"Typing: '{text}'"
-                else:
-                    response = "Please specify what text you want me to type."
-                    
-            elif action == 'copy':
-                self.ui_controller.copy_to_clipboard()
-                response = "Copied to clipboard."
-                
-            elif action == 'paste':
-                self.ui_controller.paste_from_clipboard()
-                response = "Pasted from clipboard."
-                
-            elif action == 'select_all':
-                self.ui_controller.select_all()
-                response = "Selected all text."
-                
-            elif action == 'undo':
-                self.ui_controller.undo()
-                response = "Undone last action."
-                
-            elif action == 'redo':
-                self.ui_controller.redo()
-                response = "Redone last action."
-                
-            elif action == 'alt_tab':
-                self.ui_controller.alt_tab()
-                response = "Switching applications."
-                
-            elif action == 'refresh':
-                self.ui_controller.refresh_page()
-                response = "Refreshed page."
-                
-            elif action == 'go_back':
-                self.ui_controller.go_back()
-                response = "Going back."
-                
-            elif action == 'go_forward':
-                self.ui_controller.go_forward()
-                response = "Going forward."
-                    
+                    response = "I couldn't complete those UI actions."
             else:
-                # Fallback - try to determine action from the original command
-                command_lower = original_command.lower()
-                
-                if any(phrase in command_lower for phrase in ['next tab', 'switch tab', 'change tab']):
-                    direction = 'next' if 'next' in command_lower or 'right' in command_lower else 'previous'
-                    self.ui_controller.switch_tab(direction)
-                    response = f"Switching to the {direction} tab."
-                    
-                elif any(phrase in command_lower for phrase in ['new tab', 'open tab']):
-                    self.ui_controller.new_tab()
-                    response = "Opened a new tab."
-                    
-                elif 'close tab' in command_lower:
-                    self.ui_controller.close_tab()
-                    response = "Closed the current tab."
-                    
-                elif 'close window' in command_lower:
-                    self.ui_controller.close_window()
-                    response = "Closed the window."
-                    
-                elif 'minimise' in command_lower:
-                    self.ui_controller.minimize_window()
-                    response = "Minimized the window."
-                    
-                elif 'maximise' in command_lower:
-                    self.ui_controller.maximize_window()
-                    response = "Maximized the window."
-                    
-                elif any(phrase in command_lower for phrase in ['volume up', 'increase volume', 'turn up']):
-                    self.ui_controller.volume_up()
-                    response = "Increasing volume."
-                    
-                elif any(phrase in command_lower for phrase in ['volume down', 'decrease volume', 'turn down']):
-                    self.ui_controller.volume_down()
-                    response = "Decreasing volume."
-                    
-                elif 'mute' in command_lower:
-                    self.ui_controller.mute_volume()
-                    response = "Muted volume."
-                    
-                elif any(phrase in command_lower for phrase in ['pause', 'play', 'pause play', 'play pause']):
-                    if 'pause' in command_lower and 'play' not in command_lower:
-                        self.ui_controller.pause_media()
-                        response = "Pausing media."
-                    elif 'play' in command_lower and 'pause' not in command_lower:
-                        self.ui_controller.play_media()
-                        response = "Playing media."
-                    else:
-                        self.ui_controller.pause_play()
-                        response = "Toggled pause/play."
-                        
-                elif any(phrase in command_lower for phrase in ['next track', 'next song', 'skip']):
-                    self.ui_controller.next_track()
-                    response = "Skipping to next track."
-                    
-                elif any(phrase in command_lower for phrase in ['previous track', 'previous song', 'back track']):
-                    self.ui_controller.previous_track()
-                    response = "Going to previous track."
-                    
-                elif 'screenshot' in command_lower:
-                    response = self.ui_controller.screenshot()
-                    
-                elif any(phrase in command_lower for phrase in ['copy', 'ctrl c']):
-                    self.ui_controller.copy_to_clipboard()
-                    response = "Copied to clipboard."
-                    
-                elif any(phrase in command_lower for phrase in ['paste', 'ctrl v']):
-                    self.ui_controller.paste_from_clipboard()
-                    response = "Pasted from clipboard."
-                    
-                elif any(phrase in command_lower for phrase in ['select all', 'ctrl a']):
-                    self.ui_controller.select_all()
-                    response = "Selected all text."
-                    
-                elif any(phrase in command_lower for phrase in ['undo', 'ctrl z']):
-                    self.ui_controller.undo()
-                    response = "Undone last action."
-                    
-                elif any(phrase in command_lower for phrase in ['redo', 'ctrl y']):
-                    self.ui_controller.redo()
-                    response = "Redone last action."
-                    
-                elif any(phrase in command_lower for phrase in ['alt tab', 'switch app']):
-                    self.ui_controller.alt_tab()
-                    response = "Switching applications."
-                    
-                elif any(phrase in command_lower for phrase in ['refresh', 'reload', 'f5']):
-                    self.ui_controller.refresh_page()
-                    response = "Refreshed page."
-                    
-                elif any(phrase in command_lower for phrase in ['go back', 'back', 'previous page']):
-                    self.ui_controller.go_back()
-                    response = "Going back."
-                    
-                elif any(phrase in command_lower for phrase in ['go forward', 'forward', 'next page']):
-                    self.ui_controller.go_forward()
-                    response = "Going forward."
-                    
-                elif any(phrase in command_lower for phrase in ['type ', 'write ', 'input ']):
-                    # Extract text to type from the command
-                    for phrase in ['type ', 'write ', 'input ']:
-                        if phrase in command_lower:
-                            text_to_type = command_lower.split(phrase, 1)[1].strip()
-                            if text_to_type:
-                                self.ui_controller.type_text(text_to_type)
-                                response = f"Typing: '{text_to_type}'"
-                            else:
-                                response = "Please specify what text you want me to type."
-                            break
-                    else:
-                        response = "Please specify what text you want me to type."
-                        
-                else:
-                    response = "I couldn't understand what UI action you want me to perform. Try commands like 'next tab', 'close window', 'volume up', 'pause', 'play', 'take screenshot', or 'type hello world'."
+                action = params.get('action') or match_ui_action(original_command)[0]
+                response = self.handle_ui_control(action, params)
+
         elif intent == 'greeting':
             # Personalized greeting based on time and sentiment
             hour = datetime.datetime.now().hour
@@ -748,7 +669,7 @@ class CommandProcessor:
 
         elif intent == 'goodbye':
             # Personalized goodbye based on interaction history
-            if len(self.data_manager.conversation_history) > 5:
+            if self.data_manager.history.count() > 5:
                 response = "It's been great chatting with you today! Goodbye and have a wonderful day!"
             else:
                 response = "Goodbye! Feel free to come back anytime for assistance."
@@ -765,6 +686,12 @@ class CommandProcessor:
             else:
                 return self.search_for(command), False
 
+        elif intent == 'history':
+            response = self.describe_history(command)
+
+        elif intent == 'recall':
+            response = self.recall_conversation(command)
+
         elif intent == 'intro':
             response = "My name is Nexus, your personal voice assistant. I can help you with simple but time consuming tasks, provide information, seting reminders and much more to enhance your productivity."
             return response, False
@@ -786,6 +713,7 @@ class CommandProcessor:
         # Learn from this interaction
         final_response = tone_prefix + response
         self.data_manager.learn_from_interaction(
-            original_command, final_response, sentiment, self.nlp_processor)
+            original_command, final_response, sentiment, self.nlp_processor,
+            intent=intent, latency_ms=(time.perf_counter() - started) * 1000)
 
         return final_response, False
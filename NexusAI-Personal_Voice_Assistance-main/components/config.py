@@ -4,16 +4,110 @@ from pathlib import Path
 SPEECH_RATE = 180
 SPEECH_VOLUME = 1.0
 
+# Fixed assistant phrases
+WELCOME_MESSAGE = "Hello! I'm NexusAI, your personal voice assistant. Say 'Nexus' followed by your command to wake me up."
+GOODBYE_MESSAGE = "Goodbye Sir! Have a great day!"
+ERROR_MESSAGE = "Sorry, I encountered an error. Please try again."
+SHUTDOWN_MESSAGE = "Shutting Down."
+
+# Conversation session: after a reply, commands are accepted without the wake word
+# until the follow-up window closes or the user says a sleep phrase
+SESSION_FOLLOW_UP_TIMEOUT = 10.0  # seconds after the assistant finishes speaking
+SESSION_SLEEP_PHRASES = ['go to sleep', 'sleep', 'stop listening', "that's all", 'that is all',
+                         'never mind', 'nevermind']
+SESSION_SLEEP_MESSAGE = "Okay, I'll be here when you need me."
+
+# Streamlit front end
+VOICE_EVENT_QUEUE_SIZE = 200    # pending voice events kept per browser session
+UI_REFRESH_INTERVAL = 0.5       # seconds between live panel refreshes
+CHAT_HISTORY_LIMIT = 50         # chat messages kept per browser session
+
 # Data Storage Configuration
 DATA_DIR = Path("nexus_ai_data")
-HISTORY_FILE = DATA_DIR / "conversation_history.json"
+HISTORY_FILE = DATA_DIR / "conversation_history.json"  # legacy, imported into HISTORY_DB_FILE once
+HISTORY_DB_FILE = DATA_DIR / "conversation_history.db"
+# Shorter words are left out of history search queries, along with stopwords
+HISTORY_SEARCH_MIN_LENGTH = 3
 PREFERENCES_FILE = DATA_DIR / "user_preferences.json"
-MEMORY_FILE = DATA_DIR / "context_memory.pickle"
+PREFERENCES_JOURNAL_FILE = DATA_DIR / "user_preferences.journal"
+MEMORY_FILE = DATA_DIR / "context_memory.json"
+CONTEXT_WINDOW = 10             # recent turns remembered for follow-ups
+CONTEXT_MAX_VALUE_LENGTH = 200  # longest parameter string kept per turn
+
+# User preference counters
+PREFERENCE_CAPACITY = 2000          # distinct tokens tracked (memory stays bounded)
+PREFERENCE_TOP_K = 10               # size of the maintained top list
+PREFERENCE_HALF_LIFE_DAYS = 30      # older interests fade; None disables decay
+PREFERENCE_COMPACT_EVERY = 500      # journal entries before a full snapshot is written
 
 # NLP Configuration
 NLTK_DOWNLOADS = ['punkt', 'punkt_tab', 'stopwords', 'wordnet',
                   'averaged_perceptron_tagger', 'maxent_ne_chunker', 'words']
 SPACY_MODEL = "en_core_web_sm"
+# Only the entity recognizer is needed; these components are not loaded
+SPACY_EXCLUDE = ['tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer']
+SPACY_BATCH_SIZE = 256
+# 'regex' is a fast tokenizer for lowercase ASCII transcripts (other text still
+# goes through NLTK); 'nltk' always uses word_tokenize
+PREPROCESS_TOKENIZER = 'regex'
+LEMMA_CACHE_SIZE = 4096
+
+# Local intent classifier (hashed n-grams + softmax regression); keyword scoring is the fallback
+INTENT_MODEL_FILE = DATA_DIR / "intent_model.npz"
+INTENT_MODEL_DIM = 2048            # hashed feature buckets
+INTENT_MODEL_THRESHOLD = 0.5       # lower confidence falls back to keyword scoring
+INTENT_MODEL_EPOCHS = 300
+INTENT_MODEL_HISTORY_LIMIT = 5000  # labelled history turns added to the training data
+INTENT_MODEL_RETRAIN_EVERY = 200   # new history turns before the saved model is retrained
+
+# Offline city gazetteer: bundled TSV (or a GeoNames citiesNNNN.txt dump) compiled
+# into a sorted, memory-mapped NumPy array so weather lookups skip geocoding
+GAZETTEER_SOURCE = Path(__file__).resolve().parent.parent / "data" / "cities.tsv"
+GAZETTEER_FILE = DATA_DIR / "gazetteer.npy"
+# Country and state names that may follow a city ("paris texas") -> ISO country code
+GAZETTEER_REGIONS = Path(__file__).resolve().parent.parent / "data" / "regions.tsv"
+GAZETTEER_NAME_BYTES = 48          # longer normalized names are skipped
+
+# Semantic cache for Gemini prompts
+SEMANTIC_CACHE_DIM = 1024
+SEMANTIC_CACHE_SIZE = 512
+SEMANTIC_CACHE_THRESHOLD = 0.9
+# Math answers are only reused for the same expression (exact match, whitespace ignored)
+MATH_CACHE_SIZE = 256
+
+# Pre-synthesized audio for frequent phrases (WAV files, least recently used evicted first)
+PHRASE_CACHE_DIR = DATA_DIR / "phrase_cache"
+PHRASE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+PHRASE_CACHE_MAX_CHARS = 160    # longer template fills are spoken live
+PHRASE_CACHE_PHRASES = [WELCOME_MESSAGE, GOODBYE_MESSAGE, ERROR_MESSAGE, SHUTDOWN_MESSAGE,
+                        "Sorry, I'm having trouble with speech recognition right now."]
+# "{}" matches any text; each distinct fill is cached separately, so only
+# list phrases that repeat (one-off reminder texts would just be rendered twice)
+PHRASE_CACHE_TEMPLATES = ["Opening {}"]
+
+# Reminder alert tones, generated with NumPy and cached as WAV files
+ALERT_DIR = DATA_DIR / "alerts"
+ALERT_SAMPLE_RATE = 22050
+ALERT_VOLUME = 0.4              # 0..1 of full scale
+ALERT_FADE = 0.01               # seconds of fade at each tone edge (avoids clicks)
+# name -> [(frequency Hz, seconds)]; a frequency of 0 is a pause
+ALERT_PATTERNS = {
+    'reminder': [(880, 0.15), (0, 0.08), (880, 0.15), (0, 0.08), (1320, 0.3)],
+    'notice': [(660, 0.12), (0, 0.05), (990, 0.18)],
+}
+
+# Captured speech is trimmed and downsampled before it is uploaded for recognition
+AUDIO_PREPROCESS = True
+AUDIO_TARGET_RATE = 16000       # Hz; recordings at higher rates are downsampled, never up
+AUDIO_TRIM_FRAME = 0.02         # seconds per energy frame
+AUDIO_TRIM_PADDING = 0.2        # seconds of silence kept around the speech
+
+# Gemini request limits
+GEMINI_MAX_WORKERS = 4          # threads issuing generate_content calls
+GEMINI_MAX_IN_FLIGHT = 16       # queued + running requests before new ones are rejected
+GEMINI_RATE_LIMIT = 1.0         # sustained requests per second
+GEMINI_RATE_BURST = 5           # short bursts allowed above the sustained rate
+GEMINI_REQUEST_TIMEOUT = 30     # seconds a caller waits for a response
 
 # Intent patterns for command classification
 INTENT_PATTERNS = {
@@ -30,6 +124,10 @@ INTENT_PATTERNS = {
     'goodbye': ['bye', 'goodbye', 'exit', 'quit', 'stop', 'end', 'see you', 'talk later', 'shut down', 'power off'],
     'intro': ['who are you', 'your name', 'introduce yourself', 'what can you do'],
     'compose': ['compose an email', 'compose mail', 'send mail', 'send email'],
+    'history': ['what did i ask', 'did i ask', 'my stats', 'my statistics', 'usage statistics'],
+    'recall': ['what did you tell me', 'what did you tell me about', 'what did you say',
+               'what did you say about', 'you told me', 'you told me about', 'what you said',
+               'remind me what you said'],
     'ui_control': [
         # Tab control
         'switch tab', 'change tab', 'next tab', 'previous tab', 'left tab', 'right tab',
@@ -77,6 +175,100 @@ INTENT_PATTERNS = {
     ]
 }
 
+# UI automation timing (pyautogui's own 0.1s pause after every call is disabled)
+UI_KEY_INTERVAL = 0.0     # seconds between keys of one hotkey or typed string
+UI_STEP_DELAY = 0.05      # seconds between steps of a multi-step command, so windows can catch up
+
+# Regexes mapping a UI command to an action name (first match per action wins)
+UI_ACTION_PATTERNS = {
+    # Tab controls
+    'switch_tab': [
+        r'\b(?:switch|change|move|go)\s+(?:to\s+)?(?:the\s+)?(?:next|previous|left|right)\s+tab\b',
+        r'\b(?:next|previous|left|right)\s+tab\b',
+        r'\b(?:switch|change)\s+tabs?\b'
+    ],
+    'close_tab': [r'\bclose\s+(?:this\s+|current\s+)?tab\b'],
+    'new_tab': [r'\b(?:new|open)\s+tab\b', r'\bopen\s+(?:a\s+)?new\s+tab\b'],
+
+    # Window controls
+    'close_window': [r'\bclose\s+(?:this\s+|current\s+)?window\b'],
+    'minimize_window': [r'\bminimi[sz]e\s+(?:this\s+|current\s+)?window\b'],
+    'maximize_window': [r'\bmaximi[sz]e\s+(?:this\s+|current\s+)?window\b'],
+
+    # Volume controls
+    'volume_up': [
+        r'\b(?:increase|turn\s+up|raise)\s+(?:the\s+)?volume\b',
+        r'\bvolume\s+up\b'
+    ],
+    'volume_down': [
+        r'\b(?:decrease|turn\s+down|lower)\s+(?:the\s+)?volume\b',
+        r'\bvolume\s+down\b'
+    ],
+    'mute': [r'\bmute\s+(?:the\s+)?(?:volume|sound|audio)\b', r'\bmute\b'],
+
+    # Media controls
+    'pause': [
+        r'\bpause\b(?!\s+play)',  # pause but not "pause play"
+        r'\bpause\s+(?:music|video|media|audio)\b'
+    ],
+    'play': [
+        r'\bplay\b(?!\s+pause)',  # play but not "play pause"
+        r'\bplay\s+(?:music|video|media|audio)\b',
+        r'\bresume\b'
+    ],
+    'pause_play': [
+        r'\bpause\s+play\b', r'\bplay\s+pause\b',
+        r'\btoggle\s+(?:play|pause)\b'
+    ],
+    'next_track': [
+        r'\b(?:next|skip)\s+(?:track|song|music)\b',
+        r'\bskip\b(?!\s+(?:to|forward))',
+        r'\bnext\s+(?:song|track)\b'
+    ],
+    'previous_track': [
+        r'\b(?:previous|back)\s+(?:track|song|music)\b',
+        r'\bprevious\s+(?:song|track)\b',
+        r'\bback\s+(?:song|track)\b'
+    ],
+
+    # Screenshot
+    'screenshot': [
+        r'\btake\s+(?:a\s+)?screenshot\b',
+        r'\bscreenshot\b',
+        r'\bcapture\s+screen\b'
+    ],
+
+    # Text input and editing
+    'type_text': [r'\btype\s+(.+)', r'\bwrite\s+(.+)', r'\binput\s+(.+)'],
+    'enter': [r'\b(?:press|hit)\s+enter\b', r'^enter$'],
+    'copy': [r'\bcopy\b', r'\bctrl\s*c\b'],
+    'paste': [r'\bpaste\b', r'\bctrl\s*v\b'],
+    'select_all': [r'\bselect\s+all\b', r'\bctrl\s*a\b'],
+    'undo': [r'\bundo\b', r'\bctrl\s*z\b'],
+    'redo': [r'\bredo\b', r'\bctrl\s*y\b'],
+
+    # Application and navigation
+    'alt_tab': [r'\balt\s+tab\b', r'\bswitch\s+(?:app|application)\b'],
+    'refresh': [r'\brefresh\b', r'\breload\b', r'\bf5\b'],
+    'go_back': [r'\bgo\s+back\b', r'\bback\b', r'\bprevious\s+page\b'],
+    'go_forward': [r'\bgo\s+forward\b', r'\bforward\b', r'\bnext\s+page\b']
+}
+
+# Entity extractors each intent needs (see NLPProcessor.ENTITY_EXTRACTORS); others run none
+INTENT_ENTITY_EXTRACTORS = {
+    'search': ['ner', 'time'],
+    'question': ['ner', 'location', 'math', 'time'],
+    'weather': ['gazetteer', 'location'],   # regex city phrases cover places the gazetteer lacks
+    'ui_control': ['ui_action', 'direction', 'type_text'],
+}
+
+# Slot templates for the command grammar fast path; {text} captures the rest of the command
+COMMAND_GRAMMAR_TEMPLATES = {
+    'type {text}': 'type_text',
+    'type text {text}': 'type_text',
+}
+COMMAND_GRAMMAR_IGNORE = ['please', 'now']   # filler words skipped outside slots
+
 # Emotional context patterns
 EMOTION_PATTERNS = {
     'positive': ['happy', 'good', 'great', 'excellent', 'wonderful', 'amazing', 'fantastic'],
@@ -84,6 +276,47 @@ EMOTION_PATTERNS = {
     'neutral': ['okay', 'fine', 'alright', 'normal']
 }
 
+# Sentiment analysis: 'lexicon' (fast, default) or 'textblob' (slower, needs textblob)
+SENTIMENT_MODE = 'lexicon'
+SENTIMENT_THRESHOLD = 0.1
+
+# Word polarities in [-1, 1], calibrated against TextBlob for common command words
+SENTIMENT_LEXICON = {
+    # Positive
+    'good': 0.7, 'great': 0.8, 'excellent': 1.0, 'wonderful': 1.0, 'amazing': 0.6,
+    'fantastic': 0.4, 'awesome': 1.0, 'perfect': 1.0, 'best': 1.0, 'better': 0.5,
+    'happy': 0.8, 'glad': 0.5, 'nice': 0.6, 'love': 0.5, 'lovely': 0.5,
+    'beautiful': 0.85, 'brilliant': 0.9, 'cool': 0.35, 'fun': 0.3, 'funny': 0.25,
+    'interesting': 0.5, 'fine': 0.4167, 'okay': 0.5, 'sure': 0.5, 'true': 0.35,
+    'pleased': 0.5, 'superb': 1.0, 'delightful': 1.0, 'enjoy': 0.4, 'enjoyable': 0.4,
+    'helpful': 0.5, 'useful': 0.3, 'easy': 0.4333, 'quick': 0.3333, 'fast': 0.2,
+    'free': 0.4, 'important': 0.4, 'special': 0.3571, 'super': 0.3333, 'pretty': 0.25,
+    'new': 0.1364, 'first': 0.25, 'more': 0.5, 'full': 0.35, 'right': 0.2857,
+    'real': 0.2, 'whole': 0.2, 'much': 0.2, 'high': 0.16, 'large': 0.2143,
+    'hot': 0.25, 'main': 0.1667, 'early': 0.1, 'old': 0.1, 'clear': 0.1,
+    'open': 0.0, 'next': 0.0, 'calm': 0.3, 'relaxed': 0.3, 'excited': 0.375,
+    'proud': 0.8, 'successful': 0.75, 'win': 0.8,
+    # Negative
+    'bad': -0.7, 'terrible': -1.0, 'awful': -1.0, 'horrible': -1.0, 'worst': -1.0,
+    'worse': -0.4, 'sad': -0.5, 'angry': -0.5, 'upset': -0.3, 'hate': -0.8,
+    'annoying': -0.8, 'annoyed': -0.8, 'boring': -1.0, 'bored': -0.5, 'stupid': -0.8,
+    'wrong': -0.5, 'poor': -0.4, 'sick': -0.7143, 'tired': -0.4, 'broken': -0.4,
+    'slow': -0.3, 'useless': -0.5, 'disappointed': -0.75, 'disappointing': -0.6,
+    'frustrated': -0.7, 'frustrating': -0.7, 'crazy': -0.6, 'hard': -0.2917,
+    'difficult': -0.5, 'unhappy': -0.6, 'lonely': -0.5, 'depressed': -0.5,
+    'scared': -0.5, 'afraid': -0.6, 'worried': -0.5, 'mad': -0.625, 'hurt': -0.4,
+    'cold': -0.6, 'small': -0.25, 'little': -0.1875, 'previous': -0.1667,
+    'late': -0.3, 'long': -0.05, 'fail': -0.5, 'failed': -0.5, 'ugly': -0.7,
+    'sorry': -0.5, 'nasty': -1.0, 'dumb': -0.375, 'miserable': -1.0,
+}
+SENTIMENT_NEGATIONS = ['not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither',
+                       'nor', 'cannot', 'without', 'hardly']
+SENTIMENT_INTENSIFIERS = {
+    'very': 1.3, 'really': 1.3, 'so': 1.2, 'too': 1.2, 'extremely': 1.5,
+    'incredibly': 1.5, 'absolutely': 1.5, 'totally': 1.4, 'quite': 1.1,
+    'somewhat': 0.7, 'slightly': 0.5, 'barely': 0.4,
+}
+
 # Website shortcuts
 WEBSITES = {
     'google': 'https://www.google.com',
@@ -104,6 +337,22 @@ APPS = {
     'powerpoint': 'powerpnt'
 }
 
+# Installed application index used by the app launcher
+APP_INDEX_FILE = DATA_DIR / "app_index.json"
+APP_INDEX_REFRESH_INTERVAL = 6 * 3600   # seconds between background rescans
+APP_INDEX_SCAN_DEPTH = 3                # folder levels searched below each install directory
+APP_INDEX_MATCH_CUTOFF = 0.75           # minimum similarity for a fuzzy name match
+APP_LAUNCH_STATS_FILE = DATA_DIR / "app_launch_stats.json"
+APP_LAUNCH_HEAD_START = 0.05            # seconds the usually-best strategy runs alone
+APP_LAUNCH_TIMEOUT = 3.0                # seconds to wait for any strategy to resolve a name
+APP_LAUNCH_FUZZY_GRACE = 0.3            # seconds exact strategies still get after a fuzzy index hit
+
+# Reminder time parsing: spoken forms are handled by rules, dateparser is the fallback
+REMINDER_DEFAULT_HOUR = 9               # "tomorrow" / "on friday" without a time
+REMINDER_PERIOD_HOURS = {'morning': 9, 'afternoon': 15, 'evening': 18, 'tonight': 20, 'night': 20}
+DATEPARSER_LANGUAGES = ['en']
+DATEPARSER_SETTINGS = {'PREFER_DATES_FROM': 'future', 'RETURN_AS_TIMEZONE_AWARE': False}
+
 # Jokes database
 JOKES = [
     "Why don't scientists trust atoms? Because they make up everything!",
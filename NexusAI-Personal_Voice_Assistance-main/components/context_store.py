@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from components.config import MEMORY_FILE, CONTEXT_WINDOW, CONTEXT_MAX_VALUE_LENGTH
+
+
+@dataclass
+class Turn:
+    """One processed command, as remembered for follow-ups"""
+    __slots__ = ('intent', 'params', 'sentiment', 'timestamp')
+    intent: str
+    params: dict
+    sentiment: str
+    timestamp: float
+
+    def to_row(self):
+        return [self.intent, self.params, self.sentiment, self.timestamp]
+
+    @classmethod
+    def from_row(cls, row):
+        intent, params, sentiment, timestamp = row
+        return cls(str(intent), dict(params), str(sentiment), float(timestamp))
+
+
+def _compact_params(params):
+    """Keep only small scalar parameters; entity dicts and other nested data are dropped"""
+    compact = {}
+    for key, value in params.items():
+        if isinstance(value, str):
+            compact[key] = value[:CONTEXT_MAX_VALUE_LENGTH]
+        elif isinstance(value, (int, float, bool)) or value is None:
+            compact[key] = value
+    return compact
+
+
+class ContextStore:
+    """Bounded window of recent turns, persisted as compact JSON with atomic replace.
+
+    The file only ever holds `window` small rows, so loading takes constant time,
+    and it is written to a temporary file and swapped in with os.replace so a
+    crash mid-write never leaves a corrupt context behind.
+    """
+
+    def __init__(self, path=MEMORY_FILE, window=CONTEXT_WINDOW, persist=True):
+        self.path = path
+        self.persist = persist
+        self.turns = deque(maxlen=window)
+        if self.persist:
+            self.load()
+
+    @property
+    def last_turn(self):
+        return self.turns[-1] if self.turns else None
+
+    def record_turn(self, intent, params, sentiment):
+        turn = Turn(intent, _compact_params(params), sentiment, time.time())
+        self.turns.append(turn)
+        return turn
+
+    def recent(self, intent=None):
+        """Most recent turns first, optionally only those with the given intent"""
+        return [turn for turn in reversed(self.turns) if intent is None or turn.intent == intent]
+
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.turns.extend(Turn.from_row(row) for row in data.get('turns', []))
+                print("Loaded previous context memory")
+        except Exception as e:
+            print(f"Could not load context memory: {e}")
+
+    def save(self):
+        if not self.persist:
+            return
+        try:
+            data = {'version': 1, 'turns': [turn.to_row() for turn in self.turns]}
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save context memory: {e}")
+
+    def clear(self):
+        self.turns.clear()
+        if self.persist and self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,42 @@
+import threading
+from components.nlp_processor import NLPProcessor
+from components.data_manager import DataManager
+from components.command_processor import CommandProcessor
+
+
+class NexusEngine:
+    """Process-wide assistant engine.
+
+    Holds the heavy, shareable parts of NexusAI (spaCy/NLTK models, the reminder
+    scheduler, the Gemini client and its caches, the TTS engine) so they are built
+    once per process. Front ends keep only their own light UI state and call into
+    a single engine instance.
+    """
+
+    def __init__(self):
+        print("Initializing NexusAI components...")
+        self.nlp_processor = NLPProcessor()
+        # History search skips the same stopwords as the NLP pipeline
+        self.data_manager = DataManager(stop_words=getattr(self.nlp_processor, 'stop_words', frozenset()))
+        self.nlp_processor.load_intent_model(history=self.data_manager.history)
+        self.command_processor = CommandProcessor(
+            self.nlp_processor,
+            self.data_manager
+        )
+        # Reuse the command processor's services instead of building a second
+        # TTS engine / microphone for the front end
+        self.audio_handler = self.command_processor.audio_handler
+        self.reminder_system = self.command_processor.reminder_system
+        self.summarizer = self.command_processor.summarizer
+
+        # Commands from concurrent sessions share context memory and the TTS
+        # engine, so they are processed one at a time
+        self.command_lock = threading.Lock()
+        print("NexusAI initialization complete!")
+
+    def process_command(self, command):
+        with self.command_lock:
+            return self.command_processor.process_command(command)
+
+    def save_all_data(self):
+        self.data_manager.save_all_data()
@@ -0,0 +1,164 @@
+import re
+import unicodedata
+from collections import namedtuple
+import numpy as np
+from components.config import GAZETTEER_SOURCE, GAZETTEER_FILE, GAZETTEER_NAME_BYTES, GAZETTEER_REGIONS
+
+Place = namedtuple('Place', ['name', 'country', 'lat', 'lon', 'population'])
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_place_name(name):
+    """'São Paulo' -> 'sao paulo', 'St. Petersburg' -> 'st petersburg'"""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return _NON_WORD_RE.sub(' ', name.lower().replace("'", '')).strip()
+
+
+def _read_rows(path):
+    """(name, aliases, country, lat, lon, population) from the bundled TSV or a GeoNames dump"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or line.startswith('name\t'):
+                continue
+            fields = line.rstrip('\n').split('\t')
+            try:
+                if len(fields) >= 15:  # GeoNames: id, name, asciiname, alternatenames, lat, lon, ...
+                    yield (fields[1], [fields[2]], fields[8],
+                           float(fields[4]), float(fields[5]), int(fields[14] or 0))
+                elif len(fields) >= 5:
+                    aliases = fields[5].split(',') if len(fields) > 5 and fields[5] else []
+                    yield (fields[0], aliases, fields[1],
+                           float(fields[2]), float(fields[3]), int(fields[4] or 0))
+            except ValueError:
+                continue
+
+
+def _read_regions(path):
+    """Normalized country/region name -> ISO country code"""
+    regions = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if line.startswith('#') or fields[0] == 'name' or len(fields) < 2:
+                    continue
+                regions[normalize_place_name(fields[0])] = fields[1]
+    except OSError as e:
+        print(f"Could not load gazetteer regions: {e}")
+    return regions
+
+
+class Gazetteer:
+    """Offline city lookup: place names in free text -> coordinates.
+
+    The source file is compiled once into a NumPy structured array sorted by
+    normalized name and memory-mapped on later runs, so loading is cheap and
+    each lookup is a binary search.
+    """
+
+    def __init__(self, source=GAZETTEER_SOURCE, path=GAZETTEER_FILE, regions=GAZETTEER_REGIONS):
+        self.source = source
+        self.path = path
+        self.dtype = np.dtype([('key', f'S{GAZETTEER_NAME_BYTES}'), ('name', f'S{GAZETTEER_NAME_BYTES}'),
+                               ('country', 'S2'), ('lat', '<f4'), ('lon', '<f4'), ('population', '<u4')])
+        self.table = self._load()
+        self.keys = self.table['key']
+        # Longest name in words bounds how far the scanner looks ahead, and only
+        # words that start some name are worth a binary search
+        self.max_words = int(np.char.count(self.keys, b' ').max()) + 1 if len(self.table) else 0
+        self.first_words = {key.split(b' ', 1)[0].decode('ascii') for key in self.keys}
+        self.regions = _read_regions(regions)
+        self.max_region_words = max((name.count(' ') + 1 for name in self.regions), default=0)
+
+    def __len__(self):
+        return len(self.table)
+
+    def _load(self):
+        try:
+            if self.path.exists() and self.path.stat().st_mtime >= self.source.stat().st_mtime:
+                table = np.load(self.path, mmap_mode='r')
+                if table.dtype == self.dtype:
+                    return table
+        except Exception as e:
+            print(f"Could not load gazetteer: {e}")
+        return self.compile()
+
+    def compile(self):
+        """Build the sorted array from the source file and save it next to the other data"""
+        records = []
+        for name, aliases, country, lat, lon, population in _read_rows(self.source):
+            display = name.encode('utf-8')[:GAZETTEER_NAME_BYTES]
+            for key in {normalize_place_name(n) for n in [name] + aliases if n}:
+                key = key.encode('ascii')
+                if key and len(key) <= GAZETTEER_NAME_BYTES:
+                    records.append((key, display, country.encode('ascii', 'ignore')[:2],
+                                    lat, lon, min(population, 2 ** 32 - 1)))
+        table = np.array(records, dtype=self.dtype)
+        table.sort(order=['key', 'population'])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(self.path, table)
+        except Exception as e:
+            print(f"Could not save gazetteer: {e}")
+        return table
+
+    def lookup(self, name):
+        """Most populous place called `name` (any spelling normalize_place_name accepts), or None"""
+        return self._lookup_key(normalize_place_name(name).encode('ascii'))
+
+    def _lookup_key(self, key, country=None):
+        start = int(np.searchsorted(self.keys, key, side='left'))
+        end = int(np.searchsorted(self.keys, key, side='right'))
+        # Rows with the same key are sorted by population, so the last is the largest
+        for index in range(end - 1, start - 1, -1):
+            row = self.table[index]
+            if country is None or row['country'].decode('ascii') == country:
+                break
+        else:
+            return None
+        return Place(row['name'].decode('utf-8', 'ignore'), row['country'].decode('ascii'),
+                     round(float(row['lat']), 4), round(float(row['lon']), 4), int(row['population']))
+
+    def _region_after(self, words, start):
+        """(country code, word count) for a country or region name starting at words[start]"""
+        for size in range(min(self.max_region_words, len(words) - start), 0, -1):
+            country = self.regions.get(' '.join(words[start:start + size]))
+            if country:
+                return country, size
+        return None, 0
+
+    def scan(self, text):
+        """All places mentioned in `text`, left to right, preferring the longest name at each word.
+
+        A country or region right after the name picks the city in that
+        country ("london canada"); if there is none ("paris texas"), the name is
+        skipped rather than resolved to the wrong city.
+        """
+        words = normalize_place_name(text).split()
+        places = []
+        i = 0
+        while i < len(words):
+            if words[i] not in self.first_words:
+                i += 1
+                continue
+            for size in range(min(self.max_words, len(words) - i), 0, -1):
+                key = ' '.join(words[i:i + size]).encode('ascii')
+                place = self._lookup_key(key)
+                if not place:
+                    continue
+                country, region_size = self._region_after(words, i + size)
+                if country:
+                    place = self._lookup_key(key, country)
+                if place:
+                    places.append(place)
+                i += size + region_size
+                break
+            else:
+                i += 1
+        return places
+
+    def find(self, text):
+        """First place mentioned in `text`, or None"""
+        places = self.scan(text)
+        return places[0] if places else None
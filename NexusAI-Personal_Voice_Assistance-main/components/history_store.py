@@ -0,0 +1,216 @@
+import datetime
+import re
+import sqlite3
+import threading
+import time
+from components.config import HISTORY_DB_FILE, HISTORY_SEARCH_MIN_LENGTH
+
+
+class HistoryStore:
+    """Conversation history in an indexed SQLite table.
+
+    Every turn is one row in `conversations` (indexed by timestamp and intent).
+    A per-day rollup table is updated in the same transaction, so counts,
+    sentiment/intent breakdowns and latency trends are read from a few hundred
+    rollup rows instead of scanning the full history.
+    """
+
+    _search_token_re = re.compile(r"\w+")
+
+    def __init__(self, db_path=HISTORY_DB_FILE, persist=True, stop_words=frozenset()):
+        self.db_path = str(db_path) if persist else ":memory:"
+        self.stop_words = stop_words  # left out of search queries
+        self.fts_enabled = False
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.init_db()
+
+    def init_db(self):
+        with self._lock, self.conn:
+            if self.db_path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                user_input TEXT NOT NULL,
+                response TEXT,
+                intent TEXT,
+                sentiment TEXT,
+                latency_ms REAL
+            )''')
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp)")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversations_intent ON conversations(intent, timestamp)")
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS conversation_daily (
+                day TEXT NOT NULL,
+                intent TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                latency_total REAL NOT NULL DEFAULT 0,
+                latency_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, intent, sentiment)
+            )''')
+            self._init_fts()
+
+    def _init_fts(self):
+        # Full-text index over inputs and responses, kept in sync by a trigger
+        try:
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'conversations_fts'").fetchone()
+            self.conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                user_input, response, content='conversations', content_rowid='id',
+                tokenize='porter unicode61'
+            )''')
+            self.conn.execute('''CREATE TRIGGER IF NOT EXISTS conversations_fts_insert
+                AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts (rowid, user_input, response)
+                    VALUES (new.id, new.user_input, new.response);
+                END''')
+            self.conn.execute('''CREATE TRIGGER IF NOT EXISTS conversations_fts_delete
+                AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conversations_fts (conversations_fts, rowid, user_input, response)
+                    VALUES ('delete', old.id, old.user_input, old.response);
+                END''')
+            if not exists:
+                # Index rows stored before full-text search was available
+                self.conn.execute(
+                    "INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable (SQLite built without FTS5): {e}")
+
+    def add(self, user_input, response, sentiment, intent=None, latency_ms=None, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        day = datetime.date.fromtimestamp(timestamp).isoformat()
+        intent = intent or 'unknown'
+        sentiment = sentiment or 'neutral'
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                '''INSERT INTO conversations (timestamp, user_input, response, intent, sentiment, latency_ms)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (timestamp, user_input, response, intent, sentiment, latency_ms))
+            self.conn.execute(
+                '''INSERT INTO conversation_daily (day, intent, sentiment, count, latency_total, latency_count)
+                   VALUES (?, ?, ?, 1, ?, ?)
+                   ON CONFLICT (day, intent, sentiment) DO UPDATE SET
+                       count = count + 1,
+                       latency_total = latency_total + excluded.latency_total,
+                       latency_count = latency_count + excluded.latency_count''',
+                (day, intent, sentiment, latency_ms or 0.0, 1 if latency_ms is not None else 0))
+            return cursor.lastrowid
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _to_dict(row):
+        item = dict(row)
+        item['timestamp'] = datetime.datetime.fromtimestamp(item['timestamp'])
+        return item
+
+    def count(self):
+        return self._query("SELECT COALESCE(SUM(count), 0) FROM conversation_daily")[0][0]
+
+    def first_and_last(self):
+        """Datetimes of the first and last interaction (None, None if empty)"""
+        first, last = self._query(
+            "SELECT MIN(timestamp), MAX(timestamp) FROM conversations")[0]
+        if first is None:
+            return None, None
+        return datetime.datetime.fromtimestamp(first), datetime.datetime.fromtimestamp(last)
+
+    def sentiment_counts(self):
+        rows = self._query(
+            "SELECT sentiment, SUM(count) FROM conversation_daily GROUP BY sentiment")
+        return {sentiment: count for sentiment, count in rows}
+
+    def intent_counts(self, since=None):
+        """Interactions per intent, optionally only from the date `since` onwards"""
+        day = since.isoformat() if since else ''
+        rows = self._query(
+            '''SELECT intent, SUM(count) AS total FROM conversation_daily
+               WHERE day >= ? GROUP BY intent ORDER BY total DESC''', (day,))
+        return {intent: count for intent, count in rows}
+
+    def latency_trend(self, days=7):
+        """[(day, average latency in ms, interactions)] for the last `days` days"""
+        since = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat()
+        rows = self._query(
+            '''SELECT day, SUM(latency_total), SUM(latency_count), SUM(count)
+               FROM conversation_daily WHERE day >= ? GROUP BY day ORDER BY day''', (since,))
+        return [(day, total / measured if measured else None, count)
+                for day, total, measured, count in rows]
+
+    def between(self, start, end, limit=50):
+        """Interactions with start <= timestamp < end, oldest first"""
+        rows = self._query(
+            '''SELECT * FROM conversations WHERE timestamp >= ? AND timestamp < ?
+               ORDER BY timestamp LIMIT ?''', (start.timestamp(), end.timestamp(), limit))
+        return [self._to_dict(row) for row in rows]
+
+    def on_date(self, date, limit=50):
+        start = datetime.datetime.combine(date, datetime.time.min)
+        return self.between(start, start + datetime.timedelta(days=1), limit)
+
+    def recent(self, limit=10):
+        rows = self._query(
+            "SELECT * FROM conversations ORDER BY timestamp DESC LIMIT ?", (limit,))
+        return [self._to_dict(row) for row in rows]
+
+    def labelled(self, limit=5000):
+        """Most recent (user_input, intent) pairs with a known intent, e.g. for training"""
+        rows = self._query(
+            '''SELECT user_input, intent FROM conversations WHERE intent != 'unknown'
+               ORDER BY timestamp DESC LIMIT ?''', (limit,))
+        return [(row[0], row[1]) for row in rows]
+
+    def search(self, text, limit=5, exclude_intent=None):
+        """Past interactions matching any content word of `text`, best matches first"""
+        # Stopwords and very short words would match almost every row
+        words = [word for word in dict.fromkeys(self._search_token_re.findall(text.lower()))
+                 if len(word) >= HISTORY_SEARCH_MIN_LENGTH and word not in self.stop_words]
+        if not words:
+            return []
+        exclude_intent = exclude_intent or ''
+
+        if self.fts_enabled:
+            # Quote every word so user text can't inject FTS query syntax
+            query = " OR ".join(f'"{word}"' for word in words)
+            rows = self._query(
+                '''SELECT c.* FROM conversations_fts f
+                   JOIN conversations c ON c.id = f.rowid
+                   WHERE conversations_fts MATCH ? AND c.intent != ?
+                   ORDER BY bm25(conversations_fts, 2.0, 1.0) LIMIT ?''',
+                (query, exclude_intent, limit))
+        else:
+            clauses = " OR ".join("user_input LIKE ? OR response LIKE ?" for _ in words)
+            params = [f"%{word}%" for word in words for _ in range(2)]
+            rows = self._query(
+                f'''SELECT * FROM conversations WHERE ({clauses}) AND intent != ?
+                    ORDER BY timestamp DESC LIMIT ?''',
+                (*params, exclude_intent, limit))
+        return [self._to_dict(row) for row in rows]
+
+    def import_items(self, items):
+        """Bulk-import legacy history dicts (timestamp, user_input, response, sentiment)"""
+        for item in items:
+            timestamp = item.get('timestamp')
+            if isinstance(timestamp, str):
+                timestamp = datetime.datetime.fromisoformat(timestamp)
+            self.add(item.get('user_input', ''), item.get('response'), item.get('sentiment'),
+                     intent=item.get('intent'),
+                     timestamp=timestamp.timestamp() if timestamp else None)
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM conversations")
+            self.conn.execute("DELETE FROM conversation_daily")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import time
+import numpy as np
+from components.config import (INTENT_PATTERNS, INTENT_MODEL_FILE, INTENT_MODEL_DIM,
+                               INTENT_MODEL_EPOCHS, INTENT_MODEL_HISTORY_LIMIT,
+                               INTENT_MODEL_RETRAIN_EVERY)
+from features.semantic_cache import HashingEmbedder
+
+
+def patterns_fingerprint():
+    """Changes whenever INTENT_PATTERNS does, so a saved model can be detected as stale"""
+    data = json.dumps(INTENT_PATTERNS, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def training_examples(history=None, limit=INTENT_MODEL_HISTORY_LIMIT):
+    """(texts, labels) from INTENT_PATTERNS plus labelled turns from a HistoryStore"""
+    texts, labels = [], []
+    for intent, patterns in INTENT_PATTERNS.items():
+        texts.extend(patterns)
+        labels.extend([intent] * len(patterns))
+    if history is not None:
+        for text, intent in history.labelled(limit):
+            if intent in INTENT_PATTERNS:
+                texts.append(text)
+                labels.append(intent)
+    return texts, labels
+
+
+class IntentClassifier:
+    """Linear softmax classifier over hashed word and character n-grams.
+
+    Weights are a (intents x features) NumPy matrix, so scoring a command is one
+    matrix-vector product and scoring a batch is one matrix-matrix product.
+    """
+
+    def __init__(self, dim=INTENT_MODEL_DIM):
+        self.dim = dim
+        self.embedder = HashingEmbedder(dim)
+        self.labels = []
+        self.weights = None  # (intents, dim)
+        self.bias = None     # (intents,)
+        self.fingerprint = ''
+        self.history_size = 0  # history turns available when the model was trained
+
+    def featurize(self, texts):
+        features = np.stack([self.embedder(text) for text in texts])
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return features / np.maximum(norms, 1e-6)
+
+    def train(self, texts, labels, epochs=INTENT_MODEL_EPOCHS, learning_rate=10.0, l2=1e-4):
+        """Full-batch gradient descent on class-balanced cross-entropy"""
+        self.labels = sorted(set(labels))
+        index = {label: i for i, label in enumerate(self.labels)}
+        targets = np.array([index[label] for label in labels])
+        features = self.featurize(texts)
+
+        one_hot = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        one_hot[np.arange(len(texts)), targets] = 1.0
+        # Intents with many patterns (e.g. ui_control) would otherwise dominate
+        counts = np.bincount(targets, minlength=len(self.labels))
+        sample_weights = (len(texts) / (len(self.labels) * counts[targets])).astype(np.float32)
+
+        self.weights = np.zeros((len(self.labels), self.dim), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+        for _ in range(epochs):
+            probabilities = self._softmax(features @ self.weights.T + self.bias)
+            error = (probabilities - one_hot) * sample_weights[:, None] / len(texts)
+            self.weights -= learning_rate * (error.T @ features + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        self.fingerprint = patterns_fingerprint()
+        return self
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict_proba_batch(self, texts):
+        return self._softmax(self.featurize(texts) @ self.weights.T + self.bias)
+
+    def predict_batch(self, texts):
+        """[(intent, confidence)] for each text"""
+        probabilities = self.predict_proba_batch(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    def predict(self, text):
+        features = self.embedder(text)
+        features /= max(np.linalg.norm(features), 1e-6)
+        probabilities = self._softmax(self.weights @ features + self.bias)
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path=INTENT_MODEL_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # np.savez adds .npz to names without it, so write the final name directly
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, weights=self.weights.astype(np.float16), bias=self.bias,
+                                labels=np.array(self.labels), dim=np.array(self.dim),
+                                fingerprint=np.array(self.fingerprint),
+                                history_size=np.array(self.history_size))
+
+    @classmethod
+    def load(cls, path=INTENT_MODEL_FILE):
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(int(data['dim']))
+            model.weights = data['weights'].astype(np.float32)
+            model.bias = data['bias'].astype(np.float32)
+            model.labels = [str(label) for label in data['labels']]
+            model.fingerprint = str(data['fingerprint'])
+            model.history_size = int(data['history_size'])
+        return model
+
+
+def load_or_train(history=None, path=INTENT_MODEL_FILE, persist=True):
+    """Load the saved model, retraining (and saving) it if missing or out of date"""
+    history_size = history.count() if history is not None else 0
+    if persist and path.exists():
+        try:
+            model = IntentClassifier.load(path)
+            if (model.fingerprint == patterns_fingerprint()
+                    and history_size - model.history_size < INTENT_MODEL_RETRAIN_EVERY):
+                return model
+        except Exception as e:
+            print(f"Could not load intent model: {e}")
+
+    started = time.perf_counter()
+    texts, labels = training_examples(history)
+    model = IntentClassifier().train(texts, labels)
+    model.history_size = history_size
+    print(f"Trained intent model on {len(texts)} examples in {time.perf_counter() - started:.2f}s")
+    if persist:
+        try:
+            model.save(path)
+        except Exception as e:
+            print(f"Could not save intent model: {e}")
+    return model
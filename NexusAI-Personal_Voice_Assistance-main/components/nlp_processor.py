@@ -4,15 +4,40 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from nltk.chunk import ne_chunk
 from nltk.tag import pos_tag
-from textblob import TextBlob
+try:
+    from textblob import TextBlob
+except ImportError:  # Only needed for the accurate sentiment mode
+    TextBlob = None
 import spacy
 import difflib
-from components.config import NLTK_DOWNLOADS, SPACY_MODEL, INTENT_PATTERNS, EMOTION_PATTERNS
+import re
+from functools import lru_cache
+from components.config import (NLTK_DOWNLOADS, SPACY_MODEL, SPACY_EXCLUDE, SPACY_BATCH_SIZE,
+                               INTENT_PATTERNS, SENTIMENT_MODE, SENTIMENT_THRESHOLD,
+                               PREPROCESS_TOKENIZER, LEMMA_CACHE_SIZE, UI_ACTION_PATTERNS,
+                               INTENT_ENTITY_EXTRACTORS, INTENT_MODEL_THRESHOLD)
+from components.sentiment import LexiconSentiment
+from components.intent_classifier import load_or_train
+from components.gazetteer import Gazetteer
+
+
+# Speech transcripts are lowercase ASCII words, so a plain regex is enough
+ASCII_TOKEN_RE = re.compile(r"[a-z]+")
 
 
 class NLPProcessor:
-    def __init__(self):
+    def __init__(self, sentiment_mode=SENTIMENT_MODE, tokenizer=PREPROCESS_TOKENIZER):
+        self.sentiment_mode = sentiment_mode
+        self.tokenizer = tokenizer
+        self.lexicon_sentiment = LexiconSentiment()
+        self._entity_plans = {}  # intent -> ordered extractor names
+        self.intent_model = None  # set by load_intent_model()
         self.setup_nlp()
+        try:
+            self.gazetteer = Gazetteer()
+        except Exception as e:
+            print(f"City gazetteer unavailable: {e}")
+            self.gazetteer = None
 
     def setup_nlp(self):
         try:
@@ -24,10 +49,17 @@ class NLPProcessor:
                     nltk.download(item, quiet=True)
             # Initialize NLP tools
             self.lemmatizer = WordNetLemmatizer()
-            self.stop_words = set(stopwords.words('english'))
+            self.stop_words = frozenset(stopwords.words('english'))
+            # Vocabulary is small and repetitive: memoize token -> lemma (or None)
+            self._normalize_token = lru_cache(maxsize=LEMMA_CACHE_SIZE)(
+                self._normalize_token_uncached)
             # Try to load spaCy model
             try:
-                self.nlp = spacy.load(SPACY_MODEL)
+                # Only doc.ents is used, so skip loading the other components
+                self.nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                # Drop the shared tok2vec too if nothing left in the pipeline listens to it
+                if 'tok2vec' in self.nlp.pipe_names and not self.nlp.get_pipe('tok2vec').listening_components:
+                    self.nlp.remove_pipe('tok2vec')
             except OSError:
                 print(
                     f"spaCy model not found. Install with: python -m spacy download {SPACY_MODEL}")
@@ -36,28 +68,97 @@ class NLPProcessor:
         except Exception as e:
             print(f"NLP setup warning: {e}")
 
+    def _normalize_token_uncached(self, token):
+        # Stopwords and non-alphabetic tokens are dropped
+        if token in self.stop_words or not token.isalpha():
+            return None
+        return self.lemmatizer.lemmatize(token)
+
     def preprocess_text(self, text):
         # Convert to lowercase
         text = text.lower()
 
         # Tokenize
-        tokens = word_tokenize(text)
+        if self.tokenizer == 'regex' and text.isascii():
+            tokens = ASCII_TOKEN_RE.findall(text)
+        else:
+            tokens = word_tokenize(text)
 
         # Remove stopwords and lemmatize
         processed_tokens = []
         for token in tokens:
-            if token not in self.stop_words and token.isalpha():
-                lemmatized = self.lemmatizer.lemmatize(token)
+            lemmatized = self._normalize_token(token)
+            if lemmatized is not None:
                 processed_tokens.append(lemmatized)
 
         return processed_tokens
 
-    def extract_entities(self, text):
+    # Entity extractors: name -> (method, extractors that must run first).
+    # Each method adds its findings to the shared `entities` dict.
+    ENTITY_EXTRACTORS = {
+        'ner': ('_extract_named_entities', []),
+        'gazetteer': ('_extract_places', []),
+        'location': ('_extract_locations', ['gazetteer']),
+        'math': ('_extract_math', []),
+        'time': ('_extract_times', []),
+        'ui_action': ('_extract_ui_actions', []),
+        'direction': ('_extract_directions', ['ui_action']),
+        'type_text': ('_extract_text_to_type', ['ui_action']),
+    }
+
+    def entity_plan(self, intent=None):
+        """Extractor names to run for `intent`, dependencies first (all of them if intent is None)"""
+        if intent in self._entity_plans:
+            return self._entity_plans[intent]
+
+        if intent is None:
+            wanted = list(self.ENTITY_EXTRACTORS)
+        else:
+            wanted = INTENT_ENTITY_EXTRACTORS.get(intent, [])
+
+        plan = []
+        def visit(name):
+            if name not in plan:
+                for dependency in self.ENTITY_EXTRACTORS[name][1]:
+                    visit(dependency)
+                plan.append(name)
+        for name in wanted:
+            visit(name)
+
+        self._entity_plans[intent] = plan
+        return plan
+
+    def extract_entities(self, text, intent=None):
+        plan = self.entity_plan(intent)
+        # spaCy only runs when named entities are actually needed
+        doc = self.nlp(text) if self.nlp and 'ner' in plan else None
+        return self._build_entities(text, doc, plan)
+
+    def extract_entities_batch(self, texts, batch_size=SPACY_BATCH_SIZE, n_process=1, intent=None):
+        """Extract entities for many texts at once using spaCy's nlp.pipe"""
+        texts = list(texts)
+        plan = self.entity_plan(intent)
+        if self.nlp and 'ner' in plan:
+            docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        else:
+            docs = [None] * len(texts)
+        return [self._build_entities(text, doc, plan) for text, doc in zip(texts, docs)]
+
+    def _build_entities(self, text, doc, plan=None):
         entities = {}
+        text_lower = text.lower()
+        for name in (self.entity_plan() if plan is None else plan):
+            if name == 'ner':
+                self._extract_named_entities(text, doc, entities)
+            else:
+                getattr(self, self.ENTITY_EXTRACTORS[name][0])(text, text_lower, entities)
+
+        # Clean up empty entity lists
+        return {k: v for k, v in entities.items() if v}
 
-        if self.nlp:
+    def _extract_named_entities(self, text, doc, entities):
+        if doc is not None:
             # Use spaCy for entity extraction
-            doc = self.nlp(text)
             for ent in doc.ents:
                 # Clean and normalize entity text
                 entity_text = ent.text.strip().title()
@@ -91,10 +192,20 @@ class NLPProcessor:
                 print(f"Error in NLTK entity extraction: {e}")
                 # Continue with empty entities if NLTK fails
 
-        # Post-processing: Add manual entity detection for common patterns
-        text_lower = text.lower()
-
-        # Detect city names from common weather patterns
+    def _extract_places(self, text, text_lower, entities):
+        """Known cities from the offline gazetteer (GPE names, PLACE records with coordinates)"""
+        if self.gazetteer is None:
+            return
+        for place in self.gazetteer.scan(text_lower):
+            entities.setdefault('PLACE', []).append(place)
+            gpe = entities.setdefault('GPE', [])
+            if place.name not in gpe:
+                gpe.append(place.name)
+
+    def _extract_locations(self, text, text_lower, entities):
+        """City names from common weather phrasings (GPE)"""
+        if entities.get('PLACE'):
+            return  # the gazetteer already knows where this is
         weather_city_patterns = [
             r'(?:tell\s+me\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
             r'(?:tell\s+me\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
@@ -108,7 +219,6 @@ class NLPProcessor:
         ]
 
         for pattern in weather_city_patterns:
-            import re
             matches = re.findall(pattern, text, re.IGNORECASE)
             for match in matches:
                 city = match.strip().title()
@@ -121,7 +231,8 @@ class NLPProcessor:
                     if city not in entities['GPE']:
                         entities['GPE'].append(city)
 
-        # Detect mathematical expressions for calculation
+    def _extract_math(self, text, text_lower, entities):
+        """Flag mathematical expressions (MATH)"""
         math_patterns = [
             r'\b\d+(?:\.\d+)?\b',  # Numbers
             r'\b(?:plus|minus|times|divide|multiply|add|subtract)\b',  # Math words
@@ -140,7 +251,8 @@ class NLPProcessor:
                 entities['MATH'] = []
             entities['MATH'].append('mathematical_expression')
 
-        # Detect time expressions for reminders
+    def _extract_times(self, text, text_lower, entities):
+        """Time expressions for reminders (TIME)"""
         time_patterns = [
             r'\b(?:at|in) (\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)?)\b',
             r'\b(?:after|in) (\d+)\s*(?:minutes?|hours?|days?)\b',
@@ -158,86 +270,9 @@ class NLPProcessor:
                     if time_expr not in entities['TIME']:
                         entities['TIME'].append(time_expr.strip())
 
-        # Enhanced UI control actions and directions detection
-        ui_action_patterns = {
-            # Tab controls
-            'switch_tab': [
-                r'\b(?:switch|change|move|go)\s+(?:to\s+)?(?:the\s+)?(?:next|previous|left|right)\s+tab\b',
-                r'\b(?:next|previous|left|right)\s+tab\b'
-            ],
-            'close_tab': [r'\bclose\s+(?:this\s+|current\s+)?tab\b'],
-            'new_tab': [r'\b(?:new|open)\s+tab\b', r'\bopen\s+(?:a\s+)?new\s+tab\b'],
-
-            # Window controls
-            'close_window': [r'\bclose\s+(?:this\s+|current\s+)?window\b'],
-            'minimize_window': [r'\bminimize\s+(?:this\s+|current\s+)?window\b'],
-            'maximize_window': [r'\bmaximize\s+(?:this\s+|current\s+)?window\b'],
-
-            # Volume controls
-            'volume_up': [
-                r'\b(?:increase|turn\s+up|raise)\s+(?:the\s+)?volume\b',
-                r'\bvolume\s+up\b'
-            ],
-            'volume_down': [
-                r'\b(?:decrease|turn\s+down|lower)\s+(?:the\s+)?volume\b',
-                r'\bvolume\s+down\b'
-            ],
-            'mute': [r'\bmute\s+(?:the\s+)?(?:volume|sound|audio)\b', r'\bmute\b'],
-
-            # Media controls
-            'pause': [
-                r'\bpause\b(?!\s+play)',  # pause but not "pause play"
-                r'\bpause\s+(?:music|video|media|audio)\b'
-            ],
-            'play': [
-                r'\bplay\b(?!\s+pause)',  # play but not "play pause"
-                r'\bplay\s+(?:music|video|media|audio)\b',
-                r'\bresume\b'
-            ],
-            'pause_play': [
-                r'\bpause\s+play\b', r'\bplay\s+pause\b',
-                r'\btoggle\s+(?:play|pause)\b'
-            ],
-            'next_track': [
-                r'\b(?:next|skip)\s+(?:track|song|music)\b',
-                r'\bskip\b(?!\s+(?:to|forward))',
-                r'\bnext\s+(?:song|track)\b'
-            ],
-            'previous_track': [
-                r'\b(?:previous|back)\s+(?:track|song|music)\b',
-                r'\bprevious\s+(?:song|track)\b',
-                r'\bback\s+(?:song|track)\b'
-            ],
-
-            # Screenshot
-            'screenshot': [
-                r'\btake\s+(?:a\s+)?screenshot\b',
-                r'\bscreenshot\b',
-                r'\bcapture\s+screen\b'
-            ],
-
-            # Text input and editing
-            'type_text': [r'\btype\s+(.+)', r'\bwrite\s+(.+)', r'\binput\s+(.+)'],
-            'copy': [r'\bcopy\b', r'\bctrl\s*c\b'],
-            'paste': [r'\bpaste\b', r'\bctrl\s*v\b'],
-            'select_all': [r'\bselect\s+all\b', r'\bctrl\s*a\b'],
-            'undo': [r'\bundo\b', r'\bctrl\s*z\b'],
-            'redo': [r'\bredo\b', r'\bctrl\s*y\b'],
-
-            # Application and navigation
-            'alt_tab': [r'\balt\s+tab\b', r'\bswitch\s+(?:app|application)\b'],
-            'refresh': [r'\brefresh\b', r'\breload\b', r'\bf5\b'],
-            'go_back': [r'\bgo\s+back\b', r'\bback\b', r'\bprevious\s+page\b'],
-            'go_forward': [r'\bgo\s+forward\b', r'\bforward\b', r'\bnext\s+page\b']
-        }
-
-        direction_patterns = {
-            'next': [r'\bnext\b', r'\bright\b'],
-            'previous': [r'\bprevious\b', r'\bprev\b', r'\bleft\b', r'\bback\b']
-        }
-
-        # Check for UI actions
-        for action, patterns in ui_action_patterns.items():
+    def _extract_ui_actions(self, text, text_lower, entities):
+        """UI control actions (UI_ACTION)"""
+        for action, patterns in UI_ACTION_PATTERNS.items():
             for pattern in patterns:
                 if re.search(pattern, text_lower):
                     if 'UI_ACTION' not in entities:
@@ -245,6 +280,13 @@ class NLPProcessor:
                     if action not in entities['UI_ACTION']:
                         entities['UI_ACTION'].append(action)
 
+    def _extract_directions(self, text, text_lower, entities):
+        """Tab switching directions (DIRECTION)"""
+        direction_patterns = {
+            'next': [r'\bnext\b', r'\bright\b'],
+            'previous': [r'\bprevious\b', r'\bprev\b', r'\bleft\b', r'\bback\b']
+        }
+
         # Check for directions (for tab switching)
         for direction, patterns in direction_patterns.items():
             for pattern in patterns:
@@ -254,7 +296,8 @@ class NLPProcessor:
                     if direction not in entities['DIRECTION']:
                         entities['DIRECTION'].append(direction)
 
-        # Extract text to type for type_text action
+    def _extract_text_to_type(self, text, text_lower, entities):
+        """Text to type for the type_text action (TEXT_TO_TYPE)"""
         type_patterns = [
             r'\btype\s+["\'](.+?)["\']',  # "type 'hello world'"
             r'\btype\s+(.+)',             # "type hello world"
@@ -279,23 +322,39 @@ class NLPProcessor:
                     if text_content and text_content not in entities['TEXT_TO_TYPE']:
                         entities['TEXT_TO_TYPE'].append(text_content)
 
-        # Clean up empty entity lists
-        entities = {k: v for k, v in entities.items() if v}
-
-        return entities
+    def analyze_sentiment(self, text, accurate=None):
+        # Fast lexicon scorer by default; TextBlob when asked for (and installed)
+        if accurate is None:
+            accurate = self.sentiment_mode == 'textblob'
+        if not accurate or TextBlob is None:
+            return self.lexicon_sentiment.classify(text)
 
-    def analyze_sentiment(self, text):
         blob = TextBlob(text)
         sentiment = blob.sentiment
 
-        if sentiment.polarity > 0.1:
+        if sentiment.polarity > SENTIMENT_THRESHOLD:
             return 'positive'
-        elif sentiment.polarity < -0.1:
+        elif sentiment.polarity < -SENTIMENT_THRESHOLD:
             return 'negative'
         else:
             return 'neutral'
 
+    def load_intent_model(self, history=None, persist=True):
+        """Use the local NumPy intent classifier, training it first if needed"""
+        try:
+            self.intent_model = load_or_train(history, persist=persist)
+        except Exception as e:
+            print(f"Intent model unavailable, using keyword scoring: {e}")
+            self.intent_model = None
+
     def classify_intent(self, text):
+        if self.intent_model is not None:
+            intent, confidence = self.intent_model.predict(text)
+            if confidence >= INTENT_MODEL_THRESHOLD:
+                return intent
+        return self.classify_intent_keywords(text)
+
+    def classify_intent_keywords(self, text):
         text_lower = text.lower()
         tokens = self.preprocess_text(text)
 
@@ -321,7 +380,7 @@ class NLPProcessor:
         return 'unknown'
 
     def extract_parameters(self, text, intent):
-        entities = self.extract_entities(text)
+        entities = self.extract_entities(text, intent)
         params = {}
 
         if intent == 'search':
@@ -343,6 +402,13 @@ class NLPProcessor:
             text_lower = text.lower().replace('open', '').strip()
             params['target'] = text_lower
 
+        elif intent == 'weather' and entities.get('PLACE'):
+            # Known city: the gazetteer also gives its coordinates, so no geocoding call
+            place = entities['PLACE'][0]
+            params['city'] = place.name
+            params['location'] = place.name
+            params['coords'] = (place.lat, place.lon)
+
         elif intent == 'weather':
             # Extract city name from weather requests
             text_lower = text.lower()
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from components.config import (PHRASE_CACHE_DIR, PHRASE_CACHE_MAX_BYTES, PHRASE_CACHE_MAX_CHARS,
+                               PHRASE_CACHE_PHRASES, PHRASE_CACHE_TEMPLATES)
+
+
+class PhraseCache:
+    """Disk cache of synthesized speech for phrases the assistant says often.
+
+    Files are named by a hash of (voice, rate, volume, text), so changing the
+    voice settings never plays stale audio. The total size is capped; the least
+    recently played files are deleted first, and file modification times carry
+    that order across restarts.
+    """
+
+    def __init__(self, directory=PHRASE_CACHE_DIR, max_bytes=PHRASE_CACHE_MAX_BYTES,
+                 phrases=PHRASE_CACHE_PHRASES, templates=PHRASE_CACHE_TEMPLATES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.phrases = set()
+        self.templates = []
+        self.entries = OrderedDict()  # file name -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.register(phrases)
+        self.register_templates(templates)
+        self._load()
+
+    def _load(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.directory.glob('*.wav'), key=lambda p: p.stat().st_mtime)
+        except OSError as e:
+            print(f"Phrase cache unavailable: {e}")
+            return
+        for path in files:
+            size = path.stat().st_size
+            self.entries[path.name] = size
+            self.total_bytes += size
+        self._evict()
+
+    def register(self, texts):
+        """Cache these exact phrases"""
+        self.phrases.update(texts)
+
+    def register_templates(self, templates):
+        """Cache phrases matching these templates, where "{}" stands for any text"""
+        for template in templates:
+            pattern = re.escape(template).replace(re.escape('{}'), '.+')
+            self.templates.append(re.compile(pattern, re.DOTALL))
+
+    def wants(self, text):
+        if text in self.phrases:
+            return True
+        return len(text) <= PHRASE_CACHE_MAX_CHARS and any(t.fullmatch(text) for t in self.templates)
+
+    @staticmethod
+    def file_name(text, voice, rate, volume):
+        key = f"{voice}\0{rate}\0{volume}\0{text}".encode('utf-8')
+        return hashlib.sha1(key).hexdigest() + '.wav'
+
+    def get(self, text, voice, rate, volume):
+        """Path of the cached audio, or None"""
+        name = self.file_name(text, voice, rate, volume)
+        path = self.directory / name
+        with self.lock:
+            if name not in self.entries:
+                self.misses += 1
+                return None
+            if not path.exists():  # Deleted behind our back
+                self.total_bytes -= self.entries.pop(name)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(name)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, text, voice, rate, volume, render):
+        """Synthesize with render(text, path) into the cache; returns the path or None"""
+        name = self.file_name(text, voice, rate, volume)
+        path = self.directory / name
+        temp_path = path.with_name(name + '.tmp')
+        try:
+            render(text, temp_path)
+            size = temp_path.stat().st_size
+            if size <= 44:  # Header only: the engine produced no audio
+                temp_path.unlink()
+                return None
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Could not cache phrase audio: {e}")
+            return None
+
+        with self.lock:
+            self.total_bytes += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+            self._evict()
+        return path
+
+    def _evict(self):
+        # The newest file always stays, even if it alone exceeds the cap
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            name, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass
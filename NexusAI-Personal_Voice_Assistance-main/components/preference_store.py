@@ -0,0 +1,233 @@
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from components.config import (PREFERENCES_FILE, PREFERENCES_JOURNAL_FILE, PREFERENCE_CAPACITY,
+                               PREFERENCE_TOP_K, PREFERENCE_HALF_LIFE_DAYS, PREFERENCE_COMPACT_EVERY)
+
+
+class PreferenceStore:
+    """Bounded, time-decayed token counters with a maintained top-K.
+
+    Counting uses the space-saving algorithm: at most `capacity` tokens are
+    tracked and a new token replaces the current minimum, inheriting its count.
+    Decay uses forward decay: an increment at time t is stored with weight
+    exp((t - t0) / tau), so all stored counts decay together and their order never
+    changes; reading divides by the current weight. Increments are appended to a
+    small journal and folded into a JSON snapshot every `compact_every` tokens.
+    """
+
+    def __init__(self, snapshot_path=PREFERENCES_FILE, journal_path=PREFERENCES_JOURNAL_FILE,
+                 capacity=PREFERENCE_CAPACITY, top_k=PREFERENCE_TOP_K,
+                 half_life_days=PREFERENCE_HALF_LIFE_DAYS, compact_every=PREFERENCE_COMPACT_EVERY,
+                 persist=True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.capacity = capacity
+        self.top_k = top_k
+        self.compact_every = compact_every
+        self.persist = persist
+        # Seconds for a count to shrink by a factor of e; None disables decay
+        self._tau = half_life_days * 86400 / math.log(2) if half_life_days else None
+
+        self._lock = threading.RLock()
+        self._reset(time.time())
+        self._journal = None
+        self._journal_entries = 0
+
+        if self.persist:
+            self._load()
+
+    def _reset(self, now):
+        self._counts = {}  # token -> stored (scaled) count
+        self._errors = {}  # token -> count inherited on eviction (overestimate bound)
+        self._heap = []    # lazy min-heap of (stored count, token)
+        self._top = []     # tokens with the highest counts, best first
+        self._ref_time = now
+
+    # ---- Decay -------------------------------------------------------------
+
+    def _weight(self, now):
+        if self._tau is None:
+            return 1.0
+        exponent = (now - self._ref_time) / self._tau
+        if exponent > 50:
+            # Keep stored values in floating point range
+            self._rescale(now)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rescale(self, now):
+        factor = math.exp((now - self._ref_time) / self._tau)
+        self._counts = {token: count / factor for token, count in self._counts.items()}
+        self._errors = {token: error / factor for token, error in self._errors.items()}
+        self._ref_time = now
+        self._rebuild_heap()
+
+    # ---- Counting ----------------------------------------------------------
+
+    def _rebuild_heap(self):
+        self._heap = [(count, token) for token, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while self._heap:
+            count, token = heapq.heappop(self._heap)
+            # Skip stale entries left behind by later increments
+            if self._counts.get(token) == count:
+                return token, count
+        return None, 0.0
+
+    def _add(self, token, weight):
+        if token in self._counts:
+            self._counts[token] += weight
+        elif len(self._counts) < self.capacity:
+            self._counts[token] = weight
+        else:
+            evicted, minimum = self._pop_min()
+            if evicted is not None:
+                del self._counts[evicted]
+                self._errors.pop(evicted, None)
+                if evicted in self._top:
+                    self._top.remove(evicted)
+            self._counts[token] = minimum + weight
+            self._errors[token] = minimum
+
+        heapq.heappush(self._heap, (self._counts[token], token))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+        self._update_top(token)
+
+    def _update_top(self, token):
+        counts = self._counts
+        if token not in self._top:
+            if len(self._top) < self.top_k:
+                self._top.append(token)
+            elif counts[token] > counts[self._top[-1]]:
+                self._top[-1] = token
+            else:
+                return
+        self._top.sort(key=counts.__getitem__, reverse=True)
+
+        # An eviction can leave the top list short while other tokens exist
+        if len(self._top) < min(self.top_k, len(counts)):
+            self._top = heapq.nlargest(self.top_k, counts, key=counts.__getitem__)
+
+    def increment(self, tokens, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            weight = self._weight(now)
+            for token in tokens:
+                self._add(token, weight)
+            if self.persist and tokens:
+                self._append_journal(tokens, now)
+
+    # ---- Queries -----------------------------------------------------------
+
+    def top(self, k=None):
+        """Return [(token, decayed count)] for the k most frequent tokens, in O(k)"""
+        with self._lock:
+            weight = self._weight(time.time())
+            return [(token, self._counts[token] / weight) for token in self._top[:k or self.top_k]]
+
+    def get(self, token, default=0.0):
+        with self._lock:
+            if token not in self._counts:
+                return default
+            return self._counts[token] / self._weight(time.time())
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, token):
+        return token in self._counts
+
+    # ---- Persistence -------------------------------------------------------
+
+    def _append_journal(self, tokens, now):
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.write(''.join(f"{now:.3f}\t{token}\n" for token in tokens))
+            self._journal.flush()
+            self._journal_entries += len(tokens)
+            if self._journal_entries >= self.compact_every:
+                self.compact()
+        except Exception as e:
+            print(f"Could not save user preferences: {e}")
+
+    def _load(self):
+        try:
+            if self.snapshot_path.exists():
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if 'counts' in data and 'reference_time' in data:
+                    self._ref_time = data['reference_time']
+                    for token, (count, error) in data['counts'].items():
+                        self._counts[token] = count
+                        if error:
+                            self._errors[token] = error
+                else:
+                    # Legacy format: a plain {token: count} dict
+                    for token, count in sorted(data.items(), key=lambda item: item[1], reverse=True):
+                        if len(self._counts) >= self.capacity:
+                            break
+                        self._counts[token] = float(count)
+                self._rebuild_heap()
+                self._top = heapq.nlargest(self.top_k, self._counts, key=self._counts.__getitem__)
+
+            # Replay increments made since the last snapshot
+            replayed = 0
+            if self.journal_path.exists():
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        timestamp, _, token = line.rstrip('\n').partition('\t')
+                        if not token:
+                            continue  # Partially written line
+                        self._add(token, self._weight(float(timestamp)))
+                        replayed += 1
+            self._journal_entries = replayed
+
+            print(f"Loaded {len(self._counts)} user preferences")
+        except Exception as e:
+            print(f"Could not load user preferences: {e}")
+
+    def compact(self):
+        """Write a full snapshot atomically and truncate the journal"""
+        if not self.persist:
+            return
+        with self._lock:
+            try:
+                data = {
+                    'reference_time': self._ref_time,
+                    'counts': {token: [count, self._errors.get(token, 0.0)]
+                               for token, count in self._counts.items()}
+                }
+                tmp_path = self.snapshot_path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                open(self.journal_path, 'w').close()
+                self._journal_entries = 0
+            except Exception as e:
+                print(f"Could not save user preferences: {e}")
+
+    def clear(self):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self.persist:
+                for path in (self.snapshot_path, self.journal_path):
+                    if path.exists():
+                        path.unlink()
+            self._reset(time.time())
+            self._journal_entries = 0
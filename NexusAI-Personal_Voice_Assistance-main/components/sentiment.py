@@ -0,0 +1,86 @@
+import re
+from functools import lru_cache
+from components.config import (SENTIMENT_LEXICON, SENTIMENT_NEGATIONS, SENTIMENT_INTENSIFIERS,
+                               SENTIMENT_THRESHOLD, EMOTION_PATTERNS, LEMMA_CACHE_SIZE)
+
+
+class LexiconSentiment:
+    """Lexicon-based sentiment scorer for short spoken commands.
+
+    Each word is looked up in a precompiled polarity table (after light suffix
+    stripping), scaled by a preceding intensifier and flipped/damped by a recent
+    negation. The polarity is the mean over sentiment-bearing words, bucketed
+    with the same thresholds the TextBlob mode uses.
+    """
+
+    _token_re = re.compile(r"[a-z']+|[.!?,;]")
+    _suffixes = ('ing', 'ed', 'es', 's', 'ly')
+    _negation_window = 3
+
+    def __init__(self):
+        self.lexicon = dict(SENTIMENT_LEXICON)
+        # Emotion words from config count as strong cues
+        for word in EMOTION_PATTERNS.get('positive', []):
+            self.lexicon.setdefault(word, 0.7)
+        for word in EMOTION_PATTERNS.get('negative', []):
+            self.lexicon.setdefault(word, -0.7)
+        for word in EMOTION_PATTERNS.get('neutral', []):
+            self.lexicon.setdefault(word, 0.0)
+
+        self.negations = frozenset(SENTIMENT_NEGATIONS)
+        self.intensifiers = dict(SENTIMENT_INTENSIFIERS)
+        # Bounded, since dictated text can bring an endless stream of new words
+        self._lookup = lru_cache(maxsize=LEMMA_CACHE_SIZE)(self._lookup_uncached)
+
+    def _lookup_uncached(self, word):
+        """Polarity of a word (or its stripped stem), None if not sentiment-bearing"""
+        score = self.lexicon.get(word)
+        if score is None:
+            for suffix in self._suffixes:
+                if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                    score = self.lexicon.get(word[:-len(suffix)])
+                    if score is not None:
+                        break
+        return score
+
+    def polarity(self, text):
+        scores = []
+        multiplier = 1.0
+        negated_for = 0
+
+        for token in self._token_re.findall(text.lower()):
+            if token in '.!?,;':
+                # Punctuation ends the scope of negation and intensifiers
+                negated_for = 0
+                multiplier = 1.0
+                continue
+            if token in self.negations or token.endswith("n't"):
+                negated_for = self._negation_window
+                continue
+            if token in self.intensifiers:
+                multiplier *= self.intensifiers[token]
+                continue
+
+            score = self._lookup(token)
+            if score is not None:
+                score *= multiplier
+                if negated_for:
+                    score *= -0.5
+                scores.append(score)
+                multiplier = 1.0
+
+            if negated_for:
+                negated_for -= 1
+
+        if not scores:
+            return 0.0
+        return max(-1.0, min(1.0, sum(scores) / len(scores)))
+
+    def classify(self, text):
+        polarity = self.polarity(text)
+        if polarity > SENTIMENT_THRESHOLD:
+            return 'positive'
+        elif polarity < -SENTIMENT_THRESHOLD:
+            return 'negative'
+        else:
+            return 'neutral'
@@ -0,0 +1,107 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from components.config import SESSION_FOLLOW_UP_TIMEOUT, SESSION_SLEEP_PHRASES
+
+IDLE = 'idle'            # waiting for the wake word; everything else is dropped
+AWAKE = 'awake'          # wake word heard, command being handled
+SPEAKING = 'speaking'    # assistant is talking; input is most likely its own voice
+FOLLOW_UP = 'follow_up'  # reply finished; commands accepted without the wake word until timeout
+
+_WORD_RE = re.compile(r"[a-z']+")
+_FILLER_WORDS = {'please', 'now', 'ok', 'okay', 'thanks', 'thank', 'you'}
+
+
+class ConversationSession:
+    """Decides which recognized utterances go through the command pipeline.
+
+    idle --wake word--> awake --reply--> speaking --done--> follow-up
+    follow-up --command--> awake, follow-up --timeout or sleep--> idle
+    """
+
+    def __init__(self, wake_word, follow_up_timeout=SESSION_FOLLOW_UP_TIMEOUT,
+                 sleep_phrases=SESSION_SLEEP_PHRASES, clock=time.monotonic):
+        self.wake_words = set(_WORD_RE.findall(wake_word.lower()))
+        self.wake_phrase = f" {' '.join(_WORD_RE.findall(wake_word.lower()))} "
+        self.follow_up_timeout = follow_up_timeout
+        self.sleep_phrases = set(sleep_phrases)
+        self.clock = clock
+        self._state = IDLE
+        self._follow_up_until = 0.0
+        self._listen_started = None
+        self.lock = threading.Lock()
+
+        self.processed = 0  # utterances handed to the pipeline
+        self.dropped = 0    # utterances ignored outside a session
+
+    @property
+    def state(self):
+        with self.lock:
+            return self._current()
+
+    @property
+    def active(self):
+        return self.state != IDLE
+
+    def _current(self, at=None):
+        """State at time `at` (default now), with the follow-up window expired if it has closed"""
+        at = self.clock() if at is None else at
+        if self._state == FOLLOW_UP and at >= self._follow_up_until:
+            return IDLE
+        return self._state
+
+    def listening_started(self):
+        """Call before listening; the next accept() judges the follow-up window from here"""
+        with self.lock:
+            self._listen_started = self.clock()
+
+    def _words(self, text):
+        return _WORD_RE.findall(text.lower())
+
+    def heard_wake_word(self, text):
+        return self.wake_phrase in f" {' '.join(self._words(text))} "
+
+    def accept(self, text):
+        """True if `text` should be processed; counts it as processed or dropped.
+
+        A follow-up that began inside the window counts even if recognition
+        finished after it closed.
+        """
+        with self.lock:
+            self._state = self._current(self._listen_started)
+            self._listen_started = None
+            if self._state != SPEAKING and (self._state != IDLE or self.heard_wake_word(text)):
+                self._state = AWAKE
+                self.processed += 1
+                return True
+            self.dropped += 1
+            return False
+
+    def is_sleep_command(self, text):
+        """'go to sleep', 'nexus, that's all', ... (the whole utterance, ignoring fillers)"""
+        words = [w for w in self._words(text) if w not in self.wake_words and w not in _FILLER_WORDS]
+        return ' '.join(words) in self.sleep_phrases
+
+    def sleep(self):
+        """End the session; only the wake word is listened for from now on"""
+        with self.lock:
+            self._state = IDLE
+
+    @contextmanager
+    def speaking(self):
+        """Wrap speech output; a session reply opens the follow-up window when it ends"""
+        with self.lock:
+            in_session = self._current() != IDLE
+            if in_session:
+                self._state = SPEAKING
+        try:
+            yield
+        finally:
+            with self.lock:
+                if in_session and self._state == SPEAKING:
+                    self._state = FOLLOW_UP
+                    self._follow_up_until = self.clock() + self.follow_up_timeout
+
+    def stats(self):
+        return {'state': self.state, 'processed': self.processed, 'dropped': self.dropped}
@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+import weakref
+from datetime import datetime
+from components.config import (VOICE_EVENT_QUEUE_SIZE, ERROR_MESSAGE, SHUTDOWN_MESSAGE,
+                               SESSION_SLEEP_MESSAGE)
+from components.session import ConversationSession
+
+
+class VoiceWorker:
+    """Runs the listen -> process -> speak loop on a background thread.
+
+    Every step is published as an event dict to the queues of all subscribers, so
+    front ends can render transcripts, responses and timings without ever blocking
+    on the microphone. Event types: 'status', 'transcript', 'response',
+    'speaking', 'error' and 'shutdown'.
+    """
+
+    def __init__(self, engine, wake_word, welcome_message=None):
+        self.engine = engine
+        self.audio_handler = engine.audio_handler
+        self.wake_word = wake_word.lower()
+        self.welcome_message = welcome_message
+
+        self.session = ConversationSession(self.wake_word)
+        self.is_speaking = False
+        self.running = False
+
+        # Held weakly: a queue disappears with the browser session that owns it
+        self._subscribers = weakref.WeakSet()
+        self._subscribers_lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """Return a new queue that receives every event posted from now on.
+
+        Only a weak reference is kept, so the caller must hold on to the queue
+        (e.g. in st.session_state); once it is dropped, events stop going to it.
+        """
+        events = queue.Queue(maxsize=VOICE_EVENT_QUEUE_SIZE)
+        with self._subscribers_lock:
+            self._subscribers.add(events)
+        return events
+
+    def unsubscribe(self, events):
+        with self._subscribers_lock:
+            self._subscribers.discard(events)
+
+    def _post(self, event_type, **data):
+        event = {'type': event_type, 'timestamp': datetime.now(), **data}
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # Slow or abandoned subscriber: drop its oldest event
+                try:
+                    events.get_nowait()
+                    events.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._run, name="voice-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def speak(self, text):
+        self.is_speaking = True
+        self._post('speaking', active=True, text=text)
+        started = time.perf_counter()
+        try:
+            with self.session.speaking():
+                self.audio_handler.speak(text)
+        except Exception as e:
+            print(f"Error with text-to-speech: {e}")
+        finally:
+            self.is_speaking = False
+            self._post('speaking', active=False,
+                       duration_ms=(time.perf_counter() - started) * 1000)
+
+    def _run(self):
+        if self.welcome_message:
+            self.speak(self.welcome_message)
+
+        while self.running:
+            try:
+                self._post('status', listening=self.session.active, **self.session.stats())
+                started = time.perf_counter()
+                self.session.listening_started()
+                audio_input = self.audio_handler.listen()
+                if not audio_input:
+                    continue
+
+                listen_ms = (time.perf_counter() - started) * 1000
+
+                # Outside a session only the wake word gets through
+                if not self.session.accept(audio_input):
+                    continue
+                self._post('transcript', text=audio_input, listen_ms=listen_ms)
+
+                if self.session.is_sleep_command(audio_input):
+                    self.session.sleep()
+                    self.speak(SESSION_SLEEP_MESSAGE)
+                    continue
+
+                started = time.perf_counter()
+                response, should_exit = self.engine.process_command(audio_input)
+                self._post('response', text=response,
+                           process_ms=(time.perf_counter() - started) * 1000)
+                self.speak(response)
+
+                if should_exit:
+                    self.shutdown()
+                    break
+
+            except Exception as e:
+                print(f"Error in Listening: {e}")
+                self._post('error', text=str(e))
+                self.speak(ERROR_MESSAGE)
+
+    def shutdown(self):
+        self.running = False
+
+        # Save all data before shutdown
+        try:
+            self.engine.save_all_data()
+            print("Data saved to DB.")
+        except Exception as e:
+            print(f"Error saving data: {e}")
+
+        self.speak(SHUTDOWN_MESSAGE)
+        self._post('shutdown')
+        print("NexusAI shutdown complete.")
@@ -1,115 +1,227 @@
 import subprocess
+import json
 import os
 import shutil
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from components.config import (APP_LAUNCH_STATS_FILE, APP_LAUNCH_HEAD_START, APP_LAUNCH_TIMEOUT,
+                               APP_LAUNCH_FUZZY_GRACE)
+from features.app_index import AppIndex, normalize_app_name
+
+
+class StrategyStats:
+    """Attempts, hits and smoothed latency of each resolution strategy, kept between runs"""
+
+    def __init__(self, path=APP_LAUNCH_STATS_FILE, persist=True):
+        self.path = path
+        self.persist = persist
+        self.stats = {}  # strategy -> {'attempts', 'hits', 'latency_ms'}
+        self._lock = threading.Lock()
+        if self.persist:
+            self.load()
+
+    def record(self, name, hit, latency_ms):
+        with self._lock:
+            entry = self.stats.setdefault(name, {'attempts': 0, 'hits': 0, 'latency_ms': latency_ms})
+            entry['attempts'] += 1
+            entry['hits'] += int(hit)
+            entry['latency_ms'] += 0.2 * (latency_ms - entry['latency_ms'])
+
+    def order(self, names):
+        """Strategies that usually succeed first, faster ones breaking ties"""
+        def score(name):
+            entry = self.stats.get(name, {'attempts': 0, 'hits': 0, 'latency_ms': 0.0})
+            # Smoothed rate, so untried strategies start at 0.5 rather than 0 or 1
+            hit_rate = (entry['hits'] + 1) / (entry['attempts'] + 2)
+            return (-round(hit_rate, 1), entry['latency_ms'])
+        with self._lock:
+            return sorted(names, key=score)
+
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.stats = json.load(f)
+        except Exception as e:
+            print(f"Could not load app launch stats: {e}")
+
+    def save(self):
+        if not self.persist:
+            return
+        try:
+            with self._lock:
+                data = json.dumps(self.stats)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save app launch stats: {e}")
+
 
 class WindowsAppLauncher:
-    def __init__(self):
-        pass
+    def __init__(self, index=None, stats=None, head_start=APP_LAUNCH_HEAD_START,
+                 timeout=APP_LAUNCH_TIMEOUT, fuzzy_grace=APP_LAUNCH_FUZZY_GRACE):
+        # Installed apps are indexed in the background; lookups never scan the disk
+        self.index = index if index is not None else AppIndex()
+        self.backend = self.index.backend
+        self.index.start()
+
+        self.stats = stats if stats is not None else StrategyStats()
+        self.head_start = head_start
+        self.timeout = timeout
+        self.fuzzy_grace = fuzzy_grace
+        # Resolvers only look things up; the winning command is spawned exactly once
+        self.resolvers = {
+            'index': self._resolve_index,
+            'index_fuzzy': self._resolve_index_fuzzy,
+            'path_search': self._resolve_path_search,
+            'common_paths': self._resolve_windows_common_paths,
+        }
+        # Close-but-not-equal name matches only win if no exact strategy hits
+        self.fuzzy_strategies = {'index_fuzzy'}
+        self.executor = ThreadPoolExecutor(max_workers=len(self.resolvers),
+                                           thread_name_prefix="app-resolve")
 
     def open_app(self, app_name):
         success = False
-        
-        methods = [
-            self._try_path_search,
-            self._try_windows_common_paths,
-            self._try_windows_methods,
-        ]
 
-        if ' ' or '-' or '_' in app_name:
-            app_name = app_name.replace(' ', '').replace('-', '').replace('_', '')
-
-        for method in methods:
-            try:
-                if method(app_name):
-                    print(f"Opening {app_name}...")
-                    time.sleep(0.1)
-                    success = True
-                    break  # Exit loop on first success
-                else: continue
-            except Exception:
-                continue  # Continue to next method on failure
+        strategy, command = self.resolve(app_name)
+        if command is not None:
+            success = self._launch(command)
+            if not success and strategy == 'index':
+                self.index.forget(app_name)
+
+        if not success:
+            # Nothing resolved: let the shell try App Paths and protocol handlers
+            success = self._try_windows_methods(normalize_app_name(app_name))
+
+        if success:
+            print(f"Opening {app_name}...")
+        self.stats.save()
         return success
 
-    def _try_path_search(self, app_name):
+    def resolve(self, app_name):
+        """Race the resolvers and return (strategy, command) of the first exact hit.
+
+        A fuzzy hit is only used once every exact strategy has missed, or
+        `fuzzy_grace` seconds after it arrived. Returns (None, None) if nothing
+        resolves.
+        """
+        order = self.stats.order(list(self.resolvers))
+        cancel = threading.Event()
+
+        # The usually-best strategy gets a short head start so the common case
+        # never wakes the other resolvers
+        futures = [self.executor.submit(self._timed, order[0], app_name, cancel)]
+        wait(futures, timeout=self.head_start)
+        winner = (None, None)
+        first = futures[0].result() if futures[0].done() else (None, None)
+        if first[1] is not None and first[0] not in self.fuzzy_strategies:
+            winner = first
+        else:
+            futures += [self.executor.submit(self._timed, name, app_name, cancel)
+                        for name in order[1:]]
+            fuzzy_hit = None
+            pending = set(futures)
+            deadline = time.monotonic() + self.timeout
+            while pending and winner[1] is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, command = future.result()
+                    if command is None:
+                        continue
+                    if name not in self.fuzzy_strategies:
+                        winner = (name, command)
+                        break
+                    if fuzzy_hit is None:
+                        fuzzy_hit = (name, command)
+                        deadline = min(deadline, time.monotonic() + self.fuzzy_grace)
+            if winner[1] is None and fuzzy_hit is not None:
+                winner = fuzzy_hit
+
+        # Stop the losers; resolvers have no side effects, so abandoning them is safe
+        cancel.set()
+        for future in futures:
+            future.cancel()
+        return winner
+
+    def _timed(self, name, app_name, cancel):
+        started = time.perf_counter()
         try:
-            executable = shutil.which(app_name)
-            if executable:
-                process = subprocess.Popen(
-                    [executable],
-                    shell=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-                time.sleep(0.1)
-                if process.poll() is None:
-                    return True
+            command = self.resolvers[name](app_name, cancel)
         except Exception:
-            pass
-        return False
+            command = None
+        # Runs cut short by a winner would skew the stats
+        if not cancel.is_set():
+            self.stats.record(name, command is not None, (time.perf_counter() - started) * 1000)
+        return name, command
+
+    @staticmethod
+    def _exists(command):
+        # Entries can go stale when an app is uninstalled between scans
+        return not os.path.isabs(command[0]) or os.path.exists(command[0])
+
+    def _launch(self, command):
+        try:
+            self.backend.launch(command)
+            return True
+        except Exception:
+            return False
+
+    def _resolve_index(self, app_name, cancel):
+        command = self.index.resolve(app_name, fuzzy=False)
+        return command if command is not None and self._exists(command) else None
+
+    def _resolve_index_fuzzy(self, app_name, cancel):
+        command = self.index.resolve(app_name)
+        return command if command is not None and self._exists(command) else None
+
+    def _resolve_path_search(self, app_name, cancel):
+        executable = shutil.which(normalize_app_name(app_name))
+        return [executable] if executable else None
+
+    def _resolve_windows_common_paths(self, app_name, cancel):
+        if sys.platform != 'win32':
+            return None
+        app_name = normalize_app_name(app_name)
+        username = os.getenv('USERNAME', 'User')
+        paths = [
+            f"C:\\Program Files\\{app_name}\\{app_name}.exe",
+            f"C:\\Program Files (x86)\\{app_name}\\{app_name}.exe",
+            f"C:\\Users\\{username}\\AppData\\Local\\{app_name}\\{app_name}.exe",
+            f"C:\\Users\\{username}\\AppData\\Local\\Programs\\{app_name}\\{app_name}.exe",
+            f"C:\\Users\\{username}\\AppData\\Roaming\\{app_name}\\{app_name}.exe",
+            f"C:\\Program Files\\{app_name}.exe",
+            f"C:\\Program Files (x86)\\{app_name}.exe"
+        ]
+
+        for path in paths:
+            if cancel.is_set():
+                return None
+            if os.path.exists(path):
+                return [path]
+        return None
 
     def _try_windows_methods(self, app_name):
-        methods = [
-            # Try Windows start command
-            lambda: subprocess.Popen(
+        if sys.platform != 'win32':
+            return False
+        try:
+            # Let the shell resolve App Paths registrations and protocol handlers
+            subprocess.Popen(
                 f'start "" "{app_name}"',
                 shell=True,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 creationflags=subprocess.CREATE_NO_WINDOW
-            ),
-            # Try with powershell
-            lambda: subprocess.Popen(
-                f'powershell -WindowStyle Hidden -Command "Start-Process \'{app_name}\'"',
-                shell=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                creationflags=subprocess.CREATE_NO_WINDOW
             )
-        ]
-
-        for method in methods:
-            try:
-                process = method()
-                if process is None:
-                    continue  # If the process didn't start, try the next method
-                time.sleep(0.1)
-                # For start command, we can't easily check if it worked, so assume success
-                return True
-            except Exception:
-                continue
-        return False
-
-    def _try_windows_common_paths(self, app_name):
-        try:
-            username = os.getenv('USERNAME', 'User')
-            paths = [
-                f"C:\\Program Files\\{app_name}\\{app_name}.exe",
-                f"C:\\Program Files (x86)\\{app_name}\\{app_name}.exe",
-                f"C:\\Users\\{username}\\AppData\\Local\\{app_name}\\{app_name}.exe",
-                f"C:\\Users\\{username}\\AppData\\Local\\Programs\\{app_name}\\{app_name}.exe",
-                f"C:\\Users\\{username}\\AppData\\Roaming\\{app_name}\\{app_name}.exe",
-                f"C:\\Program Files\\{app_name}.exe",
-                f"C:\\Program Files (x86)\\{app_name}.exe"
-            ]
-
-            for path in paths:
-                try:
-                    if os.path.exists(path):
-                        process = subprocess.Popen(
-                            [path],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                            creationflags=subprocess.CREATE_NO_WINDOW
-                        )
-                        time.sleep(0.1)
-                        # Check if process is still running
-                        if process.poll() is None:
-                            return True
-                except Exception:
-                    continue
+            # For start command, we can't easily check if it worked, so assume success
+            return True
         except Exception:
-            pass
-        return False
-
+            return False
@@ -0,0 +1,277 @@
+import difflib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from components.config import (APP_INDEX_FILE, APP_INDEX_REFRESH_INTERVAL, APP_INDEX_SCAN_DEPTH,
+                               APP_INDEX_MATCH_CUTOFF)
+
+
+def normalize_app_name(name):
+    """'Visual Studio Code.exe' -> 'visualstudiocode'"""
+    name = name.lower().strip()
+    for suffix in ('.exe', '.lnk', '.desktop', '.bat', '.cmd'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return ''.join(ch for ch in name if ch.isalnum())
+
+
+def _walk_files(root, extensions, max_depth):
+    """Yield files under `root` with one of `extensions`, at most `max_depth` folders deep"""
+    stack = [(root, 0)]
+    while stack:
+        folder, depth = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if depth < max_depth:
+                                stack.append((entry.path, depth + 1))
+                        elif entry.name.lower().endswith(extensions):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class WindowsAppBackend:
+    """Finds Start Menu shortcuts, PATH executables and installed .exe files"""
+
+    # Executables that are never what the user means by "open X"
+    _skip_words = ('unins', 'setup', 'install', 'update', 'crash', 'helper', 'elevate')
+
+    def __init__(self, max_depth=APP_INDEX_SCAN_DEPTH):
+        self.max_depth = max_depth
+
+    def _start_menu_dirs(self):
+        return [Path(base) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
+                for base in (os.getenv('PROGRAMDATA'), os.getenv('APPDATA')) if base]
+
+    def _install_dirs(self):
+        local = os.getenv('LOCALAPPDATA')
+        dirs = [os.getenv('PROGRAMFILES'), os.getenv('PROGRAMFILES(X86)'),
+                local and os.path.join(local, 'Programs'), local, os.getenv('APPDATA')]
+        return [d for d in dirs if d]
+
+    def scan(self):
+        """Return {normalized name: command}; earlier sources win on name clashes"""
+        apps = {}
+
+        def add(name, path):
+            key = normalize_app_name(name)
+            if key and key not in apps and not any(word in key for word in self._skip_words):
+                apps[key] = [path]
+
+        for folder in self._start_menu_dirs():
+            for entry in _walk_files(folder, ('.lnk',), self.max_depth):
+                add(entry.name, entry.path)
+
+        extensions = tuple(ext.lower() for ext in
+                           os.getenv('PATHEXT', '.EXE;.BAT;.CMD').split(';') if ext)
+        for folder in os.getenv('PATH', '').split(os.pathsep):
+            for entry in _walk_files(folder, extensions, 0):
+                add(entry.name, entry.path)
+
+        for folder in self._install_dirs():
+            for entry in _walk_files(folder, ('.exe',), self.max_depth):
+                add(entry.name, entry.path)
+        return apps
+
+    def launch(self, command):
+        target = command[0]
+        if target.lower().endswith('.lnk'):
+            os.startfile(target)
+        else:
+            subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             creationflags=subprocess.CREATE_NO_WINDOW)
+
+
+class PosixAppBackend:
+    """Finds desktop entries and PATH executables on Linux (and other POSIX systems)"""
+
+    def _desktop_dirs(self):
+        data_home = os.getenv('XDG_DATA_HOME', os.path.expanduser('~/.local/share'))
+        data_dirs = os.getenv('XDG_DATA_DIRS', '/usr/local/share:/usr/share').split(':')
+        return [Path(d) / 'applications' for d in [data_home, *data_dirs] if d]
+
+    @staticmethod
+    def _read_desktop_entry(path):
+        """(Name, Exec command) from the [Desktop Entry] section, or None"""
+        name = command = None
+        in_entry = False
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('['):
+                        in_entry = line == '[Desktop Entry]'
+                    elif in_entry and line.startswith('Name=') and name is None:
+                        name = line[5:]
+                    elif in_entry and line.startswith('Exec=') and command is None:
+                        command = line[5:]
+                    elif in_entry and line in ('NoDisplay=true', 'Hidden=true'):
+                        return None
+        except OSError:
+            return None
+        if not command:
+            return None
+        # Drop field codes such as %U or %f, which are filled in by file managers
+        try:
+            argv = [arg for arg in shlex.split(command) if not arg.startswith('%')]
+        except ValueError:  # Unbalanced quotes: skip this entry, not the whole scan
+            return None
+        return (name, argv) if argv else None
+
+    def scan(self):
+        apps = {}
+        for folder in self._desktop_dirs():
+            for entry in _walk_files(folder, ('.desktop',), 1):
+                parsed = self._read_desktop_entry(entry.path)
+                if parsed is None:
+                    continue
+                name, argv = parsed
+                for key in (normalize_app_name(entry.name), normalize_app_name(name or '')):
+                    if key:
+                        apps.setdefault(key, argv)
+
+        for folder in os.getenv('PATH', '').split(os.pathsep):
+            for entry in _walk_files(folder, ('',), 0):
+                if os.access(entry.path, os.X_OK):
+                    key = normalize_app_name(entry.name)
+                    if key:
+                        apps.setdefault(key, [entry.path])
+        return apps
+
+    def launch(self, command):
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                         start_new_session=True)
+
+
+def default_backend():
+    return WindowsAppBackend() if sys.platform == 'win32' else PosixAppBackend()
+
+
+class AppIndex:
+    """Maps normalized application names to launch commands.
+
+    The index is loaded from disk on startup and rebuilt by a background thread
+    when it is older than `refresh_interval`, so resolving a name is a dict
+    lookup (with a fuzzy fallback) instead of probing the filesystem.
+    """
+
+    def __init__(self, backend=None, path=APP_INDEX_FILE, refresh_interval=APP_INDEX_REFRESH_INTERVAL,
+                 cutoff=APP_INDEX_MATCH_CUTOFF, persist=True):
+        self.backend = backend or default_backend()
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.cutoff = cutoff
+        self.persist = persist
+        self.platform = sys.platform
+
+        self.apps = {}
+        self.built_at = 0.0
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        if self.persist:
+            self.load()
+
+    # ---- Lookup ------------------------------------------------------------
+
+    def resolve(self, name, fuzzy=True):
+        """Launch command for `name`, or None if nothing close enough (or, without `fuzzy`, identical) is indexed"""
+        key = normalize_app_name(name)
+        if not key:
+            return None
+        apps = self.apps  # Rebuilds swap in a new dict, so this reference stays consistent
+        command = apps.get(key)
+        if command is None and fuzzy:
+            match = difflib.get_close_matches(key, apps.keys(), n=1, cutoff=self.cutoff)
+            if match:
+                command = apps[match[0]]
+        return command
+
+    def forget(self, name):
+        """Drop an entry whose executable has disappeared"""
+        with self._lock:
+            apps = dict(self.apps)
+            apps.pop(normalize_app_name(name), None)
+            self.apps = apps
+
+    def __len__(self):
+        return len(self.apps)
+
+    # ---- Building ----------------------------------------------------------
+
+    def refresh(self):
+        started = time.perf_counter()
+        try:
+            apps = self.backend.scan()
+        except Exception as e:
+            print(f"Could not scan installed applications: {e}")
+            return
+        with self._lock:
+            self.apps = apps
+            self.built_at = time.time()
+        self.ready.set()
+        print(f"Indexed {len(apps)} applications in {time.perf_counter() - started:.2f}s")
+        self.save()
+
+    def is_stale(self):
+        return not self.apps or time.time() - self.built_at > self.refresh_interval
+
+    def start(self):
+        """Rebuild in the background now if stale, then again every refresh interval"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            if self.is_stale():
+                self.refresh()
+            wait = max(1.0, self.built_at + self.refresh_interval - time.time())
+            self._stop.wait(wait)
+
+    # ---- Persistence -------------------------------------------------------
+
+    def load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # An index built on another OS would only hold unusable paths
+                if data.get('platform') == self.platform:
+                    self.apps = {key: list(command) for key, command in data['apps'].items()}
+                    self.built_at = float(data.get('built_at', 0.0))
+                    if self.apps:
+                        self.ready.set()
+        except Exception as e:
+            print(f"Could not load application index: {e}")
+
+    def save(self):
+        if not self.persist:
+            return
+        try:
+            with self._lock:
+                data = {'version': 1, 'platform': self.platform,
+                        'built_at': self.built_at, 'apps': self.apps}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save application index: {e}")
@@ -0,0 +1,206 @@
+import re
+from datetime import datetime, timedelta
+from features.time_parser import (NUMBER_WORDS, WEEKDAYS, UNIT_SECONDS, REMINDER_PREFIX_RE, LEADING_TIME_RE,
+                                  parse_time_rules)
+
+# Cron weekday numbers: 0 (or 7) is Sunday
+CRON_WEEKDAY_NAMES = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+CRON_FIELDS = [('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7)]
+CRON_SEARCH_DAYS = 4 * 366  # far enough for any valid rule (e.g. "29 February")
+
+_DAY_NAME = '(?:' + '|'.join(WEEKDAYS) + ')'
+_NUMBER = r'\d+|' + '|'.join(sorted(map(re.escape, NUMBER_WORDS), key=len, reverse=True))
+
+# Spoken recurrence phrases -> (kind, value); checked in order, first match outside the task wins
+RECURRENCE_PATTERNS = [
+    (re.compile(r'\bcron\s+((?:\S+\s+){4}\S+)', re.IGNORECASE), 'cron'),
+    (re.compile(r'\b(?:every\s+day|each\s+day|daily)\b', re.IGNORECASE), 'daily'),
+    (re.compile(rf'\bevery\s+(?:({_NUMBER})\s+)?(seconds?|secs?|minutes?|mins?|hours?|hrs?|days?)\b', re.IGNORECASE), 'interval'),
+    (re.compile(r'\bhourly\b', re.IGNORECASE), 'hourly'),
+    (re.compile(r'\b(?:(?:every|each)\s+weekdays?|on\s+weekdays)\b', re.IGNORECASE), 'weekdays'),
+    (re.compile(r'\b(?:(?:every|each)\s+weekends?|on\s+weekends)\b', re.IGNORECASE), 'weekends'),
+    (re.compile(rf'\bevery\s+({_DAY_NAME}(?:\s*(?:,|and)\s*{_DAY_NAME})*)\b', re.IGNORECASE), 'days'),
+    (re.compile(rf'\bon\s+({_DAY_NAME}s(?:\s*(?:,|and)\s*{_DAY_NAME}s)*)\b', re.IGNORECASE), 'days'),
+    # "every morning" keeps "morning" for the time parser
+    (re.compile(r'\bevery\b(?=\s+(?:morning|afternoon|evening|night)\b)', re.IGNORECASE), 'daily'),
+    (re.compile(r'\b(?:every\s+week|each\s+week|weekly)\b', re.IGNORECASE), 'weekly'),
+]
+
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        value_range, _, step = part.partition('/')
+        if value_range == '*':
+            start, end = low, high
+        elif '-' in value_range:
+            start, end = (int(v) for v in value_range.split('-', 1))
+        else:
+            start = end = int(value_range)
+            if step:
+                end = high
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron value out of range: {part}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronRule:
+    """Five-field cron schedule: minute hour day-of-month month weekday"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron needs 5 fields, got '{expression}'")
+        self.expression = ' '.join(fields)
+        (self.minutes, self.hours, self.days, self.months,
+         weekdays) = (_parse_cron_field(f, low, high) for f, (_, low, high) in zip(fields, CRON_FIELDS))
+        self.weekdays = {day % 7 for day in weekdays}
+        # Like cron: if both day fields are restricted, either one matching is enough
+        self.any_day = fields[2] != '*' and fields[4] != '*'
+
+    @property
+    def spec(self):
+        return f"cron {self.expression}"
+
+    def _day_matches(self, date):
+        if date.month not in self.months:
+            return False
+        day_ok = date.day in self.days
+        weekday_ok = (date.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """First scheduled time strictly after `moment`"""
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        times = sorted((h, m) for h in self.hours for m in self.minutes)
+        for offset in range(CRON_SEARCH_DAYS):
+            date = start.date() + timedelta(days=offset)
+            if not self._day_matches(date):
+                continue
+            for hour, minute in times:
+                candidate = datetime(date.year, date.month, date.day, hour, minute)
+                if candidate >= start:
+                    return candidate
+        return None
+
+    def describe(self):
+        fields = self.expression.split()
+        if len(self.hours) == 1 and len(self.minutes) == 1 and fields[2] == fields[3] == '*':
+            at = datetime(2000, 1, 1, next(iter(self.hours)), next(iter(self.minutes))).strftime('%I:%M %p')
+            if fields[4] == '*':
+                return f"every day at {at}"
+            if self.weekdays == {1, 2, 3, 4, 5}:
+                return f"every weekday at {at}"
+            if self.weekdays == {0, 6}:
+                return f"every weekend day at {at}"
+            names = [CRON_WEEKDAY_NAMES[d] for d in sorted(self.weekdays, key=lambda d: (d + 6) % 7)]
+            return f"every {' and '.join(names)} at {at}"
+        return f"on schedule '{self.expression}'"
+
+
+class IntervalRule:
+    """Fires every `seconds`, counted from the previous fire time"""
+
+    def __init__(self, seconds):
+        self.seconds = int(seconds)
+        if self.seconds < 60:
+            raise ValueError("intervals shorter than a minute are not supported")
+
+    @property
+    def spec(self):
+        return f"every {self.seconds}"
+
+    def next_after(self, moment):
+        return moment + timedelta(seconds=self.seconds)
+
+    def describe(self):
+        days, rest = divmod(self.seconds, 86400)
+        if rest == 0:
+            return "every day" if days == 1 else f"every {days} days"
+        hours, rest = divmod(self.seconds, 3600)
+        if rest == 0:
+            return "every hour" if hours == 1 else f"every {hours} hours"
+        minutes = self.seconds // 60
+        return "every minute" if minutes == 1 else f"every {minutes} minutes"
+
+
+def rule_from_spec(spec):
+    """Rebuild a rule from the string stored in the reminders table"""
+    kind, _, value = spec.partition(' ')
+    if kind == 'cron':
+        return CronRule(value)
+    if kind == 'every':
+        return IntervalRule(int(value))
+    raise ValueError(f"unknown recurrence '{spec}'")
+
+
+def next_occurrence(rule, last, now=None):
+    """Next fire time after `last` that is also in the future (missed occurrences are skipped)"""
+    now = now or datetime.now()
+    if isinstance(rule, IntervalRule):
+        missed = max(0, int((now - last).total_seconds() // rule.seconds))
+        last += timedelta(seconds=missed * rule.seconds)
+    following = rule.next_after(last)
+    while following is not None and following <= now:
+        following = rule.next_after(following)
+    return following
+
+
+_TASK_START_RE = re.compile(r'(?:to|that|about)\s', re.IGNORECASE)
+
+
+def _outside_task(before, after):
+    """True if a recurrence phrase sits next to the time or the prefix, not inside the task.
+
+    'remind me to take pills every day at 9' and 'remind me every day to ...'
+    qualify; 'remind me to read the daily news at 9am' does not.
+    """
+    after = after.strip().rstrip('.!?')
+    if not after or _TASK_START_RE.match(after) or parse_time_rules(after):
+        return True
+    lead = LEADING_TIME_RE.match(after)  # "every day at 9 to take pills"
+    if lead and parse_time_rules(lead.group(1)):
+        return True
+    prefix = REMINDER_PREFIX_RE.match(before)
+    head = before[prefix.end():].strip() if prefix else before.strip()
+    return not head or parse_time_rules(head) is not None  # "remind me at 9am every day to ..."
+
+
+def parse_recurrence(command):
+    """(kind, value, command without the recurrence phrase); kind is None for one-shot reminders"""
+    for pattern, kind in RECURRENCE_PATTERNS:
+        match = next((m for m in pattern.finditer(command)
+                      if _outside_task(command[:m.start()], command[m.end():])), None)
+        if not match:
+            continue
+        remaining = ' '.join((command[:match.start()] + ' ' + command[match.end():]).split())
+        if kind == 'cron':
+            value = match.group(1)
+        elif kind == 'interval':
+            number = (match.group(1) or 'one').lower()
+            amount = int(number) if number.isdigit() else NUMBER_WORDS[number]
+            value = int(amount * UNIT_SECONDS[match.group(2).lower()[0]])
+        elif kind == 'hourly':
+            kind, value = 'interval', 3600
+        elif kind == 'days':
+            names = re.findall(_DAY_NAME, match.group(1).lower())
+            value = ','.join(str((WEEKDAYS.index(name) + 1) % 7) for name in names)
+        else:
+            value = {'weekdays': '1-5', 'weekends': '0,6', 'daily': '*', 'weekly': None}[kind]
+            kind = 'weekly' if kind == 'weekly' else 'days'
+        return kind, value, remaining
+    return None, None, command
+
+
+def make_rule(kind, value, at):
+    """Rule for a parse_recurrence() result; `at` supplies the time of day (and weekday for 'weekly')"""
+    if kind == 'cron':
+        return CronRule(value)
+    if kind == 'interval':
+        return IntervalRule(value)
+    if kind == 'weekly':
+        value = str((at.weekday() + 1) % 7)
+    return CronRule(f"{at.minute} {at.hour} * * {value}")
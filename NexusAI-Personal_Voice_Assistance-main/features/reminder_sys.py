@@ -1,9 +1,10 @@
 import sqlite3
 import threading
-import time
 from datetime import datetime
-from dateparser import parse
 import atexit
+from features.time_parser import parse_time, split_reminder, warm_up, REMINDER_PREFIX_RE
+from components.config import REMINDER_DEFAULT_HOUR
+from features.recurrence import parse_recurrence, make_rule, rule_from_spec, next_occurrence
 import logging
 
 # Configure logging
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 class ReminderSystem:
     def __init__(self, db_path="nexus_ai_data/reminders.db"):
         self.db_path = db_path
-        self.active_reminders = {}  # Store active reminder threads
+        self.active_reminders = {}  # Store active reminder threads (one per reminder or rule)
         self.running = True
         self.reminder_callback = None  # Callback function for when reminder triggers
         self.init_db()
@@ -26,6 +27,9 @@ class ReminderSystem:
         # Load existing reminders on startup
         self.load_all_reminders()
 
+        # Import dateparser in the background so a rare fallback parse doesn't stall a reply
+        threading.Thread(target=warm_up, daemon=True).start()
+
     def set_reminder_callback(self, callback_function):
         """Set the callback function that will be called when a reminder triggers"""
         self.reminder_callback = callback_function
@@ -40,8 +44,13 @@ class ReminderSystem:
                 text TEXT NOT NULL,
                 time TEXT NOT NULL,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                is_active INTEGER DEFAULT 1
+                is_active INTEGER DEFAULT 1,
+                recurrence TEXT
             )''')
+            # Databases from before recurring reminders lack the column
+            columns = [row[1] for row in c.execute("PRAGMA table_info(reminders)")]
+            if 'recurrence' not in columns:
+                c.execute("ALTER TABLE reminders ADD COLUMN recurrence TEXT")
             conn.commit()
             conn.close()
             logger.info("Database initialized successfully")
@@ -51,8 +60,8 @@ class ReminderSystem:
     def add_reminder(self, reminder_text, time_str):
         """Add a new reminder"""
         try:
-            # Parse the time string
-            reminder_time = parse(time_str)
+            # Parse the time string (rules for common spoken forms, dateparser otherwise)
+            reminder_time = parse_time(time_str)
             if not reminder_time:
                 return False, "Sorry, I couldn't understand the reminder time. Please try again with a clearer time format."
 
@@ -60,17 +69,8 @@ class ReminderSystem:
             if reminder_time <= datetime.now():
                 return False, "The reminder time is in the past. Please set a future time."
 
-            # Store in database
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("INSERT INTO reminders (text, time) VALUES (?, ?)",
-                      (reminder_text, reminder_time.isoformat()))
-            conn.commit()
-            reminder_id = c.lastrowid
-            conn.close()
-
-            # Schedule the reminder
-            self.schedule_reminder(reminder_id, reminder_text, reminder_time)
+            # Store in database and schedule the reminder
+            reminder_id = self.store_reminder(reminder_text, reminder_time)
 
             formatted_time = reminder_time.strftime(
                 '%A, %B %d, %Y at %I:%M %p')
@@ -84,15 +84,74 @@ class ReminderSystem:
             logger.error(f"Error adding reminder: {e}")
             return False, "Sorry, there was an error setting your reminder. Please try again."
 
-    def schedule_reminder(self, reminder_id, text, remind_time):
-        """Schedule a reminder to trigger at the specified time"""
+    def add_recurring_reminder(self, reminder_text, rule, first_time=None):
+        """Add a reminder that repeats by `rule`; only its next occurrence is ever stored"""
+        try:
+            reminder_time = first_time or next_occurrence(rule, datetime.now())
+            if not reminder_time or reminder_time <= datetime.now():
+                return False, "That schedule never comes up in the future. Please try a different one."
+
+            reminder_id = self.store_reminder(reminder_text, reminder_time, rule)
+
+            formatted_time = reminder_time.strftime(
+                '%A, %B %d, %Y at %I:%M %p')
+            success_msg = f"Recurring reminder set {rule.describe()}, starting {formatted_time}: '{reminder_text}'"
+            logger.info(
+                f"Reminder {reminder_id} added: {reminder_text} ({rule.spec}) first at {reminder_time}")
+
+            return True, success_msg
+
+        except Exception as e:
+            logger.error(f"Error adding recurring reminder: {e}")
+            return False, "Sorry, there was an error setting your reminder. Please try again."
+
+    def store_reminder(self, text, remind_time, rule=None):
+        """Insert a reminder row and schedule it; returns its id"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("INSERT INTO reminders (text, time, recurrence) VALUES (?, ?, ?)",
+                  (text, remind_time.isoformat(), rule.spec if rule else None))
+        conn.commit()
+        reminder_id = c.lastrowid
+        conn.close()
+
+        self.schedule_reminder(reminder_id, text, remind_time, rule)
+        return reminder_id
+
+    def update_reminder_time(self, reminder_id, remind_time):
+        """Store the next occurrence of a recurring reminder"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("UPDATE reminders SET time = ? WHERE id = ?",
+                         (remind_time.isoformat(), reminder_id))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error updating reminder {reminder_id}: {e}")
+
+    def schedule_reminder(self, reminder_id, text, remind_time, rule=None):
+        """Schedule a reminder to trigger at the specified time (and again per `rule`)"""
+        entry = {
+            'thread': None,
+            'text': text,
+            'time': remind_time,
+            'rule': rule,
+            'cancelled': threading.Event()
+        }
+
         def reminder_job():
             try:
-                # Wait until the reminder time
-                while datetime.now() < remind_time and self.running:
-                    time.sleep(1)
+                while self.running and not entry['cancelled'].is_set():
+                    # Wait until the reminder time; cancel and shutdown wake the thread at once
+                    remaining = (entry['time'] - datetime.now()).total_seconds()
+                    if remaining > 0:
+                        entry['cancelled'].wait(min(remaining, 60))
+                        continue
+
+                    # Cancelled or replaced just as it came due
+                    if self.active_reminders.get(reminder_id) is not entry:
+                        break
 
-                if self.running:
                     # Trigger the reminder
                     reminder_message = f"🔔 Reminder: {text}"
 
@@ -104,26 +163,24 @@ class ReminderSystem:
 
                     logger.info(f"Reminder {reminder_id} triggered: {text}")
 
-                    # Remove from database after triggering
-                    self.remove_reminder(reminder_id)
+                    next_time = next_occurrence(rule, entry['time']) if rule else None
+                    if next_time is None:
+                        # One-shot (or exhausted) reminder: remove it
+                        self.remove_reminder(reminder_id)
+                        self.active_reminders.pop(reminder_id, None)
+                        break
 
-                    # Remove from active reminders
-                    if reminder_id in self.active_reminders:
-                        del self.active_reminders[reminder_id]
+                    # Recurring: advance to the next occurrence and keep waiting
+                    entry['time'] = next_time
+                    self.update_reminder_time(reminder_id, next_time)
 
             except Exception as e:
                 logger.error(f"Error in reminder job {reminder_id}: {e}")
 
         # Start the reminder thread
-        reminder_thread = threading.Thread(target=reminder_job, daemon=True)
-        reminder_thread.start()
-
-        # Store the thread reference
-        self.active_reminders[reminder_id] = {
-            'thread': reminder_thread,
-            'text': text,
-            'time': remind_time
-        }
+        entry['thread'] = threading.Thread(target=reminder_job, daemon=True)
+        self.active_reminders[reminder_id] = entry
+        entry['thread'].start()
 
     def remove_reminder(self, reminder_id):
         """Remove a reminder from the database"""
@@ -140,9 +197,10 @@ class ReminderSystem:
     def cancel_reminder(self, reminder_id):
         """Cancel an active reminder"""
         try:
-            # Remove from active reminders
-            if reminder_id in self.active_reminders:
-                del self.active_reminders[reminder_id]
+            # Stop its thread (recurring reminders stop for good)
+            entry = self.active_reminders.pop(reminder_id, None)
+            if entry:
+                entry['cancelled'].set()
 
             # Remove from database
             self.remove_reminder(reminder_id)
@@ -157,7 +215,7 @@ class ReminderSystem:
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
-            c.execute("SELECT id, text, time FROM reminders ORDER BY time")
+            c.execute("SELECT id, text, time, recurrence FROM reminders ORDER BY time")
             rows = c.fetchall()
             conn.close()
 
@@ -166,11 +224,15 @@ class ReminderSystem:
 
             reminder_list = "Your active reminders:\n"
             for row in rows:
-                reminder_id, text, time_str = row
+                reminder_id, text, time_str, recurrence = row
                 remind_time = datetime.fromisoformat(time_str)
                 formatted_time = remind_time.strftime(
                     '%A, %B %d, %Y at %I:%M %p')
-                reminder_list += f"{reminder_id}. {text} - {formatted_time}\n"
+                if recurrence:
+                    schedule = rule_from_spec(recurrence).describe()
+                    reminder_list += f"{reminder_id}. {text} - {schedule}, next on {formatted_time}\n"
+                else:
+                    reminder_list += f"{reminder_id}. {text} - {formatted_time}\n"
 
             return reminder_list.strip()
 
@@ -183,7 +245,7 @@ class ReminderSystem:
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
-            c.execute("SELECT id, text, time FROM reminders")
+            c.execute("SELECT id, text, time, recurrence FROM reminders")
             rows = c.fetchall()
             conn.close()
 
@@ -191,10 +253,22 @@ class ReminderSystem:
             expired_reminders = []
 
             for row in rows:
-                reminder_id, text, time_str = row
+                reminder_id, text, time_str, recurrence = row
                 remind_time = datetime.fromisoformat(time_str)
 
-                if remind_time <= current_time:
+                if recurrence:
+                    # Occurrences missed while NexusAI was off are skipped, not replayed
+                    rule = rule_from_spec(recurrence)
+                    if remind_time <= current_time:
+                        remind_time = next_occurrence(rule, remind_time, current_time)
+                        if remind_time is None:
+                            expired_reminders.append(reminder_id)
+                            continue
+                        self.update_reminder_time(reminder_id, remind_time)
+                    self.schedule_reminder(reminder_id, text, remind_time, rule)
+                    logger.info(
+                        f"Loaded recurring reminder {reminder_id}: {text} ({recurrence}) next at {remind_time}")
+                elif remind_time <= current_time:
                     # Reminder time has passed, remove it
                     expired_reminders.append(reminder_id)
                 else:
@@ -220,40 +294,23 @@ class ReminderSystem:
         """Process natural language reminder commands"""
         command_lower = command_text.lower().strip()
 
-        if command_lower.startswith(('set reminder', 'remind me', 'set a reminder')):
+        if REMINDER_PREFIX_RE.match(command_lower):
+            # "every day", "on weekdays", "every 2 hours", "cron 0 9 * * 1-5", ...
+            kind, value, command_text = parse_recurrence(command_text)
+
             # Extract reminder text and time
-            parts = command_text.split(' to ', 1)
-            if len(parts) == 2:
-                time_and_text = parts[1]
-                # Try to find time patterns
-                time_parts = time_and_text.split(' that ', 1)
-                if len(time_parts) == 2:
-                    time_str = time_parts[0].strip()
-                    reminder_text = time_parts[1].strip()
-                else:
-                    # Alternative parsing
-                    words = time_and_text.split()
-                    # Look for common time indicators
-                    time_indicators = ['at', 'on', 'in', 'tomorrow', 'today', 'monday',
-                                       'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                    time_start = -1
-                    for i, word in enumerate(words):
-                        if word.lower() in time_indicators or ':' in word or word.isdigit():
-                            time_start = i
-                            break
-
-                    if time_start != -1:
-                        reminder_text = ' '.join(words[:time_start]).strip()
-                        time_str = ' '.join(words[time_start:]).strip()
-                    else:
-                        return False, "Please specify when you want to be reminded."
+            reminder_text, time_str = split_reminder(command_text)
+            if kind:
+                return self.process_recurring_reminder(reminder_text, time_str, kind, value)
+            if not reminder_text and not time_str:
+                return False, "Please use format like 'remind me to call mom at 3pm' or 'set reminder to meeting tomorrow at 2pm'"
+            if not time_str:
+                return False, "Please specify when you want to be reminded."
 
-                if reminder_text and time_str:
-                    return self.add_reminder(reminder_text, time_str)
-                else:
-                    return False, "Please specify both what to remind you about and when."
+            if reminder_text and time_str:
+                return self.add_reminder(reminder_text, time_str)
             else:
-                return False, "Please use format like 'remind me to call mom at 3pm' or 'set reminder to meeting tomorrow at 2pm'"
+                return False, "Please specify both what to remind you about and when."
 
         elif command_lower in ['list reminders', 'show reminders', 'my reminders']:
             return True, self.list_reminders()
@@ -268,7 +325,28 @@ class ReminderSystem:
         else:
             return False, "I didn't understand that reminder command. Try 'remind me to [task] at [time]' or 'list reminders'"
 
+    def process_recurring_reminder(self, reminder_text, time_str, kind, value):
+        """Build a recurrence rule from a parsed command and add it"""
+        if not reminder_text:
+            return False, "Please tell me what to remind you about."
+        try:
+            first_time = None
+            if kind == 'interval':
+                # "every 2 hours" starts one interval from now unless a start time is given
+                first_time = parse_time(time_str) if time_str else None
+                rule = make_rule(kind, value, first_time)
+            else:
+                # Only the time of day matters, so read "at 9" from midnight (9am, not 9pm)
+                midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+                at = parse_time(time_str, now=midnight) if time_str else None
+                rule = make_rule(kind, value, at or midnight.replace(hour=REMINDER_DEFAULT_HOUR))
+        except ValueError as e:
+            return False, f"I couldn't understand that schedule: {e}"
+        return self.add_recurring_reminder(reminder_text, rule, first_time)
+
     def cleanup(self):
         """Clean up resources when shutting down"""
         logger.info("Shutting down reminder system...")
         self.running = False
+        for entry in list(self.active_reminders.values()):
+            entry['cancelled'].set()
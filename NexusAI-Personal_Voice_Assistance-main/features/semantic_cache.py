@@ -0,0 +1,196 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+from components.config import SEMANTIC_CACHE_DIM, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD, MATH_CACHE_SIZE
+
+
+class HashingEmbedder:
+    """Cheap CPU embedding: hashed word unigrams/bigrams and character trigrams"""
+
+    _token_re = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, dim=SEMANTIC_CACHE_DIM):
+        self.dim = dim
+
+    def _features(self, text):
+        words = self._token_re.findall(text.lower())
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def __call__(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            vector[zlib.crc32(feature.encode('utf-8')) % self.dim] += 1.0
+        return vector
+
+
+class SpacyEmbedder:
+    """Embedding backed by the static word vectors of a spaCy pipeline (e.g. en_core_web_md)"""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.dim = nlp.vocab.vectors_length
+
+    def __call__(self, text):
+        return np.asarray(self.nlp.make_doc(text).vector, dtype=np.float32)
+
+
+class SemanticCache:
+    """In-process vector index mapping prompts to previously generated completions.
+
+    Embeddings are L2-normalised and kept in a fixed-size matrix, so a lookup is a
+    single matrix-vector product. When the cache is full the least recently used
+    entry is overwritten.
+
+    Similar vectors alone are not enough: "world war 1" and "world war 2" score
+    above the threshold. A hit also needs the same set of content words (every
+    word that is not in `stop_words`, numbers included), so only rephrasings
+    that differ in word order, case, punctuation or stopwords are reused.
+    """
+
+    _word_re = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, embedder=None, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=SEMANTIC_CACHE_SIZE,
+                 stop_words=frozenset()):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.stop_words = frozenset(stop_words)
+
+        self._vectors = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._responses = [None] * max_entries
+        self._signatures = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _embed(self, text):
+        vector = self.embedder(text)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def _signature(self, text):
+        return frozenset(w for w in self._word_re.findall(text.lower()) if w not in self.stop_words)
+
+    def get(self, prompt):
+        """Return the cached completion for a similar prompt, or None"""
+        vector = self._embed(prompt)
+        signature = self._signature(prompt)
+        with self._lock:
+            if vector is None or self._size == 0:
+                self.misses += 1
+                return None
+
+            scores = self._vectors[:self._size] @ vector
+            # Most similar entry above the threshold that also has the same content words
+            candidates = np.flatnonzero(scores >= self.threshold)
+            best = next((int(i) for i in candidates[np.argsort(-scores[candidates])]
+                         if self._signatures[i] == signature), None)
+            if best is None:
+                self.misses += 1
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            self.hits += 1
+            return self._responses[best]
+
+    def put(self, prompt, response):
+        """Store a completion for the given prompt"""
+        if response is None:
+            return
+        vector = self._embed(prompt)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._responses[slot] = response
+            self._signatures[slot] = self._signature(prompt)
+            self._last_used[slot] = self._clock
+
+    def clear(self):
+        with self._lock:
+            self._vectors[:] = 0
+            self._responses = [None] * self.max_entries
+            self._signatures = [None] * self.max_entries
+            self._last_used[:] = 0
+            self._size = 0
+
+    def get_stats(self):
+        return {
+            'entries': self._size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class ExpressionCache:
+    """Exact-match LRU cache for math expressions.
+
+    Similar-looking expressions ("2 + 3", "2 * 3") have different answers, so
+    keys are only normalized for case and whitespace; operators are kept.
+    """
+
+    _space_re = re.compile(r"\s+")
+
+    def __init__(self, max_entries=MATH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # normalized expression -> response, least recently used first
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, expr):
+        return self._space_re.sub('', expr.lower())
+
+    def get(self, expr):
+        key = self._key(expr)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, expr, response):
+        if response is None:
+            return
+        key = self._key(expr)
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -1,11 +1,21 @@
 import google.generativeai as genai
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
+from components.config import (GEMINI_MAX_WORKERS, GEMINI_MAX_IN_FLIGHT,
+                               GEMINI_RATE_LIMIT, GEMINI_RATE_BURST, GEMINI_REQUEST_TIMEOUT)
+from components.concurrency import TokenBucket, SingleFlight
+from features.semantic_cache import SemanticCache, ExpressionCache
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 class GeminiSummarizer:
-    def __init__(self, model_name='gemini-2.5-flash', temperature=0.4, top_p=1.0, top_k=40):
+    def __init__(self, model_name='gemini-2.5-flash', temperature=0.4, top_p=1.0, top_k=40, embedder=None,
+                 max_workers=GEMINI_MAX_WORKERS, max_in_flight=GEMINI_MAX_IN_FLIGHT,
+                 rate_limit=GEMINI_RATE_LIMIT, rate_burst=GEMINI_RATE_BURST,
+                 request_timeout=GEMINI_REQUEST_TIMEOUT, stop_words=frozenset()):
         # Setup API key
         genai.configure(api_key=GEMINI_API_KEY)
 
@@ -19,26 +29,124 @@ class GeminiSummarizer:
             top_k=top_k
         )
 
+        # Local semantic cache, keyed on the user's text rather than the full
+        # prompt so the shared instruction doesn't dominate the similarity.
+        # Math answers are only reused for the exact same expression.
+        self.summary_cache = SemanticCache(embedder=embedder, stop_words=stop_words)
+        self.math_cache = ExpressionCache()
+
+        # Bounded worker pool, in-flight cap, rate limiter and coalescing of
+        # identical prompts that are already being generated
+        self.request_timeout = request_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gemini")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._rate_limiter = TokenBucket(rate_limit, rate_burst)
+        self._single_flight = SingleFlight()
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'requests': 0,      # calls to generate_response
+            'coalesced': 0,     # calls that joined an identical in-flight prompt
+            'api_calls': 0,     # generate_content calls actually issued
+            'rejected': 0,      # calls dropped because max_in_flight was reached
+            'rate_limited': 0,  # calls that had to wait for a rate limit token
+            'errors': 0,
+            'timeouts': 0
+        }
+
     def calculate(self, expr):
-        # Create the final prompt with instruction
-        final_prompt = (
-            f"Solve this maths expression and give directly the answer and if the expression is inccorect just say incorect expresson dont give explaination:\n\n{expr}\n\n"
-        )
-        response = self.generate_response(final_prompt)
+        response = self.math_cache.get(expr)
+        if response is None:
+            # Create the final prompt with instruction
+            final_prompt = (
+                f"Solve this maths expression and give directly the answer and if the expression is inccorect just say incorect expresson dont give explaination:\n\n{expr}\n\n"
+            )
+            response = self.generate_response(final_prompt)
+            self.math_cache.put(expr, response)
+
         if response:
             return f"The answer is {response}"
         else:
             return "Sorry, I am unable to solve this problem. Check your math problem."
-    
+
     def summarize(self, prompt):
+        response = self.summary_cache.get(prompt)
+        if response is not None:
+            return response
+
         # Create the final prompt with instruction
         final_prompt = (
             f"Summarize this in 2-3 lines, clear and meaningful:\n\n{prompt}\n\n"
         )
-        return self.generate_response(final_prompt)
+        response = self.generate_response(final_prompt)
+        self.summary_cache.put(prompt, response)
+        return response
+
+    def get_cache_stats(self):
+        return {
+            'summary': self.summary_cache.get_stats(),
+            'math': self.math_cache.get_stats()
+        }
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['in_flight'] = len(self._single_flight)
+        stats['cache'] = self.get_cache_stats()
+        return stats
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
 
-        
     def generate_response(self, prompt):
+        self._count('requests')
+        deadline = time.monotonic() + self.request_timeout
+
+        future, is_leader = self._single_flight.begin(prompt)
+        if not is_leader:
+            # The same prompt is already being generated; share its result
+            self._count('coalesced')
+        elif not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            print("Gemini request queue is full, dropping request")
+            self._single_flight.finish(prompt, None)
+        else:
+            try:
+                self._executor.submit(self._run, prompt, deadline)
+            except RuntimeError as e:
+                # Executor has been shut down
+                self._slots.release()
+                self._single_flight.finish(prompt, error=e)
+
+        try:
+            return future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            self._count('timeouts')
+            print("Gemini request timed out")
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+        return None
+
+    def _run(self, prompt, deadline):
+        try:
+            if not self._rate_limiter.acquire(timeout=0):
+                self._count('rate_limited')
+                # Don't call the model for a request whose caller has already given up
+                if not self._rate_limiter.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                    self._single_flight.finish(
+                        prompt, error=TimeoutError("rate limit wait exceeded the request timeout"))
+                    return
+            result = self._call_model(prompt)
+            self._single_flight.finish(prompt, result)
+        except Exception as e:
+            self._single_flight.finish(prompt, error=e)
+        finally:
+            self._slots.release()
+
+    def _call_model(self, prompt):
+        self._count('api_calls')
         try:
             # Generate response
             response = self.model.generate_content(
@@ -55,5 +163,9 @@ class GeminiSummarizer:
                 return None
 
         except Exception as e:
+            self._count('errors')
             print(f"Error generating summary: {e}")
             return None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
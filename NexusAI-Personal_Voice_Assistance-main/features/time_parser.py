@@ -0,0 +1,210 @@
+import re
+import threading
+from datetime import datetime, timedelta
+from components.config import (REMINDER_DEFAULT_HOUR, REMINDER_PERIOD_HOURS,
+                               DATEPARSER_LANGUAGES, DATEPARSER_SETTINGS)
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'fifteen': 15, 'twenty': 20, 'thirty': 30, 'forty': 40, 'forty five': 45,
+    'fifty': 50, 'sixty': 60, 'ninety': 90, 'a couple of': 2, 'a few': 3, 'half an': 0.5,
+}
+UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+_NUMBER = r'\d+(?:\.\d+)?|' + '|'.join(sorted(map(re.escape, NUMBER_WORDS), key=len, reverse=True))
+_UNIT = r'seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|weeks?'
+
+# "in 20 minutes", "after an hour and a half", "in 2 hours and 15 minutes"
+RELATIVE_RE = re.compile(r'(?:in|after)\s+(.+)')
+AMOUNT_RE = re.compile(rf'\b({_NUMBER})\s+({_UNIT})\b(\s+and\s+a\s+half)?')
+AMOUNT_FILLER_RE = re.compile(r'\b(?:and|from now|later)\b|,')
+
+# "on 3 november", "the 15th of april", "march 2nd"
+_MONTH = '|'.join(f'{m[:3]}(?:{m[3:]})?' if len(m) > 3 else m for m in MONTHS)
+DATE_RE = re.compile(rf'\b(?:(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?({_MONTH})|({_MONTH})\s+(\d{{1,2}})(?:st|nd|rd|th)?)\b')
+
+# "tomorrow at 9", "at 3pm", "friday 5:30 pm", "this evening", "tonight at 8"
+DAY_RE = re.compile(r'\b(day after tomorrow|today|tonight|tomorrow|(?:next\s+)?(?:' + '|'.join(WEEKDAYS) + r'))\b')
+CLOCK_RE = re.compile(r"\b(at\s+)?(?:(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|o'?clock)?|(noon|midnight))\b")
+PERIOD_RE = re.compile(r'\b(morning|afternoon|evening|night)\b')
+FILLER_WORDS = {'at', 'on', 'in', 'for', 'the', 'this', 'by', 'around', 'about', 'starting', 'beginning'}
+
+# Splitting "remind me to <task> <time>" / "remind me <time> to <task>"
+REMINDER_PREFIX_RE = re.compile(
+    r'^\s*(?:please\s+)?(?:set\s+(?:a\s+)?reminder|remind\s+me|remember)\b\s*(?:(?:to|that|about)\s+)?',
+    re.IGNORECASE)
+LEADING_TIME_RE = re.compile(r'^(.+?)\s+(?:to|that|about)\s+(.+)$', re.IGNORECASE)
+TIME_START_RE = re.compile(
+    r'\b(?:at|on|in|after|by|today|tonight|tomorrow|this|next|noon|midnight|morning|afternoon|evening|starting|beginning|'
+    + '|'.join(WEEKDAYS) + r')\b|\b\d', re.IGNORECASE)
+
+
+def _normalize(text):
+    text = text.lower().replace('a.m.', 'am').replace('p.m.', 'pm')
+    return ' '.join(text.replace(',', ' ').rstrip('.!?').split())
+
+
+def _parse_relative(text, now):
+    match = RELATIVE_RE.fullmatch(text)
+    if not match:
+        return None
+    seconds = 0
+    for number, unit, and_a_half in AMOUNT_RE.findall(match.group(1)):
+        amount = float(number) if number[0].isdigit() else NUMBER_WORDS[number]
+        if and_a_half:
+            amount += 0.5
+        seconds += amount * UNIT_SECONDS[unit[0]]
+    # Anything left over is not a plain duration, so leave it to dateparser
+    if seconds <= 0 or AMOUNT_FILLER_RE.sub('', AMOUNT_RE.sub('', match.group(1))).strip():
+        return None
+    return now + timedelta(seconds=seconds)
+
+
+def _parse_absolute(text, now):
+    day = clock = period = date = None
+    rest = text
+    match = DATE_RE.search(rest)
+    if match:
+        day_of_month = int(match.group(1) or match.group(4))
+        month = next(i for i, m in enumerate(MONTHS, 1) if m.startswith((match.group(2) or match.group(3))[:3]))
+        try:
+            date = now.date().replace(month=month, day=day_of_month)
+        except ValueError:
+            return None
+        if date < now.date():
+            date = date.replace(year=date.year + 1)
+        rest = rest[:match.start()] + ' ' + rest[match.end():]
+    match = DAY_RE.search(rest)
+    if match:
+        day = match.group(1)
+        rest = rest[:match.start()] + ' ' + rest[match.end():]
+    match = CLOCK_RE.search(rest)
+    if match and (match.group(2) or match.group(5)):
+        clock = match
+        rest = rest[:match.start()] + ' ' + rest[match.end():]
+    match = PERIOD_RE.search(rest)
+    if match:
+        period = match.group(1)
+        rest = rest[:match.start()] + ' ' + rest[match.end():]
+
+    if any(word not in FILLER_WORDS for word in rest.split()):
+        return None
+    if day == 'tonight':
+        period = period or 'tonight'
+    if clock is None and period is None and date is None and day in (None, 'today'):
+        return None
+
+    # Date
+    if date is not None:
+        day = day or 'date'
+    elif day in (None, 'today', 'tonight'):
+        date = now.date()
+    elif day == 'tomorrow':
+        date = now.date() + timedelta(days=1)
+    elif day == 'day after tomorrow':
+        date = now.date() + timedelta(days=2)
+    else:
+        date = now.date() + timedelta(days=(WEEKDAYS.index(day.split()[-1]) - now.weekday()) % 7 or 7)
+
+    # Time of day
+    ambiguous = False
+    if clock is None:
+        hour, minute = REMINDER_PERIOD_HOURS.get(period, REMINDER_DEFAULT_HOUR), 0
+    elif clock.group(5):
+        hour, minute = (12, 0) if clock.group(5) == 'noon' else (0, 0)
+    else:
+        hour, minute = int(clock.group(2)), int(clock.group(3) or 0)
+        meridiem = clock.group(4)
+        # A bare number is only a time with "at" or a day/period next to it
+        if not (meridiem or clock.group(3) or clock.group(1) or day or period):
+            return None
+        if hour > 23 or minute > 59 or (meridiem in ('am', 'pm') and not 1 <= hour <= 12):
+            return None
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        elif meridiem not in ('am', 'pm') and hour < 12:
+            if period in ('afternoon', 'evening', 'night', 'tonight'):
+                hour += 12
+            elif period is None:
+                ambiguous = True
+
+    result = datetime.combine(date, datetime.min.time()).replace(hour=hour, minute=minute)
+    if day in (None, 'today', 'tonight') and result <= now:
+        # "at 3" after 3am means 3pm; otherwise roll over to the next day
+        if ambiguous and result + timedelta(hours=12) > now:
+            result += timedelta(hours=12)
+        elif day is None or clock is not None and clock.group(5) == 'midnight':
+            result += timedelta(days=1)
+    return result
+
+
+def parse_time_rules(text, now=None):
+    """Datetime for common spoken time expressions, or None if the rules don't cover `text`"""
+    now = now or datetime.now()
+    text = _normalize(text)
+    if not text:
+        return None
+    return _parse_relative(text, now) or _parse_absolute(text, now)
+
+
+_fallback = None
+_fallback_lock = threading.Lock()
+
+
+def _fallback_parser():
+    global _fallback
+    with _fallback_lock:
+        if _fallback is None:
+            # dateparser is slow to import and to set up, so it is only built when needed
+            from dateparser.date import DateDataParser
+            _fallback = DateDataParser(languages=DATEPARSER_LANGUAGES, settings=DATEPARSER_SETTINGS)
+    return _fallback
+
+
+def parse_time_fallback(text):
+    """dateparser, restricted to the configured languages and settings"""
+    try:
+        parser = _fallback_parser()
+        with _fallback_lock:
+            return parser.get_date_data(text).date_obj
+    except Exception as e:
+        print(f"dateparser failed on '{text}': {e}")
+        return None
+
+
+def warm_up():
+    """Import dateparser and load its language data ahead of the first reminder"""
+    parse_time_fallback('tomorrow at 9am')
+
+
+def parse_time(text, now=None):
+    """Rules first, dateparser only when they miss"""
+    return parse_time_rules(text, now) or parse_time_fallback(text)
+
+
+def split_reminder(command, now=None):
+    """(task, time expression) from a reminder command, or None if it isn't one"""
+    match = REMINDER_PREFIX_RE.match(command)
+    if not match:
+        return None
+    rest = command[match.end():].strip().rstrip('.!?')
+
+    # "remind me at 5pm to call mom", "set reminder to tomorrow 9am that standup"
+    lead = LEADING_TIME_RE.match(rest)
+    if lead and parse_time_rules(lead.group(1), now):
+        return lead.group(2).strip(), lead.group(1).strip()
+
+    # "remind me to call mom at 5pm": the first place where the rest is a time wins
+    starts = [m.start() for m in TIME_START_RE.finditer(rest) if m.start() > 0]
+    for start in starts:
+        if parse_time_rules(rest[start:], now):
+            return rest[:start].strip(), rest[start:].strip()
+    if starts:
+        return rest[:starts[0]].strip(), rest[starts[0]:].strip()
+    return rest, ''
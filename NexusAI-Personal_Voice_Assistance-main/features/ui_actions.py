@@ -0,0 +1,176 @@
+import re
+import time
+from components.config import UI_ACTION_PATTERNS, UI_KEY_INTERVAL, UI_STEP_DELAY
+
+# Keyboard steps for each UI action: ('hotkey', keys), ('press', key) or ('write', text)
+UI_ACTION_STEPS = {
+    'next_tab': [('hotkey', ('ctrl', 'tab'))],
+    'previous_tab': [('hotkey', ('ctrl', 'shift', 'tab'))],
+    'close_tab': [('hotkey', ('ctrl', 'w'))],
+    'new_tab': [('hotkey', ('ctrl', 't'))],
+    'close_window': [('hotkey', ('alt', 'f4'))],
+    'minimize_window': [('hotkey', ('win', 'down'))],
+    'maximize_window': [('hotkey', ('win', 'up'))],
+    'volume_up': [('press', 'volumeup')],
+    'volume_down': [('press', 'volumedown')],
+    'mute': [('press', 'volumemute')],
+    'pause_play': [('press', 'playpause')],
+    'play': [('press', 'play')],
+    'pause': [('press', 'pause')],
+    'next_track': [('press', 'nexttrack')],
+    'previous_track': [('press', 'prevtrack')],
+    'enter': [('press', 'enter')],
+    'copy': [('hotkey', ('ctrl', 'c'))],
+    'paste': [('hotkey', ('ctrl', 'v'))],
+    'select_all': [('hotkey', ('ctrl', 'a'))],
+    'undo': [('hotkey', ('ctrl', 'z'))],
+    'redo': [('hotkey', ('ctrl', 'y'))],
+    'alt_tab': [('hotkey', ('alt', 'tab'))],
+    'refresh': [('press', 'f5')],
+    'go_back': [('hotkey', ('alt', 'left'))],
+    'go_forward': [('hotkey', ('alt', 'right'))],
+}
+
+MACRO_SEPARATOR_RE = re.compile(r"\s*(?:,\s*(?:and\s+)?then\b|\band\s+then\b|\bthen\b|,)\s*",
+                                re.IGNORECASE)
+_PREVIOUS_RE = re.compile(r"\b(?:previous|prev|left|back)\b")
+
+
+class PyAutoGUIBackend:
+    """Sends key steps with pyautogui, without its default sleep after every call"""
+
+    def __init__(self, interval=UI_KEY_INTERVAL, step_delay=UI_STEP_DELAY):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.interval = interval
+        self.step_delay = step_delay
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0
+
+    def run(self, steps):
+        for i, (kind, arg) in enumerate(steps):
+            if i and self.step_delay:
+                time.sleep(self.step_delay)
+            if kind == 'hotkey':
+                self.pyautogui.hotkey(*arg, interval=self.interval)
+            elif kind == 'press':
+                self.pyautogui.press(arg)
+            elif kind == 'write':
+                self.pyautogui.write(arg, interval=self.interval)
+            else:
+                raise ValueError(f"Unknown UI step: {kind}")
+
+    def screenshot(self):
+        return self.pyautogui.screenshot()
+
+
+class RecordingBackend:
+    """Collects steps instead of sending them (for headless runs and tests)"""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def steps(self):
+        return [step for call in self.calls for step in call]
+
+    def run(self, steps):
+        self.calls.append(list(steps))
+
+    def screenshot(self):
+        return None
+
+
+def match_ui_action(segment):
+    """(action, text) for one spoken UI command, or (None, None)
+
+    The action whose pattern covers the longest part of the segment wins, so
+    'pause play' maps to pause_play rather than pause. Tab switching resolves
+    to next_tab or previous_tab.
+    """
+    best, best_length, text = None, 0, None
+    for action, patterns in UI_ACTION_PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, segment, re.IGNORECASE)
+            if match and match.end() - match.start() > best_length:
+                best, best_length = action, match.end() - match.start()
+                text = match.group(1).strip() if action == 'type_text' else None
+
+    if best == 'switch_tab':
+        best = 'previous_tab' if _PREVIOUS_RE.search(segment.lower()) else 'next_tab'
+    return best, text
+
+
+def starts_with_ui_action(text):
+    """True if `text` begins with a UI action phrase ('press enter ...', 'go back ...')"""
+    return any(re.match(pattern, text, re.IGNORECASE)
+               for patterns in UI_ACTION_PATTERNS.values() for pattern in patterns)
+
+
+def split_macro(command):
+    """Split a compound command at its separators, keeping dictated text whole.
+
+    After a type/write command a separator only ends the text when another
+    action follows it, so 'type I will go then come back' stays one segment.
+    """
+    command = command.strip()
+    segments, start = [], 0
+    for separator in MACRO_SEPARATOR_RE.finditer(command):
+        segment = command[start:separator.start()]
+        if match_ui_action(segment)[0] == 'type_text' and not starts_with_ui_action(command[separator.end():]):
+            continue
+        segments.append(segment)
+        start = separator.end()
+    segments.append(command[start:])
+    return segments
+
+
+def parse_macro(command):
+    """Split 'new tab, type hello then enter' into [(action, text), ...]
+
+    Returns None unless every part is a recognised UI action.
+    """
+    actions = []
+    for segment in split_macro(command):
+        if not segment:
+            continue
+        action, text = match_ui_action(segment)
+        if action not in UI_ACTION_STEPS and not (action == 'type_text' and text):
+            return None
+        actions.append((action, text))
+    return actions
+
+
+def action_steps(action, text=None):
+    if action == 'type_text':
+        return [('write', text)] if text else []
+    return list(UI_ACTION_STEPS[action])
+
+
+class UIActionExecutor:
+    """Runs UI actions and macros, each as a single backend call"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def run(self, steps, label="UI action"):
+        if not steps:
+            return False
+        if self.backend is None:
+            print(f"Cannot run {label}: UI automation is unavailable")
+            return False
+        try:
+            self.backend.run(steps)
+            return True
+        except Exception as e:
+            print(f"Error running {label}: {e}")
+            return False
+
+    def run_action(self, action, text=None):
+        return self.run(action_steps(action, text), label=action.replace('_', ' '))
+
+    def run_macro(self, actions):
+        steps = []
+        for action, text in actions:
+            steps.extend(action_steps(action, text))
+        return self.run(steps, label="UI macro")
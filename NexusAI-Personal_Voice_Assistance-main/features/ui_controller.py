@@ -1,145 +1,75 @@
-import pyautogui
 import os
 from datetime import datetime
+from features.ui_actions import PyAutoGUIBackend, UIActionExecutor
 
 
 class UIController:
-    def __init__(self):
-        # Disable pyautogui failsafe for smoother operation
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1  # Small pause between actions
+    def __init__(self, backend=None):
+        # Every action goes through one executor so its backend can be swapped
+        # (e.g. a RecordingBackend in tests); pyautogui runs without its per-call pause
+        if backend is None:
+            try:
+                backend = PyAutoGUIBackend()
+            except Exception as e:  # No display available (e.g. headless runs)
+                print(f"pyautogui unavailable: {e}")
+        self.backend = backend
+        self.executor = UIActionExecutor(backend)
 
     def switch_tab(self, direction='next'):
         """Switch browser tabs"""
-        try:
-            if direction == 'next':
-                # Ctrl+Tab for next tab
-                pyautogui.hotkey('ctrl', 'tab')
-            elif direction == 'previous':
-                # Ctrl+Shift+Tab for previous tab
-                pyautogui.hotkey('ctrl', 'shift', 'tab')
-            return True
-        except Exception as e:
-            print(f"Error switching tab: {e}")
-            return False
+        if direction == 'previous':
+            return self.executor.run_action('previous_tab')
+        return self.executor.run_action('next_tab')
 
     def close_tab(self):
         """Close current tab"""
-        try:
-            pyautogui.hotkey('ctrl', 'w')
-            return True
-        except Exception as e:
-            print(f"Error closing tab: {e}")
-            return False
+        return self.executor.run_action('close_tab')
 
     def close_window(self):
         """Close current window"""
-        try:
-            pyautogui.hotkey('alt', 'f4')
-            return True
-        except Exception as e:
-            print(f"Error closing window: {e}")
-            return False
+        return self.executor.run_action('close_window')
 
     def volume_up(self):
         """Increase system volume"""
-        try:
-            pyautogui.press('volumeup')
-            return True
-        except Exception as e:
-            print(f"Error increasing volume: {e}")
-            return False
+        return self.executor.run_action('volume_up')
 
     def volume_down(self):
         """Decrease system volume"""
-        try:
-            pyautogui.press('volumedown')
-            return True
-        except Exception as e:
-            print(f"Error decreasing volume: {e}")
-            return False
+        return self.executor.run_action('volume_down')
 
     def mute_volume(self):
         """Mute/unmute system volume"""
-        try:
-            pyautogui.press('volumemute')
-            return True
-        except Exception as e:
-            print(f"Error muting volume: {e}")
-            return False
+        return self.executor.run_action('mute')
 
     def pause_play(self):
         """Pause or play media"""
-        try:
-            pyautogui.press('playpause')
-            return True
-        except Exception as e:
-            print(f"Error with pause/play: {e}")
-            return False
+        return self.executor.run_action('pause_play')
 
     def play_media(self):
         """Play media"""
-        try:
-            pyautogui.press('play')
-            return True
-        except Exception as e:
-            # Fallback to space key (common play/pause)
-            try:
-                pyautogui.press('space')
-                return True
-            except:
-                print(f"Error playing media: {e}")
-                return False
+        # Fallback to space key (common play/pause)
+        return self.executor.run_action('play') or self.executor.run([('press', 'space')])
 
     def pause_media(self):
         """Pause media"""
-        try:
-            pyautogui.press('pause')
-            return True
-        except Exception as e:
-            # Fallback to space key (common play/pause)
-            try:
-                pyautogui.press('space')
-                return True
-            except:
-                print(f"Error pausing media: {e}")
-                return False
+        # Fallback to space key (common play/pause)
+        return self.executor.run_action('pause') or self.executor.run([('press', 'space')])
 
     def next_track(self):
         """Skip to next track"""
-        try:
-            pyautogui.press('nexttrack')
-            return True
-        except Exception as e:
-            print(f"Error skipping to next track: {e}")
-            return False
+        return self.executor.run_action('next_track')
 
     def previous_track(self):
         """Go to previous track"""
-        try:
-            pyautogui.press('prevtrack')
-            return True
-        except Exception as e:
-            print(f"Error going to previous track: {e}")
-            return False
+        return self.executor.run_action('previous_track')
 
     def minimize_window(self):
         """Minimize current window"""
-        try:
-            pyautogui.hotkey('win', 'down')
-            return True
-        except Exception as e:
-            print(f"Error minimizing window: {e}")
-            return False
+        return self.executor.run_action('minimize_window')
 
     def maximize_window(self):
         """Maximize current window"""
-        try:
-            pyautogui.hotkey('win', 'up')
-            return True
-        except Exception as e:
-            print(f"Error maximizing window: {e}")
-            return False
+        return self.executor.run_action('maximize_window')
 
     def screenshot(self):
         """Take a screenshot"""
@@ -153,7 +83,7 @@ class UIController:
             filename = f"screenshots/ss_{timestamp}.png"
 
             # Take screenshot
-            screenshot = pyautogui.screenshot()
+            screenshot = self.backend.screenshot()
             screenshot.save(filename)
 
             return f"Screenshot saved successfully!"
@@ -163,117 +93,60 @@ class UIController:
 
     def type_text(self, text):
         """Type the specified text"""
-        try:
-            pyautogui.write(text)
-            return True
-        except Exception as e:
-            print(f"Error typing text: {e}")
-            return False
+        return self.executor.run_action('type_text', text)
 
     def press_key(self, key):
         """Press a specific key"""
-        try:
-            pyautogui.press(key)
-            return True
-        except Exception as e:
-            print(f"Error pressing key {key}: {e}")
-            return False
+        return self.executor.run([('press', key)], label=f"key {key}")
 
     def hotkey(self, *keys):
         """Press a combination of keys"""
-        try:
-            pyautogui.hotkey(*keys)
-            return True
-        except Exception as e:
-            print(f"Error pressing hotkey {keys}: {e}")
-            return False
+        return self.executor.run([('hotkey', keys)], label=f"hotkey {keys}")
 
     def copy_to_clipboard(self):
         """Copy selected text to clipboard"""
-        try:
-            pyautogui.hotkey('ctrl', 'c')
-            return True
-        except Exception as e:
-            print(f"Error copying to clipboard: {e}")
-            return False
+        return self.executor.run_action('copy')
 
     def paste_from_clipboard(self):
         """Paste from clipboard"""
-        try:
-            pyautogui.hotkey('ctrl', 'v')
-            return True
-        except Exception as e:
-            print(f"Error pasting from clipboard: {e}")
-            return False
+        return self.executor.run_action('paste')
 
     def select_all(self):
         """Select all text"""
-        try:
-            pyautogui.hotkey('ctrl', 'a')
-            return True
-        except Exception as e:
-            print(f"Error selecting all: {e}")
-            return False
+        return self.executor.run_action('select_all')
 
     def undo(self):
         """Undo last action"""
-        try:
-            pyautogui.hotkey('ctrl', 'z')
-            return True
-        except Exception as e:
-            print(f"Error undoing: {e}")
-            return False
+        return self.executor.run_action('undo')
 
     def redo(self):
         """Redo last action"""
-        try:
-            pyautogui.hotkey('ctrl', 'y')
-            return True
-        except Exception as e:
-            print(f"Error redoing: {e}")
-            return False
+        return self.executor.run_action('redo')
 
     def alt_tab(self):
         """Switch between applications"""
-        try:
-            pyautogui.hotkey('alt', 'tab')
-            return True
-        except Exception as e:
-            print(f"Error switching applications: {e}")
-            return False
+        return self.executor.run_action('alt_tab')
 
     def new_tab(self):
         """Open new tab"""
-        try:
-            pyautogui.hotkey('ctrl', 't')
-            return True
-        except Exception as e:
-            print(f"Error opening new tab: {e}")
-            return False
+        return self.executor.run_action('new_tab')
 
     def refresh_page(self):
         """Refresh current page"""
-        try:
-            pyautogui.press('f5')
-            return True
-        except Exception as e:
-            print(f"Error refreshing page: {e}")
-            return False
+        return self.executor.run_action('refresh')
 
     def go_back(self):
         """Go back in browser"""
-        try:
-            pyautogui.hotkey('alt', 'left')
-            return True
-        except Exception as e:
-            print(f"Error going back: {e}")
-            return False
+        return self.executor.run_action('go_back')
 
     def go_forward(self):
         """Go forward in browser"""
-        try:
-            pyautogui.hotkey('alt', 'right')
-            return True
-        except Exception as e:
-            print(f"Error going forward: {e}")
-            return False
+        return self.executor.run_action('go_forward')
+
+    def press_enter(self):
+        """Press the Enter key"""
+        return self.executor.run_action('enter')
+
+    def run_macro(self, actions):
+        """Run parsed (action, text) pairs as one key sequence"""
+        return self.executor.run_macro(actions)
@@ -1,5 +1,7 @@
 import streamlit as st
 from datetime import datetime
+import html
+import queue
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -7,10 +9,9 @@ WAKE_WORD = os.getenv("WAKE_WORD")
 
 # Import your existing modules
 try:
-    from components.nlp_processor import NLPProcessor
-    from components.data_manager import DataManager
-    from components.audio_handler import AudioHandler
-    from components.command_processor import CommandProcessor
+    from components.engine import NexusEngine
+    from components.voice_worker import VoiceWorker
+    from components.config import UI_REFRESH_INTERVAL, CHAT_HISTORY_LIMIT, WELCOME_MESSAGE
 except ImportError as e:
     st.error(f"Missing required module: {e}")
     st.error("Please install missing packages and ensure all modules are available.")
@@ -55,81 +56,132 @@ def initialize_session_state():
         st.session_state.running = True
 
 
+# Heavy components (NLP models, reminder scheduler, Gemini client, TTS) are
+# built once per process and shared by every browser session
+@st.cache_resource(show_spinner="Initializing NexusAI components...")
+def get_nexus_engine():
+    return NexusEngine()
+
+
 def initialize_nexus_components():
     try:
-        print("Initializing NexusAI components...")
-        with st.spinner("Initializing NexusAI components..."):
-            st.session_state.data_manager = DataManager()
-            st.session_state.nlp_processor = NLPProcessor()
-            st.session_state.audio_handler = AudioHandler()
-            st.session_state.command_processor = CommandProcessor(
-                st.session_state.nlp_processor,
-                st.session_state.data_manager
-            )
-            st.session_state.nexus_initialized = True
-            print("NexusAI initialization complete!")
-            return True
+        engine = get_nexus_engine()
+        # Sessions only keep references to the shared engine parts
+        st.session_state.engine = engine
+        st.session_state.data_manager = engine.data_manager
+        st.session_state.nlp_processor = engine.nlp_processor
+        st.session_state.audio_handler = engine.audio_handler
+        st.session_state.command_processor = engine.command_processor
+        st.session_state.nexus_initialized = True
+        return True
     except Exception as e:
         st.error(f"Failed to initialize NexusAI: {e}")
         return False
 
 
-def shutdown():
-    st.session_state.running = False
+# The microphone loop runs once per process on a background thread and
+# publishes events that every session renders on its own schedule
+@st.cache_resource(show_spinner=False)
+def get_voice_worker():
+    worker = VoiceWorker(get_nexus_engine(), WAKE_WORD,
+                         welcome_message=WELCOME_MESSAGE)
+    worker.start()
+    return worker
 
-    # Save all data before shutdown
-    try:
-        st.session_state.data_manager.save_all_data()
-        print("Data saved to DB.")
-    except Exception as e:
-        print(f"Error saving data: {e}")
 
-    st.session_state.audio_handler.speak("Shutting Down.")
-    print("NexusAI shutdown complete.")
+def drain_voice_events():
+    events = st.session_state.voice_events
+    while True:
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            break
+
+        if event['type'] == 'transcript':
+            st.session_state.chat_history.append(
+                {'role': 'user', 'text': event['text'], 'timestamp': event['timestamp']})
+        elif event['type'] == 'response':
+            st.session_state.chat_history.append(
+                {'role': 'assistant', 'text': event['text'], 'timestamp': event['timestamp'],
+                 'process_ms': event['process_ms']})
+        elif event['type'] == 'speaking':
+            st.session_state.is_speaking = event['active']
+        elif event['type'] == 'status':
+            st.session_state.is_listening = event['listening']
+            st.session_state.voice_session = {
+                key: event[key] for key in ('state', 'processed', 'dropped')}
+        elif event['type'] == 'shutdown':
+            st.session_state.running = False
+
+    # Keep the per-session history light
+    if len(st.session_state.chat_history) > CHAT_HISTORY_LIMIT:
+        st.session_state.chat_history = st.session_state.chat_history[-CHAT_HISTORY_LIMIT:]
+
+
+def render_animation():
+    # Determine animation classes - now based on speaking instead of listening
+    speaking_class = "speaking" if st.session_state.is_speaking else ""
+
+    # Central animation - updated to show animation when speaking
+    st.markdown(f"""
+        <div id="main">
+        <div id="myCircle">
+        <div id="mainCircle">
+            <div class="circle {speaking_class}"></div>
+            <div class="circle1 {speaking_class}"></div>
+            <div id="mainContent">
+                <ul class="bars one {speaking_class}">
+                    <li></li>
+                    <li></li>
+                </ul>
+                <ul class="bars two {speaking_class}">
+                    <li></li>
+                    <li></li>
+                    <li></li>
+                </ul>
+                <ul class="bars three {speaking_class}">
+                    <li></li>
+                    <li></li>
+                </ul>
+                <ul class="bars four {speaking_class}">
+                    <li></li>
+                    <li></li>
+                    <li></li>
+                </ul>
+                </div>
+                </div>
+            </div>
+        </div>""", unsafe_allow_html=True)
+
 
+def render_chat_history():
+    for message in reversed(st.session_state.chat_history):
+        css_class = "user-message" if message['role'] == 'user' else "assistant-message"
+        timing = ""
+        if 'process_ms' in message:
+            timing = f" · {message['process_ms']:.0f} ms"
+        st.markdown(
+            f'<div class="chat-message {css_class}">{html.escape(message["text"])}'
+            f'<br><small>{message["timestamp"].strftime("%H:%M:%S")}{timing}</small></div>',
+            unsafe_allow_html=True)
 
 
-def listen_for_voice():
-    while st.session_state.nexus_initialized and st.session_state.running:
-        try:
-            # Listen for audio input
-            audio_input = st.session_state.audio_handler.listen()
-
-            if audio_input:
-                # Check for wake word or if already listening
-                if st.session_state.wake_word in audio_input.lower() or st.session_state.is_listening:
-                    # Process command
-                    response, should_exit = st.session_state.command_processor.process_command(
-                        audio_input)
-
-                    # Speak response
-                    try:
-                        st.session_state.audio_handler.speak(response)
-                    except Exception as e:
-                        print(f"Error with text-to-speech: {e}")
-
-                    if should_exit:
-                        shutdown()
-                        st.success("NexusAI has been shut down.")
-
-                    # Set listening state for follow-up commands
-                    st.session_state.is_listening = True
-
-        except Exception as e:
-            print(f"Error in Listening: {e}")
-            # traceback.print_exc()
-            st.session_state.audio_handler.speak(
-                "Sorry, I encountered an error. Please try again.")
-        except KeyboardInterrupt:
-            print("\nShutting down NexusAI...")
-            shutdown()
-            break
+# Re-runs on its own timer without re-running the whole script, so the page
+# keeps updating while the worker waits on the microphone
+@st.fragment(run_every=UI_REFRESH_INTERVAL)
+def live_panel():
+    drain_voice_events()
+    render_animation()
+    if not st.session_state.running:
+        st.success("NexusAI has been shut down.")
+    render_chat_history()
 
 
 def get_system_info():
     try:
         info = {
             'is_listening': st.session_state.get('is_listening', False),
+            'session': st.session_state.get('voice_session'),
             'wake_word': st.session_state.get('wake_word', 'nexus'),
             'running': st.session_state.get('runnning', False),
             'chat_messages': len(st.session_state.get('chat_history', [])),
@@ -163,53 +215,16 @@ def main():
 
         # Refresh to show main UI
         st.rerun()
-#--------(yaha se rerun)
-    # Determine animation classes - now based on speaking instead of listening
-    speaking_class = "speaking" if st.session_state.is_speaking else ""
+
+    # Subscribe this session to the shared voice worker; the worker only holds
+    # the queue weakly, so it is released together with the session state
+    if 'voice_events' not in st.session_state:
+        st.session_state.voice_events = get_voice_worker().subscribe()
 
     # Main header
     st.markdown('<h1 class="main-header">NexusAI</h1>', unsafe_allow_html=True)
 
-    # Central animation - updated to show animation when speaking
-    st.markdown(f"""
-        <div id="main">
-        <div id="myCircle">
-        <div id="mainCircle">
-            <div class="circle {speaking_class}"></div>
-            <div class="circle1 {speaking_class}"></div>
-            <div id="mainContent">
-                <ul class="bars one {speaking_class}">
-                    <li></li>
-                    <li></li>
-                </ul>
-                <ul class="bars two {speaking_class}">
-                    <li></li>
-                    <li></li>
-                    <li></li>
-                </ul>
-                <ul class="bars three {speaking_class}">
-                    <li></li>
-                    <li></li>
-                </ul>
-                <ul class="bars four {speaking_class}">
-                    <li></li>
-                    <li></li>
-                    <li></li>
-                </ul>
-                </div>
-                </div>
-            </div>
-        </div>""", unsafe_allow_html=True)
-#------(yaha tak)
-    # Welcome message (only once)
-    if not st.session_state.get('welcome_spoken', False):
-        welcome_msg = "Hello! I'm NexusAI, your personal voice assistant. Say 'Nexus' followed by your command to wake me up."
-        st.session_state.audio_handler.speak(welcome_msg)
-        # st.session_state.is_speaking = False
-        st.session_state.welcome_spoken = True
-        # st.rerun()
-
-    listen_for_voice()
+    live_panel()
 
 
 if __name__ == "__main__":
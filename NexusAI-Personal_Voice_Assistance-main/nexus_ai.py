@@ -1,7 +1,6 @@
-from components.nlp_processor import NLPProcessor
-from components.data_manager import DataManager
-from components.audio_handler import AudioHandler
-from components.command_processor import CommandProcessor
+from components.engine import NexusEngine
+from components.config import WELCOME_MESSAGE, GOODBYE_MESSAGE, ERROR_MESSAGE, SESSION_SLEEP_MESSAGE
+from components.session import ConversationSession
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,44 +8,44 @@ WAKE_WORD = os.getenv("WAKE_WORD")
 
 class NexusAI:
     def __init__(self):
-        print("Initializing NexusAI components...")
-        
         # Initialize core components
-        self.data_manager = DataManager()
-        self.nlp_processor = NLPProcessor()
-        self.audio_handler = AudioHandler()
-        self.command_processor = CommandProcessor(
-            self.nlp_processor, 
-            self.data_manager
-        )
+        self.engine = NexusEngine()
+        self.data_manager = self.engine.data_manager
+        self.nlp_processor = self.engine.nlp_processor
+        self.audio_handler = self.engine.audio_handler
+        self.command_processor = self.engine.command_processor
         
         # Assistant state
-        self.is_listening = False
         self.wake_word = WAKE_WORD.lower()
+        self.session = ConversationSession(self.wake_word)
         self.running = True
         
-        print("NexusAI initialization complete!")
-        
         # Greet user on startup
-        self.audio_handler.speak("Hello! I'm NexusAI, your personal voice assistant. Say 'Nexus' followed by your command to wake me up.")
+        self.audio_handler.speak(WELCOME_MESSAGE)
     
     def handle_wake_detection(self, audio_input):
-        if self.wake_word in audio_input or self.is_listening:
-            # Process the command
-            response, should_exit = self.command_processor.process_command(audio_input)
+        # Outside a session only the wake word gets through
+        if not self.session.accept(audio_input):
+            return
+
+        if self.session.is_sleep_command(audio_input):
+            self.session.sleep()
+            self.audio_handler.speak(SESSION_SLEEP_MESSAGE)
+            return
+
+        # Process the command; the reply opens the follow-up window
+        response, should_exit = self.command_processor.process_command(audio_input)
+        with self.session.speaking():
             self.audio_handler.speak(response)
-            
-            if should_exit:
-                self.running = False
-                return
-                        
-            # Set listening state for follow-up commands
-            self.is_listening = True
+
+        if should_exit:
+            self.running = False
     
     def run(self):
         while self.running:
             try:
                 # Listen for input
+                self.session.listening_started()
                 audio_input = self.audio_handler.listen()
                 
                 if audio_input:
@@ -59,7 +58,8 @@ class NexusAI:
             except Exception as e:
                 print(f"Error in main loop: {e}")
                 # traceback.print_exc()
-                self.audio_handler.speak("Sorry, I encountered an error. Please try again.")
+                with self.session.speaking():
+                    self.audio_handler.speak(ERROR_MESSAGE)
     
     def shutdown(self):
         self.running = False
@@ -71,12 +71,14 @@ class NexusAI:
         except Exception as e:
             print(f"Error saving data: {e}")
         
-        self.audio_handler.speak("Goodbye Sir! Have a great day!")
+        self.audio_handler.speak(GOODBYE_MESSAGE)
         print("NexusAI shutdown complete.")
     
     def get_system_info(self):
         info = {
-            'is_listening': self.is_listening,
+            'is_listening': self.session.active,
+            'session': self.session.stats(),
+            'recognition': self.audio_handler.recognition_stats,
             'wake_word': self.wake_word,
             'running': self.running,
             'data_info': self.data_manager.get_storage_info() if hasattr(self.data_manager, 'get_storage_info') else None
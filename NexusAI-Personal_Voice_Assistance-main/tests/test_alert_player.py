@@ -0,0 +1,56 @@
+import threading
+import time
+from components.alert_player import AlertPlayer
+from components.audio_playback import NullPlayer
+
+
+class RecordingPlayer:
+    """Records each playback; blocks until `release` is set"""
+    available = True
+
+    def __init__(self):
+        self.events = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def play(self, path):
+        self.started.set()
+        self.release.wait(5)
+        self.events.append('chime')
+
+
+def test_play_returns_before_chime_and_then_runs_after(tmp_path):
+    player = RecordingPlayer()
+    alerts = AlertPlayer(player=player, directory=tmp_path)
+    done = threading.Event()
+
+    started = time.perf_counter()
+    assert alerts.play('reminder', then=lambda: (player.events.append('speak'), done.set()))
+    assert time.perf_counter() - started < 0.5
+    assert player.started.wait(5)
+    assert player.events == []
+
+    player.release.set()
+    assert done.wait(5)
+    assert player.events == ['chime', 'speak']
+
+
+def test_overlapping_alert_drops_chime_but_still_speaks(tmp_path):
+    player = RecordingPlayer()
+    alerts = AlertPlayer(player=player, directory=tmp_path)
+    spoken = threading.Event()
+
+    assert alerts.play('reminder')
+    assert player.started.wait(5)
+    # The first chime is still playing: no second chime, and no waiting for it
+    assert not alerts.play('reminder', then=spoken.set)
+    assert spoken.wait(5)
+    player.release.set()
+
+
+def test_then_runs_without_a_player(tmp_path):
+    alerts = AlertPlayer(player=NullPlayer(), directory=tmp_path)
+    spoken = threading.Event()
+    assert not alerts.play('reminder', then=spoken.set)
+    assert spoken.wait(5)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,15 @@
+from features.app_index import PosixAppBackend
+
+
+def test_malformed_desktop_entry_is_skipped(tmp_path, monkeypatch):
+    applications = tmp_path / 'applications'
+    applications.mkdir()
+    (applications / 'broken.desktop').write_text('[Desktop Entry]\nName=Broken\nExec=broken "unclosed\n')
+    (applications / 'editor.desktop').write_text('[Desktop Entry]\nName=Editor\nExec=/usr/bin/editor %F\n')
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    monkeypatch.setenv('XDG_DATA_DIRS', '')
+    monkeypatch.setenv('PATH', '')
+
+    apps = PosixAppBackend().scan()
+    assert apps['editor'] == ['/usr/bin/editor']
+    assert 'broken' not in apps
@@ -0,0 +1,32 @@
+import time
+from features.appLauncher import WindowsAppLauncher, StrategyStats
+
+
+class FuzzyOnlyIndex:
+    backend = None
+
+    def start(self):
+        pass
+
+    def resolve(self, name, fuzzy=True):
+        return ['/apps/chromium'] if fuzzy else None
+
+
+def make_launcher(path_search):
+    launcher = WindowsAppLauncher(index=FuzzyOnlyIndex(), stats=StrategyStats(persist=False), fuzzy_grace=0.5)
+    launcher._exists = lambda command: True
+    launcher.resolvers['path_search'] = path_search
+    launcher.resolvers['common_paths'] = lambda name, cancel: None
+    return launcher
+
+
+def test_exact_match_beats_earlier_fuzzy_hit():
+    def slow_path_search(name, cancel):
+        time.sleep(0.1)
+        return ['/usr/bin/chrome']
+    assert make_launcher(slow_path_search).resolve('chrome') == ('path_search', ['/usr/bin/chrome'])
+
+
+def test_fuzzy_hit_used_when_exact_strategies_miss():
+    launcher = make_launcher(lambda name, cancel: None)
+    assert launcher.resolve('chrome') == ('index_fuzzy', ['/apps/chromium'])
@@ -0,0 +1,16 @@
+import numpy as np
+from components.audio_preprocess import prepare_speech
+
+
+def test_empty_capture():
+    assert prepare_speech(b'', 44100, 2) == (b'', 16000, 2)
+
+
+def test_silence_is_trimmed_and_downsampled():
+    rate = 48000
+    tone = (3000 * np.sin(2 * np.pi * 220 * np.arange(rate) / rate)).astype('<i2')
+    silence = np.zeros(rate, dtype='<i2')
+    frames, out_rate, width = prepare_speech(np.concatenate([silence, tone, silence]).tobytes(), rate, 2)
+    assert (out_rate, width) == (16000, 2)
+    seconds = len(frames) / (out_rate * width)
+    assert 1.0 <= seconds < 1.5
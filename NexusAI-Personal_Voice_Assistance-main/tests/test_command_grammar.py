@@ -0,0 +1,33 @@
+from components.command_grammar import CommandGrammar
+from features.ui_actions import parse_macro
+
+
+def test_full_phrase_matches():
+    assert CommandGrammar().match('next tab') == ('next_tab', {})
+    assert CommandGrammar().match('Close this tab.') == ('close_tab', {})
+
+
+def test_filler_and_wake_words_are_ignored():
+    grammar = CommandGrammar()
+    grammar.ignore_words(['Nexus'])
+    assert grammar.match('please next tab now') == ('next_tab', {})
+    assert grammar.match('nexus next tab') == ('next_tab', {})
+
+
+def test_partial_or_unknown_phrase_falls_through():
+    grammar = CommandGrammar()
+    assert grammar.match('play despacito') is None
+    assert grammar.match('next tab and then some') is None
+
+
+def test_typed_text_keeps_its_casing():
+    assert CommandGrammar().match('type Hello World') == ('type_text', {'text': 'Hello World'})
+    assert CommandGrammar().match('type text Hello') == ('type_text', {'text': 'Hello'})
+
+
+def test_compound_type_command_goes_to_the_macro_path():
+    # The slot swallows the rest of the command, so the fast path defers
+    # to the macro parser whenever it finds more than one action
+    command = 'type hi then press enter'
+    assert CommandGrammar().match(command) == ('type_text', {'text': 'hi then press enter'})
+    assert parse_macro(command) == [('type_text', 'hi'), ('enter', None)]
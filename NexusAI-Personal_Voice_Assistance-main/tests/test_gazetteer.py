@@ -0,0 +1,10 @@
+from components.gazetteer import Gazetteer
+
+
+def test_trailing_country_picks_the_city(tmp_path):
+    places = Gazetteer(path=tmp_path / 'g.npy').scan('weather in paris france')
+    assert [(p.name, p.country) for p in places] == [('Paris', 'FR')]
+
+
+def test_unknown_city_in_a_named_region_is_not_guessed(tmp_path):
+    assert Gazetteer(path=tmp_path / 'g.npy').scan('weather in paris texas') == []
@@ -0,0 +1,22 @@
+from components.history_store import HistoryStore
+
+STOP_WORDS = frozenset({'the', 'is', 'a', 'me', 'about', 'what', 'in'})
+
+
+def make_store():
+    store = HistoryStore(persist=False, stop_words=STOP_WORDS)
+    store.add('what is the weather in paris', 'Sunny', 'neutral', intent='weather')
+    store.add('tell me about python', 'Python is a language', 'neutral', intent='search')
+    return store
+
+
+def test_search_ignores_stopwords():
+    store = make_store()
+    assert [r['user_input'] for r in store.search('the python')] == ['tell me about python']
+    assert store.search('the is a') == []
+
+
+def test_like_fallback_ignores_stopwords():
+    store = make_store()
+    store.fts_enabled = False
+    assert [r['user_input'] for r in store.search('the python')] == ['tell me about python']
@@ -0,0 +1,50 @@
+import os
+from components.phrase_cache import PhraseCache
+
+
+def render_bytes(size):
+    def render(text, path):
+        path.write_bytes(b'\0' * size)
+    return render
+
+
+def test_voice_settings_change_the_file_name():
+    names = {PhraseCache.file_name('Hello', 'voice-a', 175, 1.0),
+             PhraseCache.file_name('Hello', 'voice-b', 175, 1.0),
+             PhraseCache.file_name('Hello', 'voice-a', 200, 1.0),
+             PhraseCache.file_name('Hello', 'voice-a', 175, 0.5)}
+    assert len(names) == 4
+
+
+def test_cached_audio_is_not_reused_after_a_voice_change(tmp_path):
+    cache = PhraseCache(directory=tmp_path, phrases=['Hello'], templates=[])
+    assert cache.put('Hello', 'voice-a', 175, 1.0, render_bytes(100)) is not None
+    assert cache.get('Hello', 'voice-a', 175, 1.0) is not None
+    assert cache.get('Hello', 'voice-b', 175, 1.0) is None
+
+
+def test_header_only_render_is_rejected(tmp_path):
+    cache = PhraseCache(directory=tmp_path, phrases=['Hello'], templates=[])
+    assert cache.put('Hello', 'voice', 175, 1.0, render_bytes(44)) is None
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get('Hello', 'voice', 175, 1.0) is None
+
+
+def test_least_recently_played_is_evicted_across_restarts(tmp_path):
+    cache = PhraseCache(directory=tmp_path, max_bytes=1000, phrases=[], templates=[])
+    paths = {text: cache.put(text, 'voice', 175, 1.0, render_bytes(300)) for text in ('a', 'b', 'c')}
+    # 'a' was played most recently, 'b' longest ago
+    for text, mtime in (('b', 1000), ('c', 2000), ('a', 3000)):
+        os.utime(paths[text], (mtime, mtime))
+
+    restarted = PhraseCache(directory=tmp_path, max_bytes=1000, phrases=[], templates=[])
+    restarted.put('d', 'voice', 175, 1.0, render_bytes(300))
+    assert not paths['b'].exists()
+    assert paths['a'].exists() and paths['c'].exists()
+    assert restarted.get('b', 'voice', 175, 1.0) is None
+
+
+def test_reminders_are_spoken_live(tmp_path):
+    cache = PhraseCache(directory=tmp_path)
+    assert cache.wants('Opening Firefox')
+    assert not cache.wants('🔔 Reminder: call mom')
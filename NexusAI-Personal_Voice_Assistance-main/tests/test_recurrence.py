@@ -0,0 +1,15 @@
+from features.recurrence import parse_recurrence
+
+
+def test_recurrence_words_inside_the_task_are_ignored():
+    for command in ["remind me to read the daily news at 9am",
+                    "remind me to check weekdays schedule tomorrow at 5pm"]:
+        assert parse_recurrence(command) == (None, None, command)
+
+
+def test_recurrence_next_to_the_time_is_parsed():
+    assert parse_recurrence("remind me to read the daily news every day at 8am") == (
+        'days', '*', "remind me to read the daily news at 8am")
+    assert parse_recurrence("remind me every day at 9 to take pills") == (
+        'days', '*', "remind me at 9 to take pills")
+    assert parse_recurrence("remind me to call mom on weekdays at 6pm")[:2] == ('days', '1-5')
@@ -0,0 +1,43 @@
+from features.semantic_cache import ExpressionCache, SemanticCache
+
+
+def test_different_operators_do_not_share_a_result():
+    cache = ExpressionCache()
+    cache.put('2+3', '5')
+    assert cache.get('2*3') is None
+    assert cache.get('2-3') is None
+    assert cache.get('2 + 3') == '5'
+
+
+def test_least_recently_used_expression_is_evicted():
+    cache = ExpressionCache(max_entries=2)
+    cache.put('1+1', '2')
+    cache.put('2+2', '4')
+    cache.get('1+1')
+    cache.put('3+3', '6')
+    assert cache.get('2+2') is None
+    assert cache.get('1+1') == '2'
+
+
+STOP_WORDS = {'the', 'of', 'in', 'me', 'about', 'is', 'who', 'tell', 'a'}
+
+
+def test_summary_cache_reuses_rephrasings():
+    cache = SemanticCache(stop_words=STOP_WORDS)
+    cache.put('tell me about python', 'Python is a language.')
+    assert cache.get('Tell me about Python?') == 'Python is a language.'
+    assert cache.get('python, tell me about') == 'Python is a language.'
+
+
+def test_summary_cache_misses_on_a_different_number():
+    cache = SemanticCache(stop_words=STOP_WORDS)
+    cache.put('who is the president of the united states in 2020', 'A')
+    cache.put('tell me about world war 1', 'B')
+    assert cache.get('who is the president of the united states in 2024') is None
+    assert cache.get('tell me about world war 2') is None
+
+
+def test_summary_cache_misses_on_a_different_word():
+    cache = SemanticCache(stop_words=STOP_WORDS)
+    cache.put('tell me about the history of france', 'France')
+    assert cache.get('tell me about the history of frances') is None
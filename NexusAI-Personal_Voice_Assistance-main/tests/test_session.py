@@ -0,0 +1,33 @@
+from components.session import ConversationSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_follow_up_window_is_judged_from_when_listening_started():
+    clock = FakeClock()
+    session = ConversationSession('nexus', follow_up_timeout=10, clock=clock)
+    assert session.accept('nexus what time is it')
+    with session.speaking():
+        assert not session.accept('it is five')  # our own voice
+    clock.now = 9
+    session.listening_started()
+    clock.now = 20  # recognition finished after the window closed
+    assert session.accept('and the date')
+
+
+def test_commands_after_the_window_need_the_wake_word():
+    clock = FakeClock()
+    session = ConversationSession('nexus', follow_up_timeout=10, clock=clock)
+    session.accept('nexus hello')
+    with session.speaking():
+        pass
+    clock.now = 11
+    session.listening_started()
+    assert not session.accept('open chrome')
+    assert session.stats()['state'] == 'idle'
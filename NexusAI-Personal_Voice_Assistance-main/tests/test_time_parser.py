@@ -0,0 +1,42 @@
+from datetime import datetime
+from features.time_parser import parse_time_rules, split_reminder
+
+# A Wednesday afternoon
+NOW = datetime(2024, 5, 15, 16, 0)
+
+
+def test_relative_times():
+    assert parse_time_rules('in 20 minutes', NOW) == datetime(2024, 5, 15, 16, 20)
+    assert parse_time_rules('in an hour and a half', NOW) == datetime(2024, 5, 15, 17, 30)
+
+
+def test_today_at_a_passed_time_stays_today():
+    # The reminder system rejects it as being in the past instead of moving it
+    assert parse_time_rules('today at 3pm', NOW) == datetime(2024, 5, 15, 15, 0)
+
+
+def test_bare_hour_picks_the_next_occurrence():
+    assert parse_time_rules('at 3', datetime(2024, 5, 15, 10, 0)) == datetime(2024, 5, 15, 15, 0)
+    assert parse_time_rules('at 3', NOW) == datetime(2024, 5, 16, 3, 0)
+    assert parse_time_rules('3', NOW) is None
+
+
+def test_weekday_rolls_over_to_next_week():
+    assert parse_time_rules('friday at 9am', NOW) == datetime(2024, 5, 17, 9, 0)
+    assert parse_time_rules('wednesday at 9am', NOW) == datetime(2024, 5, 22, 9, 0)
+    assert parse_time_rules('next monday evening', NOW).date() == datetime(2024, 5, 20).date()
+
+
+def test_split_trailing_time():
+    assert split_reminder('remind me to call mom at 5pm', NOW) == ('call mom', 'at 5pm')
+    assert split_reminder('remind me to buy milk tomorrow morning', NOW) == ('buy milk', 'tomorrow morning')
+
+
+def test_split_leading_time():
+    assert split_reminder('remind me at 5pm to call mom', NOW) == ('call mom', 'at 5pm')
+    assert split_reminder('set a reminder for 5pm to call mom', NOW) == ('call mom', 'for 5pm')
+    assert parse_time_rules('for 5pm', NOW) == datetime(2024, 5, 15, 17, 0)
+
+
+def test_not_a_reminder():
+    assert split_reminder('what time is it', NOW) is None
@@ -0,0 +1,19 @@
+from features.ui_actions import parse_macro
+
+
+def test_macro_splits_between_actions():
+    assert parse_macro("new tab, type hello then press enter") == [
+        ('new_tab', None), ('type_text', 'hello'), ('enter', None)]
+
+
+def test_then_inside_typed_text_is_not_a_separator():
+    assert parse_macro("type I will go then come back") == [('type_text', 'I will go then come back')]
+
+
+def test_comma_inside_typed_text_is_not_a_separator():
+    assert parse_macro("type hello, world, see you then press enter") == [
+        ('type_text', 'hello, world, see you'), ('enter', None)]
+
+
+def test_non_action_part_rejects_the_macro():
+    assert parse_macro("new tab, then something else") is None